@@ -0,0 +1,312 @@
+# Generated by dataset_args_compiler.py; do not edit
+DATASETS_ARGS = {
+    "NIPA": {
+        "required": [
+            "Year",
+            "Frequency",
+            "TableName"
+        ],
+        "all": [
+            "Year",
+            "Frequency",
+            "TableName",
+            "ShowMillions"
+        ],
+        "multiple": [
+            "Year",
+            "Frequency"
+        ],
+        "values": {
+            "Frequency": [
+                "A",
+                "Q",
+                "M"
+            ]
+        }
+    },
+    "NIUnderlyingDetail": {
+        "required": [
+            "Year",
+            "Frequency"
+        ],
+        "all": [
+            "Year",
+            "Frequency",
+            "TableName",
+            "ShowMillions"
+        ],
+        "multiple": [
+            "Year",
+            "Frequency"
+        ],
+        "values": {
+            "Frequency": [
+                "A",
+                "Q",
+                "M"
+            ]
+        }
+    },
+    "FixedAssets": {
+        "required": [
+            "Year",
+            "TableName"
+        ],
+        "all": [
+            "Year",
+            "TableName"
+        ],
+        "multiple": [
+            "Year"
+        ]
+    },
+    "MNE": {
+        "DI": {
+            "required": [
+                "DirectionOfInvestment",
+                "Classification",
+                "Year"
+            ],
+            "all": [
+                "DirectionOfInvestment",
+                "Classification",
+                "Year",
+                "SeriesID",
+                "Country",
+                "Industry",
+                "GetFootnotes"
+            ],
+            "multiple": [
+                "Year",
+                "SeriesID",
+                "Country",
+                "Industry"
+            ],
+            "values": {
+                "DirectionOfInvestment": [
+                    "Outward",
+                    "Inward",
+                    "Parent",
+                    "State"
+                ]
+            }
+        },
+        "AMNE": {
+            "required": [
+                "DirectionOfInvestment",
+                "Classification",
+                "Year",
+                "OwnershipLevel",
+                "NonBankAffiliatesOnly"
+            ],
+            "all": [
+                "DirectionOfInvestment",
+                "Classification",
+                "Year",
+                "OwnershipLevel",
+                "NonBankAffiliatesOnly",
+                "SeriesID",
+                "Country",
+                "Industry",
+                "State",
+                "GetFootnotes"
+            ],
+            "multiple": [
+                "Year",
+                "SeriesID",
+                "Country",
+                "Industry"
+            ],
+            "values": {
+                "DirectionOfInvestment": [
+                    "Outward",
+                    "Inward",
+                    "Parent",
+                    "State"
+                ]
+            }
+        }
+    },
+    "GDPbyIndustry": {
+        "required": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "all": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "multiple": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "values": {
+            "Frequency": [
+                "A",
+                "Q"
+            ]
+        }
+    },
+    "ITA": {
+        "required": [],
+        "all": [
+            "Indicator",
+            "AreaOrCountry",
+            "Frequency",
+            "Year"
+        ],
+        "multiple": [
+            "Indicator",
+            "AreaOrCountry",
+            "Frequency",
+            "Year"
+        ],
+        "values": {
+            "Frequency": [
+                "A",
+                "QSA",
+                "QNSA"
+            ]
+        },
+        "exactly_one_of": [
+            "Indicator",
+            "AreaOrCountry"
+        ]
+    },
+    "IIP": {
+        "required": [],
+        "all": [
+            "TypeOfInvestment",
+            "Component",
+            "Frequency",
+            "Year"
+        ],
+        "multiple": [
+            "TypeOfInvestment",
+            "Component",
+            "Frequency",
+            "Year"
+        ],
+        "values": {
+            "Frequency": [
+                "A",
+                "QNSA"
+            ]
+        },
+        "exactly_one_of": [
+            "TypeOfInvestment",
+            "Year"
+        ]
+    },
+    "InputOutput": {
+        "required": [
+            "TableID",
+            "Year"
+        ],
+        "all": [
+            "TableID",
+            "Year"
+        ],
+        "multiple": [
+            "TableID",
+            "Year"
+        ]
+    },
+    "UnderlyingGDPbyIndustry": {
+        "required": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "all": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "multiple": [
+            "TableID",
+            "Frequency",
+            "Year",
+            "Industry"
+        ],
+        "values": {
+            "Frequency": [
+                "A"
+            ]
+        }
+    },
+    "IntlServTrade": {
+        "required": [],
+        "all": [
+            "TypeOfService",
+            "TradeDirection",
+            "Affiliation",
+            "AreaOrCountry",
+            "Year"
+        ],
+        "multiple": [
+            "TypeOfService",
+            "TradeDirection",
+            "Affiliation",
+            "AreaOrCountry",
+            "Year"
+        ],
+        "exactly_one_of": [
+            "TypeOfService",
+            "AreaOrCountry"
+        ]
+    },
+    "Regional": {
+        "required": [
+            "TableName",
+            "LineCode",
+            "GeoFips"
+        ],
+        "all": [
+            "TableName",
+            "LineCode",
+            "GeoFips",
+            "Year"
+        ],
+        "multiple": [
+            "GeoFips",
+            "Year"
+        ]
+    },
+    "IntlServSTA": {
+        "required": [],
+        "all": [
+            "Channel",
+            "Destination",
+            "Industry",
+            "AreaOrCountry",
+            "Year"
+        ],
+        "multiple": [
+            "Channel",
+            "Destination",
+            "Industry",
+            "AreaOrCountry",
+            "Year"
+        ]
+    },
+    "APIDatasetMetaData": {
+        "required": [
+            "Dataset"
+        ],
+        "all": [
+            "Dataset"
+        ],
+        "multiple": [
+            "Dataset"
+        ]
+    }
+}
@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import timedelta
+from hashlib import sha256
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from bea.cache import make_key
+from bea.errors import error_from_content
+
+# Response headers kept with a stored body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+
+# expires is when the entry stops being fresh (from Cache-Control max-age), or None to revalidate
+# on every request
+StoredResponse = namedtuple("StoredResponse", ["content", "headers", "digest", "expires"])
+
+
+def parse_cache_control(value):
+    # {directive: argument} of a Cache-Control header, e.g. {"max-age": "60", "no-cache": ""}
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def request_key(url):
+    # Keyed like the response cache, without the UserID, so stores can be shared between keys
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    params["url"] = parts.netloc + parts.path
+    return make_key(params)
+
+
+class PooledAdapter(HTTPAdapter):
+    # HTTPAdapter whose urllib3 pool is shared by every session of a Bea client, so connections
+    # (and their TLS sessions) are reused across threads. Keep-alive and compressed responses
+    # come from the default headers of requests.Session.
+    pass
+
+
+class ResponseStore:
+    # In-memory LRU store of the bodies and headers kept by RevalidatingAdapter, bounded to
+    # max_size bytes of bodies. Any object with the same get and set methods can replace it.
+    def __init__(self, max_size=256 * 2**20):
+        self.max_size = max_size
+        self.size = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+# PUBLIC METHODS
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.__lock:
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.content)
+            if self.max_size is not None and len(entry.content) > self.max_size:
+                return
+            self.__entries[key] = entry
+            self.size += len(entry.content)
+            while self.max_size is not None and self.size > self.max_size:
+                _, evicted = self.__entries.popitem(last=False)
+                self.size -= len(evicted.content)
+
+
+class RevalidatingAdapter(PooledAdapter):
+    # PooledAdapter that keeps successful GET responses with their ETag, Last-Modified and
+    # Cache-Control headers. Responses still fresh under max-age are served without a request;
+    # otherwise the request is made conditional (If-None-Match, If-Modified-Since) and a 304 is
+    # answered from the store. When the server sends no validators, the body is downloaded and
+    # compared by hash with the stored one. Responses served from the store have from_cache set,
+    # and responses whose body did not change have unchanged set.
+    def __init__(self, store=None, **kwargs):
+        self.store = store if store is not None else ResponseStore()
+        self.fresh = 0
+        self.not_modified = 0
+        self.unchanged = 0
+        self.__lock = threading.Lock()
+        super().__init__(**kwargs)
+
+# PRIVATE METHODS
+    def __count(self, name):
+        with self.__lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def __entry(self, content, headers, digest=None):
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+        expires = None
+        if "no-cache" not in cache_control and cache_control.get("max-age", "").isdigit():
+            expires = time.time() + int(cache_control["max-age"])
+        return StoredResponse(
+            content,
+            {name: headers[name] for name in STORED_HEADERS if name in headers},
+            digest if digest is not None else sha256(content).hexdigest(),
+            expires
+        )
+
+    def __from_store(self, request, entry, response=None):
+        # Fills response (a 304) with the stored body, or builds a response without a request
+        if response is None:
+            response = Response()
+            response.request = request
+            response.url = request.url
+            response.connection = self
+            response.elapsed = timedelta(0)
+            response.headers = CaseInsensitiveDict(entry.headers)
+        else:
+            response.headers = CaseInsensitiveDict({**entry.headers, **response.headers})
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = entry.content
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        response.unchanged = True
+        return response
+
+# PUBLIC METHODS
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET":
+            return super().send(request, stream=stream, **kwargs)
+        key = request_key(request.url)
+        entry = self.store.get(key)
+        if entry is not None and entry.expires is not None and time.time() < entry.expires:
+            self.__count("fresh")
+            return self.__from_store(request, entry)
+        if entry is not None:
+            request = request.copy()
+            if "ETag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["ETag"]
+            if "Last-Modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            response.content  # Reads the empty body, which releases the connection
+            self.__count("not_modified")
+            response = self.__from_store(request, entry, response)
+            self.store.set(key, self.__entry(entry.content, response.headers, entry.digest))
+            return response
+        # Streamed bodies are left to the caller, as storing them would read them whole
+        if response.status_code != 200 or stream:
+            return response
+        if "no-store" in parse_cache_control(response.headers.get("Cache-Control")):
+            return response
+
+        digest = sha256(response.content).hexdigest()
+        response.unchanged = entry is not None and digest == entry.digest
+        if response.unchanged:
+            # The stored body is handed out instead, so only one copy is kept
+            self.__count("unchanged")
+            response._content = entry.content
+        if error_from_content(response.content) is None:
+            self.store.set(key, self.__entry(response.content, response.headers, digest))
+        return response
+
+    def stats(self):
+        return {
+            "fresh": self.fresh,
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+        }
@@ -0,0 +1,134 @@
+import threading
+from unittest import TestCase, mock
+
+from bea.adapters import (
+    ResponseStore, RevalidatingAdapter, StoredResponse, parse_cache_control, request_key
+)
+from bea.bea import Bea
+from bea.bea_test import patch_api_key
+from bea.mockserver import MockBeaServer
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+
+
+# Unit tests
+class TestSharedClient(TestCase):
+    def setUp(self):
+        patch_api_key(self)
+
+    def test_sessions_ask_for_compressed_keep_alive_responses(self):
+        client = Bea()
+        headers = client.request_session.headers
+        self.assertIn("gzip", headers["Accept-Encoding"])
+        self.assertEqual(headers["Connection"], "keep-alive")
+
+    def test_sessions_share_one_adapter(self):
+        client = Bea(pool_maxsize=7)
+        self.assertEqual(client.adapter._pool_maxsize, 7)
+        self.assertIs(client.request_session.get_adapter("https://apps.bea.gov"), client.adapter)
+
+    def test_each_thread_uses_its_own_session(self):
+        client = Bea()
+        sessions = []
+        lock = threading.Lock()
+
+        def fake_get(session, url, params):
+            with lock:
+                sessions.append(session)
+            return mock.MagicMock(ok=True, text="{}", content=b"{}")
+
+        with mock.patch("requests.Session.get", autospec=True, side_effect=fake_get):
+            client._get_dataset_list()
+            thread = threading.Thread(target=client._get_dataset_list)
+            thread.start()
+            thread.join()
+
+        self.assertIs(sessions[0], client.request_session)
+        self.assertIsNot(sessions[1], client.request_session)
+        self.assertIs(sessions[1].get_adapter("https://apps.bea.gov"), client.adapter)
+
+    def test_map_returns_results_in_order(self):
+        client = Bea()
+        results = client.map(lambda a, b: a * b, [(1, 2), {"a": 3, "b": 4}, (5, 6)], workers=3)
+        self.assertEqual(results, [2, 12, 30])
+
+    def test_map_accepts_method_names(self):
+        client = Bea()
+        with mock.patch.object(Bea, "fixed_assets", autospec=True,
+                               side_effect=lambda self, year, table_name: year):
+            results = client.map("fixed_assets", [(2001, "FAAt101"), (2002, "FAAt101")])
+        self.assertEqual(results, [2001, 2002])
+
+
+class TestRevalidatingAdapter(TestCase):
+    def setUp(self):
+        patch_api_key(self)
+
+    def client_for(self, server, adapter):
+        return Bea(
+            base_url=server.url,
+            adapter=adapter,
+            rate_limiter=RateLimiter(None, None, None),
+            retry_policy=RetryPolicy(max_attempts=1)
+        )
+
+    # Unit tests
+    def test_parse_cache_control(self):
+        self.assertEqual(
+            parse_cache_control('max-age=60, no-cache, private="x"'),
+            {"max-age": "60", "no-cache": "", "private": "x"}
+        )
+        self.assertEqual(parse_cache_control(None), {})
+
+    def test_request_key_ignores_user_id(self):
+        self.assertEqual(
+            request_key("https://apps.bea.gov/api/data?UserID=a&Year=2020"),
+            request_key("https://apps.bea.gov/api/data?UserID=b&year=2020")
+        )
+
+    def test_store_evicts_least_recently_used(self):
+        store = ResponseStore(max_size=10)
+        for key in "abc":
+            store.set(key, StoredResponse(b"1234", {}, key, None))
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.size, 8)
+
+    # Integration tests
+    def test_serves_not_modified_responses_from_store(self):
+        adapter = RevalidatingAdapter()
+        with MockBeaServer(rows=200, recorded_path=None, validators=True) as server:
+            client = self.client_for(server, adapter)
+            first = client.nipa(2020, "Q", "T10101")
+            second = client.nipa(2020, "Q", "T10101")
+            streamed = list(client.stream_rows("NIPA", year=2020, frequency="Q",
+                                               table_name="T10101"))
+        self.assertEqual(second, first)
+        self.assertEqual(streamed, first.data)
+        self.assertEqual(server.not_modified_served, 2)
+        self.assertEqual(adapter.stats()["not_modified"], 2)
+
+    def test_compares_content_without_validators(self):
+        adapter = RevalidatingAdapter()
+        with MockBeaServer(rows=20, recorded_path=None) as server:
+            client = self.client_for(server, adapter)
+            first = client.nipa(2020, "Q", "T10101")
+            second = client.nipa(2020, "Q", "T10101")
+        self.assertEqual(second, first)
+        self.assertEqual(adapter.stats()["unchanged"], 1)
+        self.assertEqual(server.not_modified_served, 0)
+
+    def test_serves_fresh_responses_without_requests(self):
+        adapter = RevalidatingAdapter()
+        with MockBeaServer(rows=20, recorded_path=None) as server:
+            client = self.client_for(server, adapter)
+            with mock.patch.object(
+                MockBeaServer, "respond", autospec=True,
+                side_effect=lambda self, query: (200, {"Cache-Control": "max-age=60"}, {
+                    "BEAAPI": {"Results": {"Data": [{"DataValue": "1"}]}}
+                })
+            ):
+                first = client.nipa(2020, "Q", "T10101")
+                second = client.nipa(2020, "Q", "T10101")
+        self.assertEqual(second, first)
+        self.assertEqual(adapter.stats()["fresh"], 1)
@@ -0,0 +1,153 @@
+import asyncio
+import inspect
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from bea.bea import Bea
+from bea.singleflight import AsyncSingleFlight
+
+
+class AsyncBea:
+    # Coroutine counterpart of Bea. Requests are still made with requests, on a thread pool that
+    # shares one connection pool, while a semaphore bounds the number of requests in flight.
+    def __init__(self, max_concurrency=10, **kwargs):
+        kwargs.setdefault("pool_maxsize", max_concurrency)
+        self.client = Bea(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="AsyncBea"
+        )
+        self.__semaphores = weakref.WeakKeyDictionary()
+        self.__single_flights = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+# PRIVATE METHODS
+    def __get_semaphore(self):
+        # One semaphore per event loop, so the client can be reused across asyncio.run() calls
+        loop = asyncio.get_running_loop()
+        if loop not in self.__semaphores:
+            self.__semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self.__semaphores[loop]
+
+    def __get_single_flight(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self.__single_flights:
+            self.__single_flights[loop] = AsyncSingleFlight()
+        return self.__single_flights[loop]
+
+    async def __execute(self, fn, *args, **kwargs):
+        async with self.__get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, partial(fn, *args, **kwargs))
+
+    async def __run(self, fn, *args, **kwargs):
+        # Identical calls in flight share one slot of the semaphore and one request
+        key = (fn.__name__, repr(args), repr(sorted(kwargs.items())))
+        return await self.__get_single_flight().do(
+            key, lambda: self.__execute(fn, *args, **kwargs)
+        )
+
+    def __to_awaitable(self, call):
+        if inspect.isawaitable(call):
+            return call
+        # Otherwise a (method_name, kwargs) or (method_name, args, kwargs) tuple
+        if len(call) == 2:
+            method_name, kwargs = call
+            args = ()
+        else:
+            method_name, args, kwargs = call
+        return getattr(self, method_name)(*args, **kwargs)
+
+# PROTECTED METHODS
+    async def _get_parameter_values(self, dataset_name, parameter_name, **kwargs):
+        return await self.__run(
+            self.client._get_parameter_values, dataset_name, parameter_name, **kwargs
+        )
+
+# PUBLIC METHODS
+    async def gather_many(self, calls, return_exceptions=False):
+        # Results are returned in the same order as calls
+        return await asyncio.gather(
+            *[self.__to_awaitable(call) for call in calls],
+            return_exceptions=return_exceptions
+        )
+
+    def close(self):
+        self.__executor.shutdown(wait=True)
+        self.client.adapter.close()
+
+    async def get(self, dataset_name, **params):
+        return await self.__run(self.client.get, dataset_name, **params)
+
+    async def nipa(self, year, frequency, table_name, **kwargs):
+        return await self.__run(self.client.nipa, year, frequency, table_name, **kwargs)
+
+    async def ni_underlying_detail(self, year, frequency, table_name, **kwargs):
+        return await self.__run(
+            self.client.ni_underlying_detail, year, frequency, table_name, **kwargs
+        )
+
+    async def fixed_assets(self, year, table_name, **kwargs):
+        return await self.__run(self.client.fixed_assets, year, table_name, **kwargs)
+
+    async def mne_di(self, direction_of_investment, classification, year, **kwargs):
+        return await self.__run(
+            self.client.mne_di, direction_of_investment, classification, year, **kwargs
+        )
+
+    async def mne_amne(self,
+                       direction_of_investment,
+                       classification,
+                       year,
+                       ownership_level,
+                       non_bank_affiliates_only,
+                       **kwargs):
+        return await self.__run(
+            self.client.mne_amne,
+            direction_of_investment,
+            classification,
+            year,
+            ownership_level,
+            non_bank_affiliates_only,
+            **kwargs
+        )
+
+    async def gdp_by_industry(self, table_id, frequency, year, industry, **kwargs):
+        return await self.__run(
+            self.client.gdp_by_industry, table_id, frequency, year, industry, **kwargs
+        )
+
+    async def ita(self, indicator=None, area_or_country=None, **kwargs):
+        return await self.__run(self.client.ita, indicator, area_or_country, **kwargs)
+
+    async def iip(self, year=None, type_of_investment=None, **kwargs):
+        return await self.__run(self.client.iip, year, type_of_investment, **kwargs)
+
+    async def input_output(self, table_id, year, **kwargs):
+        return await self.__run(self.client.input_output, table_id, year, **kwargs)
+
+    async def underlying_gdp_by_industry(self, table_id, frequency, year, industry, **kwargs):
+        return await self.__run(
+            self.client.underlying_gdp_by_industry, table_id, frequency, year, industry, **kwargs
+        )
+
+    async def intl_serv_trade(self, type_of_service=None, area_or_country=None, **kwargs):
+        return await self.__run(
+            self.client.intl_serv_trade, type_of_service, area_or_country, **kwargs
+        )
+
+    async def regional(self, table_name, line_code, geo_fips, **kwargs):
+        return await self.__run(self.client.regional, table_name, line_code, geo_fips, **kwargs)
+
+    async def intl_serv_sta(self, **kwargs):
+        return await self.__run(self.client.intl_serv_sta, **kwargs)
+
+    async def api_dataset_meta_data(self, dataset, **kwargs):
+        return await self.__run(self.client.api_dataset_meta_data, dataset, **kwargs)
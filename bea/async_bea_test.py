@@ -0,0 +1,51 @@
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, mock
+
+from bea.async_bea import AsyncBea
+from bea.bea_test import patch_api_key, patch_session_get
+
+
+class TestAsyncBea(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        def fake_get(session, url, params):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.02)
+            with self.lock:
+                self.in_flight -= 1
+            response = mock.Mock(ok=True, content=b"", text=f"{params['Year']}")
+            return response
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.client = AsyncBea(max_concurrency=3)
+        self.addCleanup(self.client.close)
+
+    # Unit tests
+    async def test_method_returns_same_value_as_sync_client(self):
+        result = await self.client.nipa(2005, "A", "T10101")
+        self.assertEqual(result, "2005")
+
+    async def test_gather_many_preserves_input_order(self):
+        years = list(range(2000, 2012))
+        calls = [self.client.nipa(year, "A", "T10101") for year in years[:6]]
+        calls += [("nipa", {"year": year, "frequency": "A", "table_name": "T10101"})
+                  for year in years[6:]]
+        results = await self.client.gather_many(calls)
+        self.assertEqual(results, [str(year) for year in years])
+
+    async def test_bounds_requests_in_flight(self):
+        await self.client.gather_many(
+            [("nipa", (year, "A", "T10101"), {}) for year in range(2000, 2012)]
+        )
+        self.assertEqual(self.mock_request.call_count, 12)
+        self.assertLessEqual(self.max_in_flight, 3)
+        self.assertGreater(self.max_in_flight, 1)
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from hashlib import sha256
+from json import dumps, loads
+
+from bea import codec as codecs
+from bea.bea import DATASET_METHODS
+
+# States of a call in the journal
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# The client methods a job can call: those returning a BeaResult, which is what the journal stores
+BATCH_METHODS = frozenset(["get", "bulk", *DATASET_METHODS])
+
+BatchProgress = namedtuple(
+    "BatchProgress", ["total", "done", "failed", "pending", "elapsed", "rate", "eta"]
+)
+
+
+def call_key(method_name, params):
+    # Identifies a call, so adding the same job spec again does not add its calls twice
+    return sha256(dumps([method_name, params], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class BatchRunner:
+    # Runs a job spec of client calls, [(method name, {keyword arguments})], recording each call
+    # and its result in a SQLite journal as it completes. A runner opened on the same journal
+    # after a crash or deploy runs only the calls that did not finish, so long pulls are never
+    # restarted from scratch. Results are stored encoded when a codec is given.
+    def __init__(self, client, path, workers=4, codec=None):
+        self.client = client
+        self.path = path
+        self.workers = workers
+        self.codec = codec
+        self.__lock = threading.Lock()
+        self.__started = None
+        self.__stopped = None
+        self.__completed = 0
+        self.__queued = 0
+        import sqlite3
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            # WAL keeps committed calls on disk without blocking readers of the journal
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS calls ("
+                "id INTEGER PRIMARY KEY, "
+                "key TEXT UNIQUE, "
+                "method TEXT, "
+                "params TEXT, "
+                "status TEXT, "
+                "attempts INTEGER DEFAULT 0, "
+                "error TEXT, "
+                "finished REAL, "
+                "result BLOB)"
+            )
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS calls_status ON calls (status)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# PRIVATE METHODS
+    def __call(self, method_name, params):
+        result = getattr(self.client, method_name)(**params)
+        content = result.encode("utf-8")
+        return self.codec.encode(content) if self.codec is not None else content
+
+    def __record(self, call_id, future):
+        error = future.exception()
+        with self.__lock, self.__connection:
+            if error is None:
+                self.__connection.execute(
+                    "UPDATE calls SET status = ?, attempts = attempts + 1, error = NULL, "
+                    "finished = ?, result = ? WHERE id = ?",
+                    (DONE, time.time(), future.result(), call_id)
+                )
+            else:
+                self.__connection.execute(
+                    "UPDATE calls SET status = ?, attempts = attempts + 1, error = ?, "
+                    "finished = ? WHERE id = ?",
+                    (FAILED, f"{type(error).__name__}: {error}", time.time(), call_id)
+                )
+            self.__completed += 1
+
+# PUBLIC METHODS
+    def add(self, jobs):
+        # Adds calls to the journal and returns how many were new. Re-adding the full job spec
+        # when resuming is safe.
+        rows = []
+        for method_name, params in jobs:
+            if method_name not in BATCH_METHODS or not callable(
+                getattr(self.client, method_name, None)
+            ):
+                raise ValueError(
+                    f"{method_name!r} is not a client method returning a result; "
+                    f"use one of {sorted(BATCH_METHODS)}"
+                )
+            params = dict(params)
+            rows.append((call_key(method_name, params), method_name, dumps(params), PENDING))
+        with self.__lock, self.__connection:
+            before = self.__connection.total_changes
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO calls (key, method, params, status) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            return self.__connection.total_changes - before
+
+    def run(self, retry_failed=False, progress=None):
+        # Runs the pending calls (and the failed ones with retry_failed set) on workers threads,
+        # in the order they were added. progress, if given, is called with a BatchProgress after
+        # each call. Returns the final BatchProgress.
+        statuses = (PENDING, FAILED) if retry_failed else (PENDING,)
+        with self.__lock:
+            calls = self.__connection.execute(
+                "SELECT id, method, params FROM calls WHERE status IN ({}) ORDER BY id".format(
+                    ", ".join("?" * len(statuses))
+                ),
+                statuses
+            ).fetchall()
+            self.__started = time.monotonic()
+            self.__stopped = None
+            self.__completed = 0
+            self.__queued = len(calls)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        # At most two calls per worker are queued, so an interrupted run leaves the rest pending
+        # instead of waiting for the whole queue
+        calls = iter(calls)
+        running = {}
+        try:
+            while True:
+                while len(running) < 2 * self.workers:
+                    call = next(calls, None)
+                    if call is None:
+                        break
+                    call_id, method_name, params = call
+                    running[executor.submit(self.__call, method_name, loads(params))] = call_id
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    self.__record(running.pop(future), future)
+                    if progress is not None:
+                        progress(self.progress())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # Calls that were already running when the run was interrupted are still recorded
+            for future, call_id in running.items():
+                if not future.cancelled():
+                    self.__record(call_id, future)
+            self.__stopped = time.monotonic()
+        return self.progress()
+
+    def progress(self):
+        # Counts from the journal, with the rate (calls per second) and ETA (seconds) of the
+        # current or last run
+        with self.__lock:
+            counts = dict(self.__connection.execute(
+                "SELECT status, COUNT(*) FROM calls GROUP BY status"
+            ).fetchall())
+            completed = self.__completed
+            remaining = self.__queued - completed
+            started, stopped = self.__started, self.__stopped
+        total = sum(counts.values())
+        pending = counts.get(PENDING, 0)
+        if started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (stopped if stopped is not None else time.monotonic()) - started
+        rate = completed / elapsed if elapsed > 0 else 0.0
+        eta = remaining / rate if rate > 0 else None
+        return BatchProgress(
+            total, counts.get(DONE, 0), counts.get(FAILED, 0), pending, elapsed, rate, eta
+        )
+
+    def result(self, method_name, **params):
+        # The stored result of a call, or None if it has not completed
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT result FROM calls WHERE key = ? AND status = ?",
+                (call_key(method_name, params), DONE)
+            ).fetchone()
+        return codecs.decode_result(row[0]) if row is not None else None
+
+    def results(self):
+        # Yields (method name, params, BeaResult) for each completed call, in the order added.
+        # Results are read one at a time, as a long pull does not fit in memory at once.
+        with self.__lock:
+            call_ids = [row[0] for row in self.__connection.execute(
+                "SELECT id FROM calls WHERE status = ? ORDER BY id", (DONE,)
+            )]
+        for call_id in call_ids:
+            with self.__lock:
+                method_name, params, content = self.__connection.execute(
+                    "SELECT method, params, result FROM calls WHERE id = ?", (call_id,)
+                ).fetchone()
+            yield method_name, loads(params), codecs.decode_result(content)
+
+    def failures(self):
+        # [(method name, params, error)] of the calls that failed
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT method, params, error FROM calls WHERE status = ? ORDER BY id", (FAILED,)
+            ).fetchall()
+        return [(method_name, loads(params), error) for method_name, params, error in rows]
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,117 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bea.batch import BatchRunner
+from bea.bea import Bea
+from bea.bea_test import fake_response, patch_api_key, patch_session_get
+from bea.codec import CompactCodec
+
+
+class TestBatchRunner(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        self.failing_years = set()
+
+        def fake_get(session, url, params):
+            if params["Year"] in self.failing_years:
+                raise ConnectionError("connection reset")
+            rows = [{"TimePeriod": params["Year"], "DataValue": "1.0"}]
+            return fake_response({"BEAAPI": {"Results": {"Data": rows}}})
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.client = Bea()
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, "journal.sqlite")
+        self.jobs = [
+            ("fixed_assets", {"year": str(year), "table_name": "FAAt101"})
+            for year in range(2010, 2020)
+        ]
+
+    def runner(self, **kwargs):
+        runner = BatchRunner(self.client, self.path, **kwargs)
+        self.addCleanup(runner.close)
+        return runner
+
+    def requested_years(self):
+        return [call.kwargs["params"]["Year"] for call in self.mock_request.call_args_list]
+
+    # Unit tests
+    def test_add_is_idempotent(self):
+        runner = self.runner()
+        self.assertEqual(runner.add(self.jobs), 10)
+        self.assertEqual(runner.add(self.jobs), 0)
+        self.assertEqual(runner.progress().pending, 10)
+
+    def test_add_rejects_unknown_methods(self):
+        runner = self.runner()
+        for method_name in ("missing", "_get_dataset_list", "spool", "stream_rows", "map"):
+            with self.assertRaises(ValueError):
+                runner.add([(method_name, {})])
+
+    # Integration tests
+    def test_runs_and_stores_results(self):
+        runner = self.runner(workers=3, codec=CompactCodec())
+        runner.add(self.jobs)
+        reports = []
+        final = runner.run(progress=reports.append)
+        self.assertEqual(len(reports), 10)
+        self.assertEqual((final.total, final.done, final.failed, final.pending), (10, 10, 0, 0))
+        self.assertEqual(final.eta, 0)
+        results = list(runner.results())
+        self.assertEqual([params["year"] for _, params, _ in results],
+                         [str(year) for year in range(2010, 2020)])
+        self.assertEqual(
+            runner.result("fixed_assets", year="2012", table_name="FAAt101").data,
+            [{"TimePeriod": "2012", "DataValue": "1.0"}]
+        )
+
+    def test_runs_bulk_jobs(self):
+        runner = self.runner()
+        runner.add([("bulk", {"dataset_name": "FixedAssets", "Year": ["2010", "2011"],
+                              "TableName": "FAAt101"})])
+        self.assertEqual(runner.run().done, 1)
+        _, _, result = next(runner.results())
+        self.assertEqual(result.data, [{"TimePeriod": "2010,2011", "DataValue": "1.0"}])
+
+    def test_resumes_where_interrupted(self):
+        runner = self.runner(workers=1)
+        runner.add(self.jobs)
+
+        def interrupt(progress):
+            if progress.done == 4:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run(progress=interrupt)
+        # The call already running when interrupted is recorded too
+        self.assertEqual(runner.progress().done, len(self.mock_request.call_args_list))
+        runner.close()
+
+        # A new process re-adds the same job spec and only runs what is left
+        resumed = self.runner(workers=2)
+        self.assertEqual(resumed.add(self.jobs), 0)
+        final = resumed.run()
+        self.assertEqual(final.done, 10)
+        self.assertEqual(sorted(self.requested_years()), [str(year) for year in range(2010, 2020)])
+
+    def test_records_failures_and_retries_them(self):
+        self.failing_years = {"2011", "2015"}
+        runner = self.runner(workers=2)
+        runner.add(self.jobs)
+        final = runner.run()
+        self.assertEqual((final.done, final.failed), (8, 2))
+        self.assertEqual([params["year"] for _, params, _ in runner.failures()], ["2011", "2015"])
+        self.assertIn("ConnectionError", runner.failures()[0][2])
+
+        self.mock_request.reset_mock()
+        self.assertEqual(runner.run().failed, 2)
+        self.mock_request.assert_not_called()
+
+        self.failing_years = set()
+        final = runner.run(retry_failed=True)
+        self.assertEqual((final.done, final.failed), (10, 0))
+        self.assertEqual(sorted(self.requested_years()), ["2011", "2015"])
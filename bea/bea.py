@@ -1,10 +1,35 @@
-# TODO: APIError handling
-
 import os
-from json import load
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 
-import requests
+from bea.bulk import plan_requests, stitch_results
+from bea.cache import CachedResponse, make_key
+from bea.ratelimit import RateLimiter, parse_retry_after
+from bea.result import BeaResult
+from bea.schema import DatasetsArgs, normalize_name, parameter_names
+from bea.singleflight import SingleFlight
+
+DEFAULT_ORIGIN_URL = "https://apps.bea.gov/api/data"
+DEFAULT_POOL_MAXSIZE = 10
+# The dataset requested by each public dataset method
+DATASET_METHODS = {
+    "nipa": "NIPA",
+    "ni_underlying_detail": "NIUnderlyingDetail",
+    "fixed_assets": "FixedAssets",
+    "mne_di": "MNE",
+    "mne_amne": "MNE",
+    "gdp_by_industry": "GDPbyIndustry",
+    "ita": "ITA",
+    "iip": "IIP",
+    "input_output": "InputOutput",
+    "underlying_gdp_by_industry": "UnderlyingGDPbyIndustry",
+    "intl_serv_trade": "IntlServTrade",
+    "regional": "Regional",
+    "intl_serv_sta": "IntlServSTA",
+    "api_dataset_meta_data": "APIDatasetMetaData",
+}
 
 
 class Bea:
@@ -14,51 +39,74 @@ class Bea:
                "GetParameterValues",
                "GetParameterValuesFiltered"]
 
-    # Load config file
+    # Config file, loaded on first use
     dataset_args_filename = "datasets_args.json"
     dataset_args_filepath = os.path.join(os.path.dirname(__file__), dataset_args_filename)
-    with open(dataset_args_filepath, "r") as file:
-        datasets_args = load(file)
+    datasets_args = DatasetsArgs()
 
-    def __init__(self):
+    def __init__(self,
+                 cache=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 catalog=None,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False,
+                 base_url=None,
+                 instrumentation=None,
+                 spool_dir=None,
+                 adapter=None):
+        # requests and the modules built on it are imported where they are used, so that
+        # importing the client does not load them
+        import requests
+
+        from bea.stream import CHUNK_SIZE
+        from bea.validation import Validator
         self.__api_token = os.environ["BEA_API_KEY"]
         self.__query_params = {
             "UserID": self.__api_token,
             "method": "GetData",
             "ResultFormat": "json",
         }
-        self.__origin_url = "https://apps.bea.gov/api/data"
+        # Overridable to point the client at a stand-in such as bea.mockserver
+        self.__origin_url = base_url or os.environ.get("BEA_API_URL", DEFAULT_ORIGIN_URL)
+        # Each thread gets its own session, since sessions are not guaranteed to be thread-safe,
+        # but all of them share one adapter and so one pool of keep-alive connections. A given
+        # adapter (e.g. adapters.RevalidatingAdapter) replaces the default one and its pool size.
+        if adapter is None:
+            from bea.adapters import PooledAdapter
+            adapter = PooledAdapter(pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.adapter = adapter
+        self.__local = threading.local()
         self.request_session = requests.Session()
+        self.request_session.mount("https://", self.adapter)
+        self.request_session.mount("http://", self.adapter)
+        self.__local.session = self.request_session
+        self.cache = cache  # Opt-in bea.cache.ResponseCache
+        # Paces requests against BEA's per-key quotas; shared by every thread using this client
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        if retry_policy is None:
+            from bea.retry import RetryPolicy
+            retry_policy = RetryPolicy()
+        self.retry_policy = retry_policy
+        # Rejects invalid requests locally; a bea.catalog.Catalog adds checks of the values
+        self.validator = Validator(self.datasets_args, catalog)
+        self.single_flight = SingleFlight()
+        self.chunk_size = CHUNK_SIZE
+        # Opt-in bea.instrumentation.Instrumentation; without it requests are not timed
+        self.instrumentation = instrumentation
+        # Where spool() writes response bodies; the system temporary directory by default
+        if spool_dir is None:
+            from bea.spool import default_spool_dir
+            spool_dir = default_spool_dir()
+        self.spool_dir = spool_dir
 
 # PRIVATE METHODS
     def __validate_inputs(self, params=None):
         if params is not None:
             if "datasetname" in params:  # Validate param values if we know dataset_name
-                # TODO: Custom logic for MNE Dataset
-                # TODO: Validate param values
-                dataset_name = params["datasetname"]
                 if "method" not in params:  # escapes this statement if the method is
                     # _get_parameter_values
-                    if dataset_name == 'ITA':
-                        if (params["Indicator"] is None) and (params["AreaOrCountry"] is None):
-                            raise TypeError(
-                                "Either exactly one Indicator must be requested or exactly one\
-                                AreaOrCountry other than AllCountries must be requested."
-                            )
-
-                    if dataset_name == 'IIP':
-                        if (params["Year"] is None) and (params["TypeOfInvestment"] is None):
-                            raise TypeError(
-                                "Either exactly one TypeOfInvestment must be requested\
-                                or exactly one Year must be requested."
-                            )
-
-                    if dataset_name == 'IntlServTrade':
-                        if (params["TypeOfService"] is None) and (params["AreaOrCountry"] is None):
-                            raise TypeError(
-                                "Either exactly one TypeOfService must be requested or exactly one\
-                                AreaOrCountry other than AllCountries must be requested."
-                            )
+                    self.validator.validate(params["datasetname"], params)
 
         # Overwrite default query params with user-supplied params
         query_params = copy(self.__query_params)
@@ -67,55 +115,277 @@ class Bea:
                 query_params[param] = params[param]
         return query_params
 
+    def __get_session(self):
+        session = getattr(self.__local, "session", None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update(self.request_session.headers)
+            session.auth = self.request_session.auth
+            session.proxies = self.request_session.proxies
+            session.verify = self.request_session.verify
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self.__local.session = session
+        return session
+
+    def __api_params(self, dataset_name, params):
+        # Renames params to the dataset's API parameter names; unknown names are kept as given
+        names = parameter_names(dataset_name)
+        return {
+            names.get(normalize_name(name), name): value for name, value in params.items()
+        }
+
     def __compose_full_url(self, path=None):
         # Creating this method just in case the implementation of URLs changes in the future
         return self.__origin_url
 
-    def __send_request(self, full_url, kwargs):
-        response = self.request_session.get(full_url, params=kwargs)
-        if response.ok:
-            return response
-        else:
-            raise requests.exceptions.RequestException()
+    def __send_request(self, full_url, kwargs, stream=False):
+        from bea.errors import BeaPayloadError, error_from_response
+        trace = getattr(self.__local, "trace", None)
+        attempt = 0
+        while True:
+            attempt += 1
+            waited = self.rate_limiter.acquire()
+            session = self.__get_session()
+            if trace is not None:
+                trace.attempts += 1
+                trace.rate_limit_wait += waited
+                trace.add("rate_limit", waited)
+                sent = time.perf_counter()
+            try:
+                if stream:
+                    response = session.get(full_url, params=kwargs, stream=True)
+                else:
+                    response = session.get(full_url, params=kwargs)
+            except self.retry_policy.retry_exceptions as error:
+                if not self.retry_policy.should_retry(attempt, error):
+                    raise
+                self.retry_policy.wait(attempt)
+                continue
 
-    def __process_request(self, dataset_name, params):
+            if trace is not None:
+                # requests measures elapsed up to the response headers, so the rest of the time
+                # spent in get() is the body download
+                received = time.perf_counter()
+                time_to_first_byte = min(response.elapsed.total_seconds(), received - sent)
+                trace.add("send", time_to_first_byte)
+                trace.add("download", received - sent - time_to_first_byte)
+                trace.status_code = response.status_code
+            if stream and response.ok:
+                # The body is still unread; its size is charged as it is consumed
+                self.rate_limiter.record(response, size=0)
+                return response
+            self.rate_limiter.record(response)
+            if trace is not None:
+                trace.bytes += len(response.content)
+                received = time.perf_counter()
+            error = error_from_response(response)
+            if trace is not None:
+                trace.add("payload_check", time.perf_counter() - received)
+            if error is None:
+                return response
+            if isinstance(error, BeaPayloadError):
+                self.rate_limiter.record_error()
+            if not self.retry_policy.should_retry(attempt, error):
+                raise error
+            self.retry_policy.wait(attempt, parse_retry_after(response.headers.get("Retry-After")))
+
+    def __fetch(self, dataset_name, full_url, query_params):
+        response = self.__send_request(full_url, query_params)
+        if self.cache is not None:
+            trace = getattr(self.__local, "trace", None)
+            if trace is not None:
+                trace.last = time.perf_counter()
+            self.cache.set(dataset_name, query_params, response.content)
+            if trace is not None:
+                trace.mark("cache_store")
+        return response
+
+    def __process_result(self, dataset_name, params):
+        # Like __process_request, but returns a BeaResult. Its payload is parsed when first read.
+        return self.__result(self.__process_request(dataset_name, params))
+
+    def __process_request(self, dataset_name, params, stream=False):
+        trace = None
+        if self.instrumentation is not None:
+            trace = self.instrumentation.start(dataset_name, params.get("method", "GetData"))
+        # __send_request charges attempts to the trace of the current thread. Requests made while
+        # this one is running (e.g. catalog lookups during validation) have their own trace, so
+        # the outer one is put back when they finish.
+        outer_trace = getattr(self.__local, "trace", None)
+        self.__local.trace = trace
+        try:
+            response = self.__run_request(dataset_name, params, stream, trace)
+        except Exception as error:
+            if trace is not None:
+                self.instrumentation.finish(trace, error)
+            raise
+        finally:
+            self.__local.trace = outer_trace
+        if trace is not None:
+            self.instrumentation.finish(trace)
+        return response
+
+    def __run_request(self, dataset_name, params, stream, trace):
         params = copy(params)
         params["datasetname"] = dataset_name
         query_params = self.__validate_inputs(params)
+        if trace is not None:
+            trace.mark("validation")
+        if self.cache is not None:
+            cached_response = self.cache.get(dataset_name, query_params)
+            if trace is not None:
+                trace.mark("cache_lookup")
+                trace.cache = "miss" if cached_response is None else "hit"
+            if cached_response is not None:
+                if trace is not None:
+                    trace.status_code = cached_response.status_code
+                    trace.bytes = len(cached_response.content)
+                return cached_response
         full_url = self.__compose_full_url()
-        response = self.__send_request(full_url, query_params)
+        if trace is not None:
+            trace.mark("compose_url")
+        if stream:
+            return self.__send_request(full_url, query_params, stream=True)
+
+        # Identical requests already in flight on other threads share that response
+        shared = True
+
+        def fetch():
+            nonlocal shared
+            shared = False
+            return self.__fetch(dataset_name, full_url, query_params)
+
+        response = self.single_flight.do(make_key(query_params), fetch)
+        if trace is not None and shared:
+            # Nothing was sent for this call: it waited for another thread's request
+            trace.shared = True
+            trace.status_code = response.status_code
+            trace.mark("shared_wait")
         return response
 
+    def __result(self, response):
+        # Cached responses decoded from columns already carry their payload
+        if isinstance(response, CachedResponse) and response.payload is not None:
+            return BeaResult.from_payload(response.payload, response.text)
+        return BeaResult(response.text)
+
+    def __iter_content(self, response):
+        try:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                self.rate_limiter.record_bytes(len(chunk))
+                yield chunk
+        finally:
+            response.close()
+
 # PROTECTED METHODS
+    def _get_dataset_list(self, **kwargs):
+        kwargs["method"] = "GetDatasetList"
+        response = self.__process_request(None, kwargs)
+        return response.text
+
+    def _get_parameter_list(self, dataset_name, **kwargs):
+        kwargs["method"] = "GetParameterList"
+        response = self.__process_request(dataset_name, kwargs)
+        return response.text
+
     def _get_parameter_values(self, dataset_name, parameter_name, **kwargs):
         kwargs["method"] = "GetParameterValues"
         kwargs["ParameterName"] = parameter_name
         response = self.__process_request(dataset_name, kwargs)
         return response.text
 
+    def _get_parameter_values_filtered(self, dataset_name, target_parameter, **kwargs):
+        kwargs["method"] = "GetParameterValuesFiltered"
+        kwargs["TargetParameter"] = target_parameter
+        response = self.__process_request(dataset_name, kwargs)
+        return response.text
+
 # PUBLIC METHODS
+    def map(self, fn, args_list, workers=DEFAULT_POOL_MAXSIZE):
+        # Calls fn (a callable or the name of a method of this client) once per item of
+        # args_list on a thread pool and returns the results in order. Items are dicts of
+        # keyword arguments or sequences of positional arguments.
+        if isinstance(fn, str):
+            fn = getattr(self, fn)
+
+        def call(args):
+            if isinstance(args, dict):
+                return fn(**args)
+            return fn(*args)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(call, args_list))
+
+    def bulk(self, dataset_name, workers=4, chunk_sizes=None, **param_lists):
+        # Fetches the grid of parameter values in param_lists (API parameter names, each a value
+        # or a list of values) in as few requests as possible and returns one stitched result
+        param_lists = self.__api_params(dataset_name, param_lists)
+        planned_params = plan_requests(self.datasets_args, dataset_name, param_lists, chunk_sizes)
+        results = self.map(
+            lambda params: self.__process_result(dataset_name, params),
+            [(params,) for params in planned_params],
+            workers=workers
+        )
+        return stitch_results(results)
+
+    def stream_rows(self, dataset_name, **kwargs):
+        # Yields the rows of BEAAPI.Results.Data as they are downloaded, in constant memory
+        from bea import stream as streaming
+        response = self.__process_request(
+            dataset_name, self.__api_params(dataset_name, kwargs), stream=True
+        )
+        if isinstance(response, CachedResponse):
+            yield from streaming.iter_data_rows(streaming.iter_chunks(response.content))
+        else:
+            yield from streaming.iter_data_rows(self.__iter_content(response))
+
+    def spool(self, dataset_name, **params):
+        # Like get, but the body is streamed to a file in spool_dir and returned memory-mapped
+        # as a bea.spool.SpooledResult, so it is never held in memory. Responses served from
+        # the cache are spooled too; spooled downloads are not added to the cache.
+        from bea import errors
+        from bea import spool as spooling
+        from bea import stream as streaming
+        response = self.__process_request(
+            dataset_name, self.__api_params(dataset_name, params), stream=True
+        )
+        if isinstance(response, CachedResponse):
+            chunks = streaming.iter_chunks(response.content)
+        else:
+            chunks = self.__iter_content(response)
+        result = spooling.spool_chunks(chunks, self.spool_dir)
+        error = errors.error_from_content(result.buffer)
+        if error is not None:
+            result.close()
+            raise error
+        return result
+
+    def get(self, dataset_name, **params):
+        # Requests any dataset. params are API parameters, named as in the API (in any case) or
+        # in snake_case (table_name=...).
+        return self.__process_result(dataset_name, self.__api_params(dataset_name, params))
+
     def nipa(self, year, frequency, table_name, **kwargs):
-        kwargs["Year"], kwargs["Frequency"], kwargs["TableName"] = year, frequency, table_name
-        # print(kwargs)
-        response = self.__process_request('NIPA', kwargs)
-        return response.text
+        return self.get("NIPA", year=year, frequency=frequency, table_name=table_name, **kwargs)
 
     def ni_underlying_detail(self, year, frequency, table_name, **kwargs):
-        kwargs["Year"], kwargs["Frequency"], kwargs["TableName"] = year, frequency, table_name
-        response = self.__process_request('NIUnderlyingDetail', kwargs)
-        return response.text
+        return self.get(
+            "NIUnderlyingDetail", year=year, frequency=frequency, table_name=table_name, **kwargs
+        )
 
     def fixed_assets(self, year, table_name, **kwargs):
-        kwargs["Year"], kwargs["TableName"] = year, table_name
-        response = self.__process_request('FixedAssets', kwargs)
-        return response.text
+        return self.get("FixedAssets", year=year, table_name=table_name, **kwargs)
 
     def mne_di(self, direction_of_investment, classification, year, **kwargs):
-        kwargs["Year"] = year
-        kwargs["DirectionOfInvestment"] = direction_of_investment
-        kwargs["Classification"] = classification
-        response = self.__process_request('MNE', kwargs)
-        return response.text
+        return self.get(
+            "MNE",
+            direction_of_investment=direction_of_investment,
+            classification=classification,
+            year=year,
+            **kwargs
+        )
 
     def mne_amne(self,
                  direction_of_investment,
@@ -124,60 +394,60 @@ class Bea:
                  ownership_level,
                  non_bank_affiliates_only,
                  **kwargs):
-        kwargs["DirectionOfInvestment"] = direction_of_investment
-        kwargs["Classification"] = classification
-        kwargs["Year"] = year
-        kwargs["OwnershipLevel"] = ownership_level
-        kwargs["NonBankAffiliatesOnly"] = non_bank_affiliates_only
-        response = self.__process_request('MNE', kwargs)
-        return response.text
+        return self.get(
+            "MNE",
+            direction_of_investment=direction_of_investment,
+            classification=classification,
+            year=year,
+            ownership_level=ownership_level,
+            non_bank_affiliates_only=non_bank_affiliates_only,
+            **kwargs
+        )
 
     def gdp_by_industry(self, table_id, frequency, year, industry, **kwargs):
-        kwargs["TableId"] = table_id
-        kwargs["Frequency"] = frequency
-        kwargs["Year"] = year
-        kwargs["Industry"] = industry
-        response = self.__process_request('GDPbyIndustry', kwargs)
-        return response.text
+        return self.get(
+            "GDPbyIndustry",
+            table_id=table_id,
+            frequency=frequency,
+            year=year,
+            industry=industry,
+            **kwargs
+        )
 
     def ita(self, indicator=None, area_or_country=None, **kwargs):
-        kwargs["Indicator"] = indicator
-        kwargs["AreaOrCountry"] = area_or_country
-        response = self.__process_request('ITA', kwargs)
-        return response.text
+        return self.get("ITA", indicator=indicator, area_or_country=area_or_country, **kwargs)
 
     def iip(self, year=None, type_of_investment=None, **kwargs):
-        kwargs["Year"] = year
-        kwargs["TypeOfInvestment"] = type_of_investment
-        response = self.__process_request('IIP', kwargs)
-        return response.text
+        return self.get("IIP", year=year, type_of_investment=type_of_investment, **kwargs)
 
     def input_output(self, table_id, year, **kwargs):
-        kwargs["TableId"], kwargs["Year"] = table_id, year
-        response = self.__process_request('InputOutput', kwargs)
-        return response.json()
+        return self.get("InputOutput", table_id=table_id, year=year, **kwargs)
 
     def underlying_gdp_by_industry(self, table_id, frequency, year, industry, **kwargs):
-        kwargs["TableId"] = table_id
-        kwargs["Frequency"] = frequency
-        kwargs["Year"] = year
-        kwargs["Industry"] = industry
-        response = self.__process_request('UnderlyingGDPbyIndustry', kwargs)
-        return response.text
+        return self.get(
+            "UnderlyingGDPbyIndustry",
+            table_id=table_id,
+            frequency=frequency,
+            year=year,
+            industry=industry,
+            **kwargs
+        )
 
     def intl_serv_trade(self, type_of_service=None, area_or_country=None, **kwargs):
-        kwargs["TypeOfService"] = type_of_service
-        kwargs["AreaOrCountry"] = area_or_country
-        response = self.__process_request('IntlServTrade', kwargs)
-        return response.text
+        return self.get(
+            "IntlServTrade",
+            type_of_service=type_of_service,
+            area_or_country=area_or_country,
+            **kwargs
+        )
 
     def regional(self, table_name, line_code, geo_fips, **kwargs):
-        kwargs["TableName"] = table_name
-        kwargs["LineCode"] = line_code
-        kwargs["GeoFips"] = geo_fips
-        response = self.__process_request('Regional', kwargs)
-        return response.text
+        return self.get(
+            "Regional", table_name=table_name, line_code=line_code, geo_fips=geo_fips, **kwargs
+        )
 
     def intl_serv_sta(self, **kwargs):
-        response = self.__process_request('IntlServSTA', kwargs)
-        return response.text
+        return self.get("IntlServSTA", **kwargs)
+
+    def api_dataset_meta_data(self, dataset, **kwargs):
+        return self.get("APIDatasetMetaData", dataset=dataset, **kwargs)
@@ -1,9 +1,9 @@
 from unittest import TestCase, mock
-from copy import copy
 from json import loads, load, dumps
 
 from bea import bea
 from bea.bea import Bea
+from bea.schema import parameter_names
 
 # Testing methodology
 # 1. Develop unit tests for each method
@@ -23,6 +23,29 @@ def common_setup(func):
     return wrapper
 
 
+# Common setup for tests of the client against a faked requests.Session.get
+TEST_API_KEY = "ABCD-EFGH-IJKL-MNOP-1234"
+
+
+def patch_api_key(test_case):
+    patcher = mock.patch.dict(bea.os.environ, {"BEA_API_KEY": TEST_API_KEY})
+    test_case.addCleanup(patcher.stop)
+    patcher.start()
+
+
+def patch_session_get(test_case, fake_get=None):
+    # Returns the mock of Session.get; fake_get(session, url, params) builds its responses
+    patcher = mock.patch('requests.Session.get', autospec=True, side_effect=fake_get)
+    test_case.addCleanup(patcher.stop)
+    return patcher.start()
+
+
+def fake_response(payload):
+    # A successful response whose body is payload serialized
+    text = dumps(payload)
+    return mock.Mock(ok=True, content=text.encode(), text=text)
+
+
 # Utilities for parsing and privatizing API responses
 def strip_times_from_api_response(response):
     # Strip UTCProductionTime
@@ -70,32 +93,8 @@ def api_endpt_fn_calls_process_request_correctly(self, api_endpt_fn, reqd_fn_arg
     self.mock_request = patcher1.start()
 
     # Discern which api_endpoint_fn is being called
-    if api_endpt_fn == self.client.nipa:
-        datasetname = 'NIPA'
-    elif api_endpt_fn == self.client.ni_underlying_detail:
-        datasetname = 'NIUnderlyingDetail'
-    elif api_endpt_fn == self.client.fixed_assets:
-        datasetname = 'FixedAssets'
-    elif api_endpt_fn == self.client.mne_di:
-        datasetname = 'MNE'
-    elif api_endpt_fn == self.client.mne_amne:
-        datasetname = 'MNE'
-    elif api_endpt_fn == self.client.gdp_by_industry:
-        datasetname = 'GDPbyIndustry'
-    elif api_endpt_fn == self.client.ita:
-        datasetname = 'ITA'
-    elif api_endpt_fn == self.client.iip:
-        datasetname = 'IIP'
-    elif api_endpt_fn == self.client.input_output:
-        datasetname = 'InputOutput'
-    elif api_endpt_fn == self.client.underlying_gdp_by_industry:
-        datasetname = 'UnderlyingGDPbyIndustry'
-    elif api_endpt_fn == self.client.intl_serv_trade:
-        datasetname = 'IntlServTrade'
-    elif api_endpt_fn == self.client.regional:
-        datasetname = 'Regional'
-    elif api_endpt_fn == self.client.intl_serv_sta:
-        datasetname = 'IntlServSTA'
+    datasetname = bea.DATASET_METHODS[api_endpt_fn.__name__]
+    api_names = {name.lower(): name for name in parameter_names(datasetname).values()}
 
     for input_name in self.inputs:
         with mock.patch(
@@ -105,13 +104,12 @@ def api_endpt_fn_calls_process_request_correctly(self, api_endpt_fn, reqd_fn_arg
             api_endpt_fn_args = self.inputs[input_name]
             api_endpt_fn(**api_endpt_fn_args)
 
-            snakecase_args = []
-            temp_dict = copy(api_endpt_fn_args)
-            for key in self.inputs[input_name]:
+            # Arguments are sent under the dataset's API parameter names
+            temp_dict = {}
+            for key, value in api_endpt_fn_args.items():
                 if key in reqd_fn_args:
-                    snakecase_args.append(key)
-                    temp_dict.update({snakecase_to_camelcase(key): temp_dict[key]})
-            [temp_dict.pop(arg) for arg in snakecase_args]
+                    key = snakecase_to_camelcase(key)
+                temp_dict[api_names.get(key.lower(), key)] = value
             mock_process.assert_called_once_with(datasetname, temp_dict)
 
 
@@ -285,7 +283,9 @@ class TestProcessRequest(TestCase):
     @classmethod
     @common_setup
     def setUpClass(self):
-        pass
+        patcher2 = mock.patch('requests.Session.get', autospec=True)
+        self.addClassCleanup(patcher2.stop)
+        self.mock_request = patcher2.start()
 
     # Unit tests
     def test_calls_validate_inputs_correctly(self):
@@ -293,13 +293,15 @@ class TestProcessRequest(TestCase):
             "input1": (
                 "NIPA",
                 {
-                    "key1": "val1",
-                    "key2": "val2"
+                    "Year": 2005,
+                    "Frequency": "A",
+                    "TableName": "T10101"
                 }
             ),
             "output1": {
-                "key1": "val1",
-                "key2": "val2",
+                "Year": 2005,
+                "Frequency": "A",
+                "TableName": "T10101",
                 "datasetname": "NIPA"
             }
         }
@@ -318,8 +320,9 @@ class TestProcessRequest(TestCase):
             "input1": (
                 "NIPA",
                 {
-                    "key1": "val1",
-                    "key2": "val2"
+                    "Year": 2005,
+                    "Frequency": "A",
+                    "TableName": "T10101"
                 }
             ),
         }
@@ -337,8 +340,9 @@ class TestProcessRequest(TestCase):
             "input1": (
                 "NIPA",
                 {
-                    "key1": "val1",
-                    "key2": "val2"
+                    "Year": 2005,
+                    "Frequency": "A",
+                    "TableName": "T10101"
                 }
             ),
         }
@@ -668,3 +672,43 @@ class TestIntlServSta(TestCase):
     @classmethod
     def tearDownClass(self):
         del self.client
+
+
+class TestGet(TestCase):
+
+    @classmethod
+    @common_setup
+    def setUpClass(self):
+        pass
+
+    def setUp(self):
+        response = fake_response({"BEAAPI": {"Results": {"Data": [{"DataValue": "1"}]}}})
+        self.mock_request = patch_session_get(self, lambda session, url, params: response)
+
+    def sent_params(self):
+        return self.mock_request.call_args.kwargs["params"]
+
+    # Unit tests
+    def test_maps_parameter_names(self):
+        self.client.get("GDPbyIndustry", table_id=1, FREQUENCY="A", Year=2017, industry="ALL")
+        self.assertEqual(self.sent_params()["datasetname"], "GDPbyIndustry")
+        for name in ("TableID", "Frequency", "Year", "Industry"):
+            self.assertIn(name, self.sent_params())
+
+    def test_returns_results_for_every_dataset_method(self):
+        self.assertEqual(self.client.input_output(table_id=259, year=2017).data,
+                         [{"DataValue": "1"}])
+        self.client.api_dataset_meta_data(dataset="NIPA")
+        self.assertEqual(self.sent_params()["datasetname"], "APIDatasetMetaData")
+        self.assertEqual(self.sent_params()["Dataset"], "NIPA")
+        for method_name in bea.DATASET_METHODS:
+            self.assertTrue(callable(getattr(self.client, method_name)))
+
+    def test_rejects_unknown_datasets(self):
+        with self.assertRaises(TypeError):
+            self.client.get("Unknown", year=2017)
+        self.mock_request.assert_not_called()
+
+    @classmethod
+    def tearDownClass(self):
+        del self.client
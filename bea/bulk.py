@@ -0,0 +1,71 @@
+from copy import copy
+from itertools import product
+
+from bea.result import BeaResult
+
+# Largest number of values sent in one comma-separated parameter. Splitting long Year ranges and
+# GeoFips lists keeps each response well under BEA's response size limit.
+DEFAULT_CHUNK_SIZES = {
+    "Year": 10,
+    "GeoFips": 500,
+}
+DEFAULT_CHUNK_SIZE = 50
+
+
+def dataset_schema(datasets_args, dataset_name, params=()):
+    schema = datasets_args[dataset_name]
+    if "DI" in schema:  # MNE: AMNE requests are the ones that specify ownership
+        lower_params = {param.lower() for param in params}
+        if {"ownershiplevel", "nonbankaffiliatesonly"} & lower_params:
+            return schema["AMNE"]
+        return schema["DI"]
+    return schema
+
+
+def as_list(values):
+    if isinstance(values, (list, tuple, set, frozenset, range)):
+        return list(values)
+    return [values]
+
+
+def chunk(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def plan_requests(datasets_args, dataset_name, param_lists, chunk_sizes=None):
+    # Expands a grid of parameter values into the fewest requests BEA accepts. Parameters that
+    # take comma-separated values are joined (in chunks), the others are crossed.
+    schema = dataset_schema(datasets_args, dataset_name, param_lists)
+    multiple = {param.lower() for param in schema.get("multiple", ())}
+    sizes = {param.lower(): size for param, size in DEFAULT_CHUNK_SIZES.items()}
+    if chunk_sizes is not None:
+        sizes.update({param.lower(): size for param, size in chunk_sizes.items()})
+
+    names = list(param_lists)
+    axes = []
+    for name in names:
+        values = as_list(param_lists[name])
+        if name.lower() in multiple:
+            size = sizes.get(name.lower(), DEFAULT_CHUNK_SIZE)
+            axes.append([",".join(map(str, group)) for group in chunk(values, size)])
+        else:
+            axes.append(values)
+    return [dict(zip(names, combination)) for combination in product(*axes)]
+
+
+def stitch_results(results):
+    # Concatenates the Data arrays of several responses into one result, keeping the rest of
+    # the first response's payload
+    if not results:
+        return None
+    payload = copy(results[0].payload)
+    payload["BEAAPI"] = copy(payload["BEAAPI"])
+    first_results = payload["BEAAPI"]["Results"]
+    if isinstance(first_results, list):
+        first_results = copy(first_results[0])
+        payload["BEAAPI"]["Results"] = [first_results]
+    else:
+        first_results = copy(first_results)
+        payload["BEAAPI"]["Results"] = first_results
+    first_results["Data"] = [row for result in results for row in result.data]
+    return BeaResult.from_payload(payload)
@@ -0,0 +1,79 @@
+from json import dumps, loads
+from unittest import TestCase
+
+from bea.bea import Bea
+from bea.bea_test import fake_response, patch_api_key, patch_session_get
+from bea.bulk import plan_requests, stitch_results
+from bea.result import BeaResult
+
+
+class TestPlanRequests(TestCase):
+
+    # Unit tests
+    def test_joins_multiple_value_params_and_crosses_the_rest(self):
+        planned = plan_requests(
+            Bea.datasets_args,
+            "Regional",
+            {"TableName": "SAGDP1", "LineCode": [1, 2], "GeoFips": ["GA", "AL"],
+             "Year": [2018, 2019]}
+        )
+        self.assertEqual(planned, [
+            {"TableName": "SAGDP1", "LineCode": 1, "GeoFips": "GA,AL", "Year": "2018,2019"},
+            {"TableName": "SAGDP1", "LineCode": 2, "GeoFips": "GA,AL", "Year": "2018,2019"},
+        ])
+
+    def test_splits_oversized_requests(self):
+        planned = plan_requests(
+            Bea.datasets_args,
+            "NIPA",
+            {"TableName": ["T10101", "T10102"], "Frequency": ["A", "Q"],
+             "Year": range(2000, 2025)},
+            chunk_sizes={"Year": 10}
+        )
+        self.assertEqual(len(planned), 6)
+        self.assertEqual(planned[0]["Frequency"], "A,Q")
+        self.assertEqual(
+            [params["Year"] for params in planned[:3]],
+            [",".join(map(str, range(2000, 2010))),
+             ",".join(map(str, range(2010, 2020))),
+             ",".join(map(str, range(2020, 2025)))]
+        )
+
+
+class TestStitchResults(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        results = [
+            BeaResult(dumps({"BEAAPI": {"Results": {"Notes": [], "Data": [{"a": str(i)}]}}}))
+            for i in range(3)
+        ]
+        stitched = stitch_results(results)
+        self.assertEqual(stitched.data, [{"a": "0"}, {"a": "1"}, {"a": "2"}])
+        self.assertEqual(loads(stitched), stitched.payload)
+        self.assertEqual(results[0].data, [{"a": "0"}])
+
+
+class TestBeaBulk(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        def fake_get(session, url, params):
+            rows = [{"GeoFips": geo_fips, "TimePeriod": year, "LineCode": str(params["LineCode"])}
+                    for geo_fips in params["GeoFips"].split(",")
+                    for year in params["Year"].split(",")]
+            return fake_response({"BEAAPI": {"Results": {"Data": rows}}})
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.client = Bea()
+
+    # Integration tests
+    def test_output_value(self):
+        result = self.client.bulk(
+            "Regional", TableName="SAGDP1", LineCode=[1, 2], GeoFips=["GA", "AL"],
+            Year=range(2015, 2020), chunk_sizes={"Year": 3}
+        )
+        self.assertEqual(self.mock_request.call_count, 4)
+        self.assertEqual(len(result.data), 2 * 2 * 5)
+        self.assertEqual(result.data[0], {"GeoFips": "GA", "TimePeriod": "2015", "LineCode": "1"})
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from hashlib import sha256
+from json import dumps, loads
+
+from bea import codec as codecs
+from bea.utils import lowercase
+
+
+def default_cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache"))
+    return os.path.join(os.path.expanduser(cache_home), "bea", "responses.sqlite")
+
+
+def make_key(query_params):
+    # BEA parameter names and values are case-insensitive, and the API token must never be part
+    # of the key so that caches can be shared between keys
+    normalized = {
+        key: str(value)
+        for key, value in lowercase(query_params).items()
+        if key != "userid" and value is not None
+    }
+    return sha256(dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    # Minimal stand-in for requests.Response when a request is served from the cache
+    status_code = 200
+    ok = True
+    from_cache = True
+
+    def __init__(self, content, encoding="utf-8", payload=None):
+        self.content = content
+        self.encoding = encoding
+        # The payload decoded along with content by the codec, if any
+        self.payload = payload
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding)
+
+    def json(self):
+        return loads(self.content)
+
+
+class ResponseCache:
+    def __init__(self,
+                 path=None,
+                 default_ttl=24 * 60 * 60,
+                 ttls=None,
+                 max_size=512 * 2**20,
+                 codec=None):
+        # default_ttl and the values of ttls (dataset name -> seconds) may be None to never expire.
+        # With a codec (e.g. codec.CompactCodec()) bodies are stored encoded; encoded entries are
+        # read back whatever the codec, so one can be added to or removed from an existing cache.
+        self.path = path if path is not None else default_cache_path()
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls) if ttls is not None else {}
+        self.max_size = max_size
+        self.codec = codec
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.__lock = threading.Lock()
+        import sqlite3
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "dataset TEXT, "
+                "expires REAL, "
+                "accessed REAL, "
+                "size INTEGER, "
+                "body BLOB)"
+            )
+            self.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+# PRIVATE METHODS
+    def __ttl(self, dataset_name):
+        if dataset_name in self.ttls:
+            return self.ttls[dataset_name]
+        return self.default_ttl
+
+    def __evict(self, now):
+        # Expired entries go first, then least recently used entries until we fit in max_size
+        self.__connection.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+        total_size = self.__connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if self.max_size is None or total_size <= self.max_size:
+            return
+        rows = self.__connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total_size <= self.max_size:
+                break
+            evicted.append((key,))
+            total_size -= size
+        self.__connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+# PUBLIC METHODS
+    def get(self, dataset_name, query_params):
+        key = make_key(query_params)
+        now = time.time()
+        with self.__lock, self.__connection:
+            row = self.__connection.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            self.__connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+        try:
+            content, payload = codecs.decode_content(row[0])
+        except ValueError:
+            # Written by an older codec version, or damaged: fetched and stored again
+            with self.__lock, self.__connection:
+                self.__connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+            return None
+        with self.__lock:
+            self.hits += 1
+        return CachedResponse(content, payload=payload)
+
+    def set(self, dataset_name, query_params, content):
+        key = make_key(query_params)
+        now = time.time()
+        ttl = self.__ttl(dataset_name)
+        expires = now + ttl if ttl is not None else None
+        if self.codec is not None:
+            content = self.codec.encode(content)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, dataset_name, expires, now, len(content), content)
+            )
+            self.__evict(now)
+
+    def clear(self):
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM responses")
+
+    def stats(self):
+        with self.__lock:
+            entries, size = self.__connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size": size,
+        }
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,102 @@
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.cache import ResponseCache, make_key
+
+
+class TestMakeKey(TestCase):
+
+    # Unit tests
+    def test_excludes_user_id(self):
+        self.assertEqual(
+            make_key({"UserID": "token-1", "method": "GetData", "Year": 2005}),
+            make_key({"UserID": "token-2", "method": "GetData", "Year": 2005})
+        )
+
+    def test_is_case_and_order_insensitive(self):
+        self.assertEqual(
+            make_key({"TableName": "T10101", "Frequency": "Q"}),
+            make_key({"frequency": "q", "tablename": "t10101"})
+        )
+
+    def test_distinguishes_values(self):
+        self.assertNotEqual(make_key({"Year": 2005}), make_key({"Year": 2006}))
+
+
+class TestResponseCache(TestCase):
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, "responses.sqlite")
+
+    # Unit tests
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache(self.path)
+        self.addCleanup(cache.close)
+        self.assertIsNone(cache.get("NIPA", {"Year": 2005}))
+        cache.set("NIPA", {"Year": 2005}, b'{"BEAAPI": {}}')
+        response = cache.get("NIPA", {"Year": 2005})
+        self.assertEqual(response.text, '{"BEAAPI": {}}')
+        self.assertEqual(response.json(), {"BEAAPI": {}})
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_per_dataset_ttl(self):
+        cache = ResponseCache(self.path, default_ttl=None, ttls={"NIPA": 0})
+        self.addCleanup(cache.close)
+        cache.set("NIPA", {"Year": 2005}, b"nipa")
+        cache.set("Regional", {"Year": 2005, "GeoFips": "GA"}, b"regional")
+        self.assertIsNone(cache.get("NIPA", {"Year": 2005}))
+        self.assertIsNotNone(cache.get("Regional", {"Year": 2005, "GeoFips": "GA"}))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.path, max_size=10)
+        self.addCleanup(cache.close)
+        cache.set("NIPA", {"Year": 1}, b"aaaa")
+        time.sleep(0.01)
+        cache.set("NIPA", {"Year": 2}, b"bbbb")
+        time.sleep(0.01)
+        cache.get("NIPA", {"Year": 1})  # Year 2 is now least recently used
+        time.sleep(0.01)
+        cache.set("NIPA", {"Year": 3}, b"cccc")
+        self.assertIsNotNone(cache.get("NIPA", {"Year": 1}))
+        self.assertIsNone(cache.get("NIPA", {"Year": 2}))
+        self.assertIsNotNone(cache.get("NIPA", {"Year": 3}))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["size"], 10)
+
+    def test_persists_across_instances(self):
+        cache = ResponseCache(self.path)
+        cache.set("NIPA", {"Year": 2005}, b"nipa")
+        cache.close()
+        cache = ResponseCache(self.path)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.get("NIPA", {"Year": 2005}).content, b"nipa")
+
+
+class TestBeaCache(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self)
+        self.mock_request.return_value.content = b'{"BEAAPI": {}}'
+        self.mock_request.return_value.text = '{"BEAAPI": {}}'
+
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.cache = ResponseCache(os.path.join(self.tempdir.name, "responses.sqlite"))
+        self.addCleanup(self.cache.close)
+        self.client = Bea(cache=self.cache)
+
+    # Integration tests
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.nipa(2005, "A", "T10101")
+        second = self.client.nipa(2005, "a", "t10101")
+        self.assertEqual(first, second)
+        self.mock_request.assert_called_once()
+        self.assertEqual(self.cache.stats()["hits"], 1)
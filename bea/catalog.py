@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from json import dump, load, loads
+
+# Bump when the layout of cached entries changes; older catalog files are then discarded
+CATALOG_VERSION = 1
+# Seconds between writes of the catalog file while entries are being added
+SAVE_INTERVAL = 10
+
+
+def results_list(text, field):
+    results = loads(text)["BEAAPI"]["Results"]
+    if isinstance(results, list):
+        results = results[0]
+    values = results.get(field, [])
+    return values if isinstance(values, list) else [values]
+
+
+def key_and_description(row):
+    # ParamValue rows are {"Key": ..., "Desc": ...} for most datasets, but some use their own
+    # field names, e.g. {"TableName": ..., "Description": ...} for NIPA
+    if "Key" in row:
+        return str(row["Key"]), row.get("Desc", "")
+    values = list(row.values())
+    return str(values[0]), (values[1] if len(values) > 1 else "")
+
+
+def filtered_key(dataset_name, target_parameter, filters):
+    return "|".join(
+        ["filtered", dataset_name, target_parameter]
+        + [f"{name}={value}" for name, value in sorted(filters.items())]
+    ).lower()
+
+
+class Catalog:
+    # Cache of the metadata methods (GetDatasetList, GetParameterList, GetParameterValues and
+    # GetParameterValuesFiltered), in memory and optionally on disk, with lower-cased key
+    # indexes so validity checks are set lookups. New entries are written to path at most every
+    # save_interval seconds, and by save() or close(); use the catalog as a context manager to
+    # keep everything fetched.
+    def __init__(self, client, path=None, ttl=7 * 24 * 60 * 60, save_interval=SAVE_INTERVAL):
+        self.client = client
+        self.path = path
+        self.ttl = ttl
+        self.save_interval = save_interval
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__indexes = {}
+        self.__unsaved = False
+        self.__saved = None
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as file:
+                stored = load(file)
+            if stored.get("version") == CATALOG_VERSION:
+                self.__entries = stored["entries"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# PRIVATE METHODS
+    def __save(self):
+        self.__unsaved = False
+        self.__saved = time.monotonic()
+        if self.path is None:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            dump({"version": CATALOG_VERSION, "entries": self.__entries}, file)
+        os.replace(temp_path, self.path)
+
+    def __lookup(self, key, fetch):
+        entry = self.__entries.get(key)
+        if entry is not None and (self.ttl is None or time.time() - entry["fetched"] < self.ttl):
+            return entry["value"]
+        value = fetch()
+        with self.__lock:
+            self.__entries[key] = {"fetched": time.time(), "value": value}
+            self.__indexes.pop(key, None)
+            self.__unsaved = True
+            # A cold run fetches many entries in a row; the file is rewritten once per interval
+            # rather than once per entry
+            if self.__saved is None or time.monotonic() - self.__saved >= self.save_interval:
+                self.__save()
+        return value
+
+    def __index(self, key, values):
+        index = self.__indexes.get(key)
+        if index is None:
+            index = frozenset(value.lower() for value in values)
+            self.__indexes[key] = index
+        return index
+
+# PUBLIC METHODS
+    def datasets(self):
+        # {DatasetName: DatasetDescription}
+        return self.__lookup("datasets", lambda: {
+            row["DatasetName"]: row.get("DatasetDescription", "")
+            for row in results_list(self.client._get_dataset_list(), "Dataset")
+        })
+
+    def parameters(self, dataset_name):
+        # {ParameterName: parameter metadata}
+        return self.__lookup(f"parameters|{dataset_name}", lambda: {
+            row["ParameterName"]: row
+            for row in results_list(self.client._get_parameter_list(dataset_name), "Parameter")
+        })
+
+    def parameter_values(self, dataset_name, parameter_name):
+        # {value: description}
+        return self.__lookup(f"values|{dataset_name}|{parameter_name}".lower(), lambda: dict(
+            key_and_description(row)
+            for row in results_list(
+                self.client._get_parameter_values(dataset_name, parameter_name), "ParamValue"
+            )
+        ))
+
+    def filtered_values(self, dataset_name, target_parameter, **filters):
+        # {value: description} of target_parameter restricted by the other parameters in filters
+        return self.__lookup(filtered_key(dataset_name, target_parameter, filters), lambda: dict(
+            key_and_description(row)
+            for row in results_list(
+                self.client._get_parameter_values_filtered(
+                    dataset_name, target_parameter, **filters
+                ),
+                "ParamValue"
+            )
+        ))
+
+    def valid_values(self, dataset_name, parameter_name):
+        key = f"values|{dataset_name}|{parameter_name}".lower()
+        return self.__index(key, self.parameter_values(dataset_name, parameter_name))
+
+    def is_valid(self, dataset_name, parameter_name, value):
+        return str(value).lower() in self.valid_values(dataset_name, parameter_name)
+
+    def table_frequencies(self, dataset_name, table_name):
+        return self.filtered_values(dataset_name, "Frequency", TableName=table_name)
+
+    def table_years(self, dataset_name, table_name, frequency=None):
+        filters = {"TableName": table_name}
+        if frequency is not None:
+            filters["Frequency"] = frequency
+        return self.filtered_values(dataset_name, "Year", **filters)
+
+    def line_codes(self, table_name, geo_fips=None):
+        # With geo_fips, only the line codes published for that area
+        filters = {"TableName": table_name}
+        if geo_fips is not None:
+            filters["GeoFips"] = geo_fips
+        return self.filtered_values("Regional", "LineCode", **filters)
+
+    def geo_fips(self, table_name, line_code=None):
+        # With line_code, only the areas that line is published for
+        filters = {"TableName": table_name}
+        if line_code is not None:
+            filters["LineCode"] = line_code
+        return self.filtered_values("Regional", "GeoFips", **filters)
+
+    def has_line_code(self, table_name, geo_fips, line_code):
+        # The GeoFips -> LineCodes index of a Regional table
+        key = filtered_key("Regional", "LineCode", {"TableName": table_name, "GeoFips": geo_fips})
+        index = self.__index(key, self.line_codes(table_name, geo_fips))
+        return str(line_code).lower() in index
+
+    def save(self):
+        # Writes entries added since the last write to path
+        with self.__lock:
+            if self.__unsaved:
+                self.__save()
+
+    def close(self):
+        self.save()
+
+    def clear(self):
+        with self.__lock:
+            self.__entries = {}
+            self.__indexes = {}
+            self.__save()
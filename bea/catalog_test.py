@@ -0,0 +1,91 @@
+import os
+from json import dump
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from bea.bea import Bea
+from bea.bea_test import fake_response, patch_api_key, patch_session_get
+from bea.catalog import Catalog
+
+METADATA_RESPONSES = {
+    "GetDatasetList": {"Dataset": [
+        {"DatasetName": "NIPA", "DatasetDescription": "Standard NIPA tables"},
+        {"DatasetName": "Regional", "DatasetDescription": "Regional data sets"},
+    ]},
+    "GetParameterList": {"Parameter": [
+        {"ParameterName": "Frequency", "ParameterIsRequiredFlag": "1",
+         "MultipleAcceptedFlag": "1"},
+    ]},
+    "GetParameterValues": {"ParamValue": [
+        {"TableName": "T10101", "Description": "Table 1.1.1"},
+        {"TableName": "T10102", "Description": "Table 1.1.2"},
+    ]},
+    "GetParameterValuesFiltered": {"ParamValue": [
+        {"Key": "A", "Desc": "Annual"},
+        {"Key": "Q", "Desc": "Quarterly"},
+    ]},
+}
+
+
+class TestCatalog(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        def fake_get(session, url, params):
+            return fake_response({"BEAAPI": {"Results": METADATA_RESPONSES[params["method"]]}})
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.client = Bea()
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, "catalog.json")
+
+    # Unit tests
+    def test_metadata_methods(self):
+        catalog = Catalog(self.client)
+        self.assertEqual(list(catalog.datasets()), ["NIPA", "Regional"])
+        self.assertEqual(catalog.parameters("NIPA")["Frequency"]["MultipleAcceptedFlag"], "1")
+        self.assertEqual(catalog.parameter_values("NIPA", "TableName")["T10101"], "Table 1.1.1")
+        self.assertEqual(catalog.table_frequencies("NIPA", "T10101"), {"A": "Annual",
+                                                                       "Q": "Quarterly"})
+        self.assertEqual(
+            self.mock_request.call_args.kwargs["params"]["TargetParameter"], "Frequency"
+        )
+
+    def test_answers_locally_after_first_call(self):
+        catalog = Catalog(self.client)
+        self.assertTrue(catalog.is_valid("NIPA", "TableName", "t10101"))
+        self.assertFalse(catalog.is_valid("NIPA", "TableName", "T99999"))
+        self.mock_request.assert_called_once()
+
+    def test_persists_to_disk(self):
+        Catalog(self.client, self.path).datasets()
+        self.assertEqual(list(Catalog(self.client, self.path).datasets()), ["NIPA", "Regional"])
+        self.mock_request.assert_called_once()
+
+    def test_batches_writes_to_disk(self):
+        with mock.patch("bea.catalog.os.replace", wraps=os.replace) as replace:
+            with Catalog(self.client, self.path) as catalog:
+                catalog.datasets()
+                catalog.parameters("NIPA")
+                catalog.parameter_values("NIPA", "TableName")
+                self.assertEqual(replace.call_count, 1)
+            self.assertEqual(replace.call_count, 2)
+        catalog = Catalog(self.client, self.path)
+        catalog.parameter_values("NIPA", "TableName")
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_line_codes_by_geo_fips(self):
+        catalog = Catalog(self.client)
+        self.assertTrue(catalog.has_line_code("SAINC1", "01000", "a"))
+        self.assertFalse(catalog.has_line_code("SAINC1", "01000", "X"))
+        self.mock_request.assert_called_once()
+        params = self.mock_request.call_args.kwargs["params"]
+        self.assertEqual((params["TargetParameter"], params["GeoFips"]), ("LineCode", "01000"))
+
+    def test_discards_other_versions(self):
+        with open(self.path, "w") as file:
+            dump({"version": -1, "entries": {"datasets": {"fetched": 0, "value": {}}}}, file)
+        self.assertEqual(list(Catalog(self.client, self.path, ttl=None).datasets()),
+                         ["NIPA", "Regional"])
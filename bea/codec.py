@@ -0,0 +1,368 @@
+import struct
+import sys
+import zlib
+from array import array
+from itertools import chain, islice, repeat
+from json import dumps, loads
+from json.encoder import encode_basestring, encode_basestring_ascii
+
+from bea.result import BeaResult, require_module
+
+MAGIC = b"BEAC"
+# Version 2 added the length and CRC-32 of the original to columnar headers
+VERSION = 2
+# Layouts of the encoded payload
+RAW = 0  # the original bytes, compressed
+COLUMNAR = 1  # Data rows stored column by column
+# Compressions, by preference
+COMPRESSIONS = {"zstd": 1, "lz4": 2, "zlib": 3}
+HEADER = struct.Struct("<4sBBBI")  # magic, version, layout, compression, header length
+# Columns with fewer distinct values than this share of rows are dictionary encoded
+DICTIONARY_RATIO = 0.5
+# Styles json.dumps may have been called with to produce a payload: (separators, ensure_ascii)
+DUMP_STYLES = (((", ", ": "), True), ((",", ":"), True), ((", ", ": "), False), ((",", ":"), False))
+INDEX_TYPES = ("B", "H", "I")
+# Stands for the Data array while the rest of a payload is serialized
+DATA_PLACEHOLDER = "\x00bea.codec.Data\x00"
+# Payloads up to this size are also compressed as they are, keeping the smaller encoding
+RAW_COMPARE_SIZE = 2**20
+
+
+def available_compression():
+    for name, module_name in (("zstd", "zstandard"), ("lz4", "lz4.frame")):
+        try:
+            require_module(module_name)
+        except ImportError:
+            continue
+        return name
+    return "zlib"
+
+
+def compress(data, compression, level=None):
+    if compression == "zstd":
+        zstandard = require_module("zstandard")
+        return zstandard.ZstdCompressor(level=level if level is not None else 3).compress(data)
+    if compression == "lz4":
+        return require_module("lz4.frame").compress(data)
+    return zlib.compress(data, level if level is not None else 6)
+
+
+def decompress(data, compression):
+    if compression == "zstd":
+        return require_module("zstandard").ZstdDecompressor().decompress(data)
+    if compression == "lz4":
+        return require_module("lz4.frame").decompress(data)
+    return zlib.decompress(data)
+
+
+def to_bytes(values):
+    # Arrays are stored little-endian
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_bytes(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def index_type(count):
+    for typecode in INDEX_TYPES:
+        if count <= 1 << (8 * array(typecode).itemsize):
+            return typecode
+    return "Q"
+
+
+def find_data(payload):
+    # The Results object holding the Data array, if the payload has one of rows
+    beaapi = payload.get("BEAAPI") if isinstance(payload, dict) else None
+    results = beaapi.get("Results") if isinstance(beaapi, dict) else None
+    if isinstance(results, list) and results:
+        results = results[0]
+    if not isinstance(results, dict) or not isinstance(results.get("Data"), list):
+        return None
+    if not all(isinstance(row, dict) for row in results["Data"]):
+        return None
+    return results
+
+
+def encode_column(values):
+    # Returns (spec, segments) for one column of values
+    kinds = {type(value) for value in values}
+    if kinds == {str}:
+        # Canonical integers such as UNIT_MULT and LineNumber are stored as typed numbers
+        if all(value.isdigit() and value.isascii() and (value == "0" or value[0] != "0")
+               and len(value) < 19 for value in values):
+            return {"kind": "intstr"}, [to_bytes(array("q", map(int, values)))]
+        distinct = list(dict.fromkeys(values))
+        if len(distinct) <= max(len(values) * DICTIONARY_RATIO, 1):
+            lookup = {value: index for index, value in enumerate(distinct)}
+            typecode = index_type(len(distinct))
+            return (
+                {"kind": "dictionary", "values": distinct, "typecode": typecode},
+                [to_bytes(array(typecode, [lookup[value] for value in values]))]
+            )
+        encoded = [value.encode("utf-8") for value in values]
+        return (
+            {"kind": "strings"},
+            [to_bytes(array("I", map(len, encoded))), b"".join(encoded)]
+        )
+    if kinds == {int} and all(-2**63 <= value < 2**63 for value in values):
+        return {"kind": "int"}, [to_bytes(array("q", values))]
+    if kinds == {float}:
+        return {"kind": "float"}, [to_bytes(array("d", values))]
+    return {"kind": "json"}, [dumps(values).encode("utf-8")]
+
+
+def decode_column(spec, segments):
+    kind = spec["kind"]
+    if kind == "intstr":
+        return [str(value) for value in from_bytes("q", segments[0])]
+    if kind == "dictionary":
+        distinct = spec["values"]
+        return [distinct[index] for index in from_bytes(spec["typecode"], segments[0])]
+    if kind == "strings":
+        blob = segments[1]
+        values = []
+        offset = 0
+        for length in from_bytes("I", segments[0]):
+            values.append(blob[offset:offset + length].decode("utf-8"))
+            offset += length
+        return values
+    if kind == "int":
+        return from_bytes("q", segments[0]).tolist()
+    if kind == "float":
+        return from_bytes("d", segments[0]).tolist()
+    return loads(segments[0])
+
+
+class CompactCodec:
+    # Compact storage for cached responses. The Data rows of a payload are stored by column:
+    # repeated strings (TableName, CL_UNIT, GeoName, ...) dictionary encoded, canonical integers
+    # and JSON numbers as typed arrays, the rest as packed strings, all compressed with zstd or
+    # lz4 when installed (zlib otherwise). Decoding restores the original bytes exactly: the text
+    # is rebuilt from the columns when encoding and compared, and payloads it does not match
+    # (e.g. not written by json.dumps) are stored compressed as they are. The length and CRC-32
+    # of the original are stored too and checked when decoding.
+    def __init__(self, compression=None, level=None):
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {list(COMPRESSIONS)}")
+        self.compression = compression if compression is not None else available_compression()
+        self.level = level
+
+# PRIVATE METHODS
+    def __pack(self, layout, header, segments):
+        header = dumps(header, separators=(",", ":")).encode("utf-8")
+        body = compress(header + b"".join(segments), self.compression, self.level)
+        return HEADER.pack(
+            MAGIC, VERSION, layout, COMPRESSIONS[self.compression], len(header)
+        ) + body
+
+    def __encode_columnar(self, content):
+        try:
+            text = content.decode("utf-8")
+            payload = loads(text)
+        except ValueError:
+            return None
+        results = find_data(payload)
+        if results is None:
+            return None
+        # The style json.dumps produced the payload with, guessed here and confirmed when the
+        # rebuilt text is compared. Indented text and rows that do not serialize back to the same
+        # text in that style fail early.
+        separators = (",", ":") if text.startswith('{"BEAAPI":{') else (", ", ": ")
+        style = DUMP_STYLES.index((separators, text.isascii()))
+        rows = results["Data"]
+        if "\n" in text or any(
+            dumps(row, separators=separators, ensure_ascii=text.isascii()) not in text
+            for row in rows[:1] + rows[-1:]
+        ):
+            return None
+
+        results["Data"] = []
+        # Rows can differ in their keys and key order, so each row records its layout
+        layouts = {}
+        row_layouts = array(index_type(len(rows) + 1))
+        columns = {}
+        for row in rows:
+            layout = tuple(row)
+            row_layouts.append(layouts.setdefault(layout, len(layouts)))
+            for name, value in row.items():
+                columns.setdefault(name, []).append(value)
+        row_layouts = array(index_type(len(layouts)), row_layouts)
+
+        specs = []
+        segments = [to_bytes(row_layouts)]
+        for name, values in columns.items():
+            spec, column_segments = encode_column(values)
+            spec["name"] = name
+            spec["sizes"] = [len(segment) for segment in column_segments]
+            specs.append(spec)
+            segments.extend(column_segments)
+        header = {
+            "payload": payload,
+            "style": style,
+            "layouts": [list(layout) for layout in layouts],
+            "layout_typecode": row_layouts.typecode,
+            "layout_size": len(segments[0]),
+            "columns": specs,
+        }
+        if payload_text(header, row_layouts, columns).encode("utf-8") != content:
+            return None
+        header["size"] = len(content)
+        header["crc32"] = zlib.crc32(content)
+        return self.__pack(COLUMNAR, header, segments)
+
+# PUBLIC METHODS
+    def encode(self, content):
+        encoded = self.__encode_columnar(content)
+        if encoded is None or len(content) <= RAW_COMPARE_SIZE:
+            # Small payloads can compress better as they are than with the columnar header
+            raw = self.__pack(RAW, {}, [content])
+            if encoded is None or len(raw) < len(encoded):
+                return raw
+        return encoded
+
+    def decode(self, blob):
+        return decode(blob)
+
+    def decode_result(self, blob):
+        return decode_result(blob)
+
+
+def unpack(blob):
+    _, version, layout, compression, header_size = HEADER.unpack_from(blob)
+    if version != VERSION:
+        raise ValueError(f"Unsupported encoding version {version}")
+    compression = {number: name for name, number in COMPRESSIONS.items()}[compression]
+    body = decompress(blob[HEADER.size:], compression)
+    return layout, loads(body[:header_size]), memoryview(body)[header_size:]
+
+
+def decode_columns(header, body):
+    # (layout index of each row, {column name: values})
+    offset = header["layout_size"]
+    row_layouts = from_bytes(header["layout_typecode"], body[:offset])
+    columns = {}
+    for spec in header["columns"]:
+        segments = []
+        for size in spec["sizes"]:
+            segments.append(bytes(body[offset:offset + size]))
+            offset += size
+        columns[spec["name"]] = decode_column(spec, segments)
+    return row_layouts, columns
+
+
+def build_rows(header, row_layouts, columns):
+    # Layouts share one iterator per column, as each value belongs to a single row
+    iterators = {name: iter(values) for name, values in columns.items()}
+    layouts = [(names, [iterators[name] for name in names]) for names in header["layouts"]]
+    if len(layouts) == 1:
+        names, iterators = layouts[0]
+        return list(map(dict, map(zip, repeat(names), zip(*iterators))))
+    rows = []
+    for layout_index in row_layouts:
+        names, iterators = layouts[layout_index]
+        rows.append({name: next(iterator) for name, iterator in zip(names, iterators)})
+    return rows
+
+
+def column_text(spec, values, separators, ensure_ascii):
+    # (the quote around each value, the values as json.dumps would write them within it)
+    kind = spec["kind"]
+    if kind == "intstr":
+        return '"', values
+    if kind == "dictionary":
+        texts = {value: dumps(value, ensure_ascii=ensure_ascii) for value in spec["values"]}
+        return "", map(texts.__getitem__, values)
+    if kind == "strings":
+        return "", map(encode_basestring_ascii if ensure_ascii else encode_basestring, values)
+    if kind in ("int", "float"):
+        return "", dumps(values, separators=separators)[1:-1].split(separators[0])
+    return "", [dumps(value, separators=separators, ensure_ascii=ensure_ascii) for value in values]
+
+
+def rows_text(header, row_layouts, columns, separators, ensure_ascii):
+    # The Data array as json.dumps would write it, joined from the text of each column rather
+    # than serialized row by row
+    item_separator, key_separator = separators
+    quotes = {}
+    texts = {}
+    for spec in header["columns"]:
+        quote, values = column_text(spec, columns[spec["name"]], separators, ensure_ascii)
+        quotes[spec["name"]], texts[spec["name"]] = quote, iter(values)
+    layouts = []
+    for names in header["layouts"]:
+        # The text of a row around its values
+        pieces = []
+        before = "{"
+        for name in names:
+            pieces.append(before + dumps(name, ensure_ascii=ensure_ascii) + key_separator
+                          + quotes[name])
+            before = quotes[name] + item_separator
+        pieces.append((quotes[names[-1]] if names else "{") + "}")
+        layouts.append((pieces, [texts[name] for name in names]))
+
+    if len(layouts) == 1:
+        pieces, iterators = layouts[0]
+        parts = []
+        for piece, iterator in zip(pieces, iterators):
+            parts.extend((repeat(piece), iterator))
+        parts.append(repeat(pieces[-1] + item_separator))
+        text = "".join(chain.from_iterable(islice(zip(*parts), len(row_layouts))))
+        return "[" + text[:-len(item_separator)] + "]"
+    rows = []
+    for layout_index in row_layouts:
+        pieces, iterators = layouts[layout_index]
+        rows.append(
+            pieces[0] + "".join(chain.from_iterable(zip(map(next, iterators), pieces[1:])))
+        )
+    return "[" + item_separator.join(rows) + "]"
+
+
+def payload_text(header, row_layouts, columns):
+    # The text of the payload in header, its Data array joined from the columns
+    separators, ensure_ascii = DUMP_STYLES[header["style"]]
+    results = find_data(header["payload"])
+    results["Data"] = DATA_PLACEHOLDER
+    text = dumps(header["payload"], separators=separators, ensure_ascii=ensure_ascii).replace(
+        dumps(DATA_PLACEHOLDER), rows_text(header, row_layouts, columns, separators, ensure_ascii),
+        1
+    )
+    results["Data"] = []
+    return text
+
+
+def decode_content(blob):
+    # (the original response bytes, the payload or None). Columnar blobs rebuild the payload,
+    # and it is returned with the bytes so that it need not be parsed again.
+    # Blobs that were not encoded are returned as they are.
+    if not blob.startswith(MAGIC):
+        return blob, None
+    layout, header, body = unpack(blob)
+    if layout == RAW:
+        return bytes(body), None
+    row_layouts, columns = decode_columns(header, body)
+    content = payload_text(header, row_layouts, columns).encode("utf-8")
+    if len(content) != header["size"] or zlib.crc32(content) != header["crc32"]:
+        raise ValueError("Encoded payload does not restore the original bytes")
+    payload = header["payload"]
+    find_data(payload)["Data"] = build_rows(header, row_layouts, columns)
+    return content, payload
+
+
+def decode(blob):
+    return decode_content(blob)[0]
+
+
+def decode_result(blob):
+    # A BeaResult of the original text, with the rebuilt payload when there is one
+    content, payload = decode_content(blob)
+    if payload is None:
+        return BeaResult(content.decode("utf-8"))
+    return BeaResult.from_payload(payload, content.decode("utf-8"))
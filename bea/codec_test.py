@@ -0,0 +1,168 @@
+import json
+import os
+import zlib
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bea import codec
+from bea.cache import ResponseCache
+from bea.codec import CompactCodec, decode, decode_column, decode_result, encode_column
+from bea.mockserver import MockBeaServer, load_recorded_responses, synthetic_payload
+from bea.mockserver_test import client_for
+
+
+def _payload(rows):
+    return {"BEAAPI": {"Request": {"RequestParam": []}, "Results": {"Data": rows}}}
+
+
+class TestColumns(TestCase):
+
+    # Unit tests
+    def test_round_trips_each_kind(self):
+        cases = {
+            "intstr": ["0", "6", "1000000"],
+            "dictionary": ["Millions", "Millions", "Millions", "Percent"],
+            "strings": ["Alabama", "Alaska", "Arizona"],
+            "int": [1, -2, 3],
+            "float": [1.5, -0.25, 3.0],
+            "json": ["1", 2, None],
+        }
+        for kind, values in cases.items():
+            spec, segments = encode_column(values)
+            self.assertEqual(spec["kind"], kind)
+            self.assertEqual(decode_column(spec, segments), values)
+
+    def test_keeps_leading_zeros_as_strings(self):
+        spec, segments = encode_column(["01", "02", "03"])
+        self.assertNotEqual(spec["kind"], "intstr")
+        self.assertEqual(decode_column(spec, segments), ["01", "02", "03"])
+
+
+class TestCompactCodec(TestCase):
+
+    def setUp(self):
+        self.codec = CompactCodec(compression="zlib")
+
+    # Unit tests
+    def test_rejects_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            CompactCodec(compression="brotli")
+
+    def test_round_trips_recorded_responses(self):
+        for params, response in load_recorded_responses():
+            for separators in ((", ", ": "), (",", ":")):
+                content = json.dumps(response, separators=separators).encode("utf-8")
+                with self.subTest(params=params, separators=separators):
+                    encoded = self.codec.encode(content)
+                    self.assertEqual(decode(encoded), content)
+                    self.assertEqual(decode_result(encoded).payload, response)
+
+    def test_large_payload_is_columnar_and_smaller_than_zlib(self):
+        payload = synthetic_payload({"Year": "2020", "Frequency": "Q"}, rows=20000)
+        content = json.dumps(payload).encode("utf-8")
+        encoded = self.codec.encode(content)
+        self.assertEqual(encoded[5], codec.COLUMNAR)
+        self.assertLess(len(encoded), len(zlib.compress(content)))
+        self.assertEqual(decode(encoded), content)
+        self.assertEqual(decode_result(encoded).payload, payload)
+
+    def test_rows_with_different_keys(self):
+        rows = []
+        for index in range(1000):
+            rows += [{"A": "x", "B": str(index * 7919 % 10007)}, {"B": str(index), "A": "y"},
+                     {"A": "z"}]
+        content = json.dumps(_payload(rows), ensure_ascii=False).encode("utf-8")
+        encoded = self.codec.encode(content)
+        self.assertEqual(encoded[5], codec.COLUMNAR)
+        self.assertEqual(decode(encoded), content)
+
+    def test_falls_back_to_raw_when_not_restorable(self):
+        for content in (
+            b"not json",
+            b'{"BEAAPI": {"Error": {"APIErrorCode": "3"}}}',
+            json.dumps(_payload([{"A": "1"}] * 1000), indent=2).encode("utf-8"),
+        ):
+            with self.subTest(content=content[:20]):
+                encoded = self.codec.encode(content)
+                self.assertEqual(encoded[5], codec.RAW)
+                self.assertEqual(decode(encoded), content)
+
+    def test_falls_back_to_raw_when_text_differs_from_json_dumps(self):
+        # Large enough for the columnar layout; each differs from json.dumps past the first and
+        # last rows
+        rows = [{"A": 1.5, "B": "x" * 20}] * 40000
+        content = json.dumps(_payload(rows)).encode("utf-8")
+        self.assertGreater(len(content), codec.RAW_COMPARE_SIZE)
+        self.assertEqual(self.codec.encode(content)[5], codec.COLUMNAR)
+        cases = {
+            "number format": content.replace(b"1.5, ", b"1.50, ", 1),
+            "whitespace": content.replace(b'}, {"A"', b'},  {"A"', 1),
+            "escaped slash": content.replace(
+                b'"RequestParam": []', b'"RequestParam": [], "Note": "a\\/b"'
+            ),
+        }
+        for name, variant in cases.items():
+            with self.subTest(name):
+                self.assertNotEqual(variant, content)
+                encoded = self.codec.encode(variant)
+                self.assertEqual(encoded[5], codec.RAW)
+                self.assertEqual(decode(encoded), variant)
+
+    def test_rejects_blobs_that_do_not_restore_the_original(self):
+        payload = synthetic_payload({"Year": "2020", "Frequency": "Q"}, rows=20000)
+        encoded = self.codec.encode(json.dumps(payload).encode("utf-8"))
+        layout, header, body = codec.unpack(encoded)
+        header["crc32"] ^= 1
+        header = json.dumps(header).encode("utf-8")
+        damaged = codec.HEADER.pack(
+            codec.MAGIC, codec.VERSION, layout, codec.COMPRESSIONS["zlib"], len(header)
+        ) + zlib.compress(header + bytes(body))
+        with self.assertRaises(ValueError):
+            decode(damaged)
+
+    def test_passes_through_unencoded_blobs(self):
+        content = json.dumps(_payload([{"A": "1"}])).encode("utf-8")
+        self.assertEqual(decode(content), content)
+        self.assertEqual(decode_result(content).payload, _payload([{"A": "1"}]))
+
+
+class TestCacheCodec(TestCase):
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = os.path.join(self.tempdir.name, "responses.sqlite")
+
+    # Integration tests
+    def test_cache_stores_encoded_bodies(self):
+        content = json.dumps(synthetic_payload({"Year": "2020"}, rows=5000)).encode("utf-8")
+        cache = ResponseCache(self.path, codec=CompactCodec())
+        self.addCleanup(cache.close)
+        cache.set("NIPA", {"Year": "2020"}, content)
+        self.assertLess(cache.stats()["size"], len(content) // 5)
+        cached = cache.get("NIPA", {"Year": "2020"})
+        self.assertEqual(cached.content, content)
+        # The payload rebuilt from the columns comes with the bytes
+        self.assertEqual(cached.payload, json.loads(content))
+
+    def test_encoded_entries_are_read_without_a_codec(self):
+        content = json.dumps(_payload([{"A": "1"}] * 100)).encode("utf-8")
+        cache = ResponseCache(self.path, codec=CompactCodec())
+        cache.set("NIPA", {"Year": "2020"}, content)
+        cache.close()
+        cache = ResponseCache(self.path)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.get("NIPA", {"Year": "2020"}).content, content)
+
+    def test_client_results_from_encoded_entries(self):
+        cache = ResponseCache(self.path, codec=CompactCodec())
+        self.addCleanup(cache.close)
+        with MockBeaServer(rows=3000, recorded_path=None) as server:
+            client = client_for(server, cache=cache)
+            expected = client.nipa(2020, "Q", "T10101")
+            result = client.nipa(2020, "Q", "T10101")
+            self.assertEqual(server.requests_served, 1)
+        self.assertEqual(result, expected)
+        # Served with the payload decoded from the columns rather than parsed again
+        self.assertIn("payload", vars(result))
+        self.assertEqual(result.data, expected.data)
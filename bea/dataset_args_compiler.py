@@ -1,17 +1,30 @@
 import os
-from json import dump
+from json import dump, dumps
 
 dataset_args = {
         "NIPA":{
             "required":(
                 "Year",
                 "Frequency",
+                "TableName",
             ),
             "all":(
                 "Year",
                 "Frequency",
                 "TableName",
-            )
+                "ShowMillions",
+            ),
+            "multiple":(
+                "Year",
+                "Frequency",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                    "Q",
+                    "M",
+                )
+            }
         },
         "NIUnderlyingDetail":{
             "required":(
@@ -22,7 +35,19 @@ dataset_args = {
                 "Year",
                 "Frequency",
                 "TableName",
-            )
+                "ShowMillions",
+            ),
+            "multiple":(
+                "Year",
+                "Frequency",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                    "Q",
+                    "M",
+                )
+            }
         },
         "FixedAssets":{
             "required":(
@@ -32,6 +57,9 @@ dataset_args = {
             "all":(
                 "Year",
                 "TableName",
+            ),
+            "multiple":(
+                "Year",
             )
         },
         "MNE":{ #need special treatment for this
@@ -49,7 +77,21 @@ dataset_args = {
                     "Country",
                     "Industry",
                     "GetFootnotes",
-                )
+                ),
+                "multiple":(
+                    "Year",
+                    "SeriesID",
+                    "Country",
+                    "Industry",
+                ),
+                "values":{
+                    "DirectionOfInvestment":(
+                        "Outward",
+                        "Inward",
+                        "Parent",
+                        "State",
+                    )
+                }
             },
             "AMNE":{
                 "required":(
@@ -58,7 +100,33 @@ dataset_args = {
                     "Year",
                     "OwnershipLevel",
                     "NonBankAffiliatesOnly",
-                )
+                ),
+                "all":(
+                    "DirectionOfInvestment",
+                    "Classification",
+                    "Year",
+                    "OwnershipLevel",
+                    "NonBankAffiliatesOnly",
+                    "SeriesID",
+                    "Country",
+                    "Industry",
+                    "State",
+                    "GetFootnotes",
+                ),
+                "multiple":(
+                    "Year",
+                    "SeriesID",
+                    "Country",
+                    "Industry",
+                ),
+                "values":{
+                    "DirectionOfInvestment":(
+                        "Outward",
+                        "Inward",
+                        "Parent",
+                        "State",
+                    )
+                }
             }
         },
         "GDPbyIndustry":{
@@ -73,7 +141,19 @@ dataset_args = {
                 "Frequency",
                 "Year",
                 "Industry",
-            )
+            ),
+            "multiple":(
+                "TableID",
+                "Frequency",
+                "Year",
+                "Industry",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                    "Q",
+                )
+            }
         },
         "ITA":{
             "required":(),
@@ -82,6 +162,23 @@ dataset_args = {
                 "AreaOrCountry",
                 "Frequency",
                 "Year",
+            ),
+            "multiple":(
+                "Indicator",
+                "AreaOrCountry",
+                "Frequency",
+                "Year",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                    "QSA",
+                    "QNSA",
+                )
+            },
+            "exactly_one_of":(
+                "Indicator",
+                "AreaOrCountry",
             )
         },
         "IIP":{
@@ -91,6 +188,22 @@ dataset_args = {
                 "Component",
                 "Frequency",
                 "Year",
+            ),
+            "multiple":(
+                "TypeOfInvestment",
+                "Component",
+                "Frequency",
+                "Year",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                    "QNSA",
+                )
+            },
+            "exactly_one_of":(
+                "TypeOfInvestment",
+                "Year",
             )
         },
         "InputOutput":{
@@ -101,6 +214,10 @@ dataset_args = {
             "all":(
                 "TableID",
                 "Year",
+            ),
+            "multiple":(
+                "TableID",
+                "Year",
             )
         },
         "UnderlyingGDPbyIndustry":{
@@ -115,7 +232,18 @@ dataset_args = {
                 "Frequency",
                 "Year",
                 "Industry",
-            )
+            ),
+            "multiple":(
+                "TableID",
+                "Frequency",
+                "Year",
+                "Industry",
+            ),
+            "values":{
+                "Frequency":(
+                    "A",
+                )
+            }
         },
         "IntlServTrade":{
             "required":(),
@@ -125,6 +253,17 @@ dataset_args = {
                 "Affiliation",
                 "AreaOrCountry",
                 "Year",
+            ),
+            "multiple":(
+                "TypeOfService",
+                "TradeDirection",
+                "Affiliation",
+                "AreaOrCountry",
+                "Year",
+            ),
+            "exactly_one_of":(
+                "TypeOfService",
+                "AreaOrCountry",
             )
         },
         "Regional":{
@@ -138,6 +277,10 @@ dataset_args = {
                 "LineCode",
                 "GeoFips",
                 "Year",
+            ),
+            "multiple":(
+                "GeoFips",
+                "Year",
             )
         },
         "IntlServSTA":{
@@ -148,11 +291,39 @@ dataset_args = {
                 "Industry",
                 "AreaOrCountry",
                 "Year",
+            ),
+            "multiple":(
+                "Channel",
+                "Destination",
+                "Industry",
+                "AreaOrCountry",
+                "Year",
+            )
+        },
+        "APIDatasetMetaData":{
+            "required":(
+                "Dataset",
+            ),
+            "all":(
+                "Dataset",
+            ),
+            "multiple":(
+                "Dataset",
             )
         }
     }
 
-# Dump data above into json file
-file_path = os.path.join(os.path.dirname(__file__), "datasets_args.json")
-with open(file_path, "w") as file:
-    dump(dataset_args, file)
\ No newline at end of file
+if __name__ == "__main__":
+    # Dump data above into json file
+    file_path = os.path.join(os.path.dirname(__file__), "datasets_args.json")
+    with open(file_path, "w") as file:
+        dump(dataset_args, file, indent=4)
+
+    # And into a module, which loads faster than the json (see bea.schema). The schema only
+    # holds strings, lists and dicts, so its json is a valid Python literal.
+    module_path = os.path.join(os.path.dirname(__file__), "_datasets_args.py")
+    with open(module_path, "w") as file:
+        file.write("# Generated by dataset_args_compiler.py; do not edit\n")
+        file.write("DATASETS_ARGS = ")
+        file.write(dumps(dataset_args, indent=4))
+        file.write("\n")
\ No newline at end of file
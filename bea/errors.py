@@ -0,0 +1,127 @@
+import re
+from json import JSONDecoder, loads
+
+from requests.exceptions import RequestException
+
+# BEA reports most errors with a 200 status and an error object near the top of the payload, so
+# only this many leading bytes are searched before paying for a full parse
+ERROR_SEARCH_WINDOW = 8192
+ERROR_KEY = re.compile(r'"Error"\s*:\s*')
+# Keys of the error object, which tell it apart from other values named Error
+ERROR_FIELDS = ("APIErrorCode", "APIErrorDescription")
+
+
+class BeaAPIError(RequestException):
+    def __init__(self, message=None, code=None, description=None, detail=None, response=None):
+        self.code = code
+        self.description = description
+        self.detail = detail
+        self.status_code = response.status_code if response is not None else None
+        if message is None:
+            message = f"BEA API error {code}: {description}" if code else description
+        super().__init__(message, response=response)
+
+
+class BeaHTTPError(BeaAPIError):
+    pass
+
+
+class BeaRateLimitError(BeaHTTPError):
+    pass
+
+
+class BeaServerError(BeaHTTPError):
+    pass
+
+
+class BeaPayloadError(BeaAPIError):
+    pass
+
+
+class BeaValidationError(TypeError):
+    # Raised before sending a request that BEA would reject. A TypeError, like the checks it
+    # replaces in Bea.__validate_inputs.
+    def __init__(self, dataset_name, problems):
+        self.dataset_name = dataset_name
+        self.problems = problems
+        super().__init__(f"Invalid {dataset_name} request: " + "; ".join(problems))
+
+
+def parse_error_payload(payload):
+    # Returns the BEAAPI.Error or BEAAPI.Results.Error object, if there is one
+    if not isinstance(payload, dict) or not isinstance(payload.get("BEAAPI"), dict):
+        return None
+    beaapi = payload["BEAAPI"]
+    if isinstance(beaapi.get("Error"), dict):
+        return beaapi["Error"]
+    results = beaapi.get("Results")
+    if isinstance(results, list) and results:
+        results = results[0]
+    if isinstance(results, dict) and isinstance(results.get("Error"), dict):
+        return results["Error"]
+    return None
+
+
+def _find_error_payload(content):
+    if not isinstance(content, (bytes, bytearray, memoryview)):
+        return None
+    head = bytes(content[:ERROR_SEARCH_WINDOW])
+    if b'"Error"' not in head:
+        return None
+    if len(content) <= ERROR_SEARCH_WINDOW:
+        try:
+            return parse_error_payload(loads(head))
+        except ValueError:
+            return None
+    # Error payloads are small, so in a larger body only the objects following Error keys of
+    # the head are decoded, from a window of the buffer rather than a copy of all of it
+    start = head.index(b'"Error"')
+    text = bytes(content[start:start + ERROR_SEARCH_WINDOW]).decode("utf-8", errors="replace")
+    decoder = JSONDecoder()
+    for match in ERROR_KEY.finditer(text, 0, len(head) - start):
+        try:
+            error, _ = decoder.raw_decode(text, match.end())
+        except ValueError:
+            continue
+        if isinstance(error, dict) and any(field in error for field in ERROR_FIELDS):
+            return error
+    return None
+
+
+def error_from_content(content):
+    # The BeaPayloadError reported by the body of a successful response, or None. content is
+    # the body as bytes or any buffer, e.g. the memoryview of a spooled response.
+    error = _find_error_payload(content)
+    if error is None:
+        return None
+    return BeaPayloadError(
+        code=error.get("APIErrorCode"),
+        description=error.get("APIErrorDescription"),
+        detail=error.get("ErrorDetail")
+    )
+
+
+def error_from_response(response):
+    # Returns the exception describing a failed response, or None if the response succeeded
+    error = _find_error_payload(response.content)
+    code = description = detail = None
+    if error is not None:
+        code = error.get("APIErrorCode")
+        description = error.get("APIErrorDescription")
+        detail = error.get("ErrorDetail")
+
+    if response.ok:
+        if error is None:
+            return None
+        return BeaPayloadError(code=code, description=description, detail=detail,
+                               response=response)
+
+    if description is None:
+        description = f"{response.status_code} {response.reason}"
+    if response.status_code == 429:
+        error_class = BeaRateLimitError
+    elif response.status_code >= 500:
+        error_class = BeaServerError
+    else:
+        error_class = BeaHTTPError
+    return error_class(code=code, description=description, detail=detail, response=response)
@@ -0,0 +1,150 @@
+from bea.result import PERIOD_FREQUENCIES, parse_periods, require_module, result_periods
+
+# Frequencies from the lowest to the highest, and periods of one in a period of another
+FREQUENCIES = ("A", "Q", "M")
+PERIODS_PER_YEAR = {"A": 1, "Q": 4, "M": 12}
+# Columns identifying the series of a result, by preference; MNE series are the cells of each
+# table, identified by the three together
+KEY_COLUMNS = (
+    "SeriesCode", "LineNumber", "GeoFips", "TimeSeriesId", "Industry",
+    ("SeriesID", "RowCode", "ColumnCode"),
+)
+DOWNSAMPLE_METHODS = ("mean", "sum", "first", "last")
+UPSAMPLE_METHODS = (None, "ffill", "interpolate")
+JOIN_METHODS = ("outer", "inner", "left", "right")
+
+
+def frequency_of(frame):
+    # The BEA frequency code (A/Q/M) of a frame with a PeriodIndex
+    code = frame.index.freqstr[0].upper()
+    return "A" if code == "Y" else code
+
+
+def dataset_name(result):
+    # The DatasetName echoed in the payload's request parameters, if any
+    params = result.payload.get("BEAAPI", {}).get("Request", {}).get("RequestParam", [])
+    for param in params:
+        if param.get("ParameterName", "").lower() == "datasetname":
+            return param.get("ParameterValue")
+    return None
+
+
+def pivot(result, columns=None, frequency=None, values="DataValue", scale=False):
+    # Wide frame of a result: a sorted PeriodIndex, and one column per series named by the
+    # values of columns (one of KEY_COLUMNS by default, or a list of columns for a MultiIndex),
+    # in the order the result lists them. Results holding several frequencies are filtered to
+    # frequency, which otherwise defaults to the lowest one present.
+    np = require_module("numpy")
+    pd = require_module("pandas")
+    data = result.to_numpy(scale=scale, periods=False)
+    parsed = result_periods(data)
+    if parsed is None and "Year" in data:
+        # MNE results are annual, with a Year and no TimePeriod
+        parsed = parse_periods(data["Year"])
+    if parsed is None:
+        raise ValueError("The result has no TimePeriod or Year column")
+    starts, frequencies = parsed
+    if columns is None:
+        columns = next((
+            key for key in KEY_COLUMNS
+            if all(name in data for name in ([key] if isinstance(key, str) else key))
+        ), None)
+        if columns is None:
+            raise ValueError(
+                f"The result has none of the key columns {KEY_COLUMNS}; pass columns"
+            )
+    keys = [columns] if isinstance(columns, str) else list(columns)
+    missing = [key for key in keys if key not in data]
+    if missing:
+        raise ValueError(f"The result has no column {missing[0]!r}")
+
+    if frequency is None:
+        present = set(np.unique(frequencies).tolist())
+        frequency = next((code for code in FREQUENCIES if code in present), "A")
+    selected = frequencies == frequency
+
+    frame = pd.DataFrame({
+        # Categories keep series in table order, where pivot would sort them as strings
+        **{key: pd.Categorical(data[key][selected], categories=pd.unique(data[key][selected]))
+           for key in keys},
+        values: data[values][selected],
+    })
+    frame.index = pd.DatetimeIndex(starts[selected].astype("datetime64[s]")).to_period(
+        PERIOD_FREQUENCIES[frequency]
+    )
+    frame.index.name = "TimePeriod"
+    # Tables can list a series more than once (e.g. under several lines); the last one is kept
+    frame = frame[~frame.reset_index().duplicated(["TimePeriod", *keys], keep="last").to_numpy()]
+    wide = frame.pivot(columns=keys if len(keys) > 1 else keys[0], values=values)
+    if isinstance(wide.columns, pd.CategoricalIndex):
+        wide.columns = pd.Index(wide.columns.astype(object), name=wide.columns.name)
+    return wide.sort_index()
+
+
+def resample(frame, frequency, downsample="mean", upsample="ffill"):
+    # Converts a frame with a PeriodIndex to frequency. Downsampling aggregates the periods of
+    # each lower frequency period with downsample; upsampling places each value on the first
+    # period it covers, and fills the others by repeating it (ffill), linearly (interpolate) or
+    # not at all (None).
+    pd = require_module("pandas")
+    if downsample not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample must be one of {DOWNSAMPLE_METHODS}")
+    if upsample not in UPSAMPLE_METHODS:
+        raise ValueError(f"upsample must be one of {UPSAMPLE_METHODS}")
+    source = frequency_of(frame)
+    target = PERIOD_FREQUENCIES[frequency]
+    if source == frequency:
+        return frame
+    if PERIODS_PER_YEAR[frequency] < PERIODS_PER_YEAR[source]:
+        # The index is sorted, so the groups are contiguous and are aggregated in one pass
+        return frame.groupby(frame.index.asfreq(target), sort=True).agg(downsample)
+
+    starts = frame.index.asfreq(target, how="start")
+    index = pd.period_range(
+        starts[0], frame.index[-1].asfreq(target, how="end"), freq=target, name=frame.index.name
+    )
+    upsampled = frame.set_axis(starts).reindex(index)
+    if upsample == "ffill":
+        return upsampled.ffill(limit=PERIODS_PER_YEAR[frequency] // PERIODS_PER_YEAR[source] - 1)
+    if upsample == "interpolate":
+        return upsampled.interpolate(limit_area="inside")
+    return upsampled
+
+
+def align(frames, frequency=None, downsample="mean", upsample="ffill"):
+    # Resamples frames with PeriodIndexes (e.g. from pivot) to one frequency: the lowest of the
+    # frames' by default, so that no values are made up
+    if frequency is None:
+        present = {frequency_of(frame) for frame in frames}
+        frequency = next(code for code in FREQUENCIES if code in present)
+    return [resample(frame, frequency, downsample, upsample) for frame in frames]
+
+
+def join(items, names=None, frequency=None, how="outer", downsample="mean", upsample="ffill",
+         scale=False):
+    # Aligns results (pivoted with their default columns) or wide frames onto one period index
+    # and joins them side by side. Columns are keyed by names, which default to each result's
+    # dataset name, so series codes shared by datasets do not collide. how is one of
+    # JOIN_METHODS: the union or intersection of the periods, or those of the first (left) or
+    # last (right) frame.
+    pd = require_module("pandas")
+    if how not in JOIN_METHODS:
+        raise ValueError(f"how must be one of {JOIN_METHODS}")
+    frames = [
+        item if isinstance(item, pd.DataFrame) else pivot(item, scale=scale) for item in items
+    ]
+    if names is None:
+        names = [
+            (dataset_name(item) if not isinstance(item, pd.DataFrame) else None) or str(index)
+            for index, item in enumerate(items)
+        ]
+        if len(set(names)) < len(names):
+            names = [f"{name}{index}" for index, name in enumerate(names)]
+    frames = align(frames, frequency, downsample, upsample)
+    # Sorted, unique period indexes are joined by merging rather than by hashing
+    joined = pd.concat(frames, axis=1, keys=names, join="inner" if how == "inner" else "outer")
+    if how == "left":
+        joined = joined.reindex(frames[0].index)
+    elif how == "right":
+        joined = joined.reindex(frames[-1].index)
+    return joined.sort_index()
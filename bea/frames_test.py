@@ -0,0 +1,172 @@
+from json import dumps
+from unittest import TestCase, skipIf
+
+from bea.mockserver import synthetic_payload
+from bea.result import BeaResult
+
+try:
+    import numpy as np
+    import pandas as pd
+    from bea import frames
+except ImportError:
+    np = pd = frames = None
+
+
+def result_for(rows, **params):
+    return BeaResult(dumps(synthetic_payload(params, rows)))
+
+
+def data_result(data, dataset="NIPA"):
+    request = {"RequestParam": [{"ParameterName": "DATASETNAME", "ParameterValue": dataset}]}
+    return BeaResult(dumps({"BEAAPI": {"Request": request, "Results": {"Data": data}}}))
+
+
+@skipIf(pd is None, "numpy and pandas are not installed")
+class TestPivot(TestCase):
+
+    # Unit tests
+    def test_pivots_by_series_in_table_order(self):
+        data = [
+            {"SeriesCode": code, "TimePeriod": period, "DataValue": value}
+            for period, value in (("2021Q1", "1"), ("2020Q4", "2"))
+            for code in ("Z", "A")
+        ]
+        wide = frames.pivot(data_result(data))
+        self.assertEqual(wide.columns.tolist(), ["Z", "A"])
+        self.assertEqual(wide.index.tolist(), [pd.Period("2020Q4"), pd.Period("2021Q1")])
+        self.assertEqual(wide["Z"].tolist(), [2.0, 1.0])
+
+    def test_selects_lowest_frequency_by_default(self):
+        data = [
+            {"LineNumber": "1", "TimePeriod": period, "DataValue": value}
+            for period, value in (("2020", "10"), ("2020Q1", "1"), ("2020Q2", "2"))
+        ]
+        result = data_result(data)
+        self.assertEqual(frames.pivot(result)["1"].tolist(), [10.0])
+        quarterly = frames.pivot(result, frequency="Q")
+        self.assertEqual(frames.frequency_of(quarterly), "Q")
+        self.assertEqual(quarterly["1"].tolist(), [1.0, 2.0])
+
+    def test_pivots_year_and_quarter(self):
+        data = [
+            {"Industry": "11", "Year": "2020", "Quarter": quarter, "DataValue": value}
+            for quarter, value in (("I", "1"), ("II", "2"), ("2020", "3"))
+        ]
+        wide = frames.pivot(data_result(data, "GDPbyIndustry"), frequency="Q")
+        self.assertEqual(wide.index.tolist(), [pd.Period("2020Q1"), pd.Period("2020Q2")])
+        self.assertEqual(wide["11"].tolist(), [1.0, 2.0])
+
+    def test_pivots_by_several_columns(self):
+        result = result_for(12, year="2020", frequency="Q", geofips="06000")
+        wide = frames.pivot(result, columns=["GeoFips", "SeriesCode"])
+        self.assertEqual(wide.columns.tolist()[0], ("06000", "S000001"))
+        self.assertEqual(wide.shape, (4, 3))
+
+    def test_pivots_mne_by_year_and_cell(self):
+        data = [
+            {"SeriesID": "4", "RowCode": row, "ColumnCode": "10", "Year": year,
+             "DataValue": value}
+            for year, row, value in (("2021", "1", "3"), ("2020", "1", "1,000"), ("2020", "2", "2"))
+        ]
+        wide = frames.pivot(data_result(data, "MNE"))
+        self.assertEqual(wide.index.tolist(), [pd.Period("2020"), pd.Period("2021")])
+        self.assertEqual(wide.columns.tolist(), [("4", "1", "10"), ("4", "2", "10")])
+        self.assertEqual(wide["4", "1", "10"].tolist(), [1000.0, 3.0])
+
+    def test_pivots_by_time_series_id(self):
+        data = [
+            {"TypeOfService": "Travel", "TimeSeriesId": series, "TimePeriod": "2020",
+             "Year": "2020", "DataValue": value}
+            for series, value in (("TSI_ItaTravelExp", "1"), ("TSI_ItaTravelRec", "2"))
+        ]
+        wide = frames.pivot(data_result(data, "IntlServTrade"))
+        self.assertEqual(wide.columns.tolist(), ["TSI_ItaTravelExp", "TSI_ItaTravelRec"])
+
+    def test_raises_without_periods(self):
+        with self.assertRaises(ValueError):
+            frames.pivot(data_result([{"SeriesCode": "A", "DataValue": "1"}]))
+
+    def test_raises_naming_missing_key_column(self):
+        data = [{"TimePeriod": "2020", "DataValue": "1"}]
+        with self.assertRaisesRegex(ValueError, "key columns"):
+            frames.pivot(data_result(data))
+        with self.assertRaisesRegex(ValueError, "'LineCode'"):
+            frames.pivot(data_result([{"SeriesCode": "A", **data[0]}]), columns="LineCode")
+
+
+@skipIf(pd is None, "numpy and pandas are not installed")
+class TestResample(TestCase):
+
+    def setUp(self):
+        self.monthly = pd.DataFrame(
+            {"A": np.arange(1.0, 13.0)}, index=pd.period_range("2020-01", periods=12, freq="M")
+        )
+        self.annual = pd.DataFrame(
+            {"A": [4.0, 8.0]}, index=pd.period_range("2020", periods=2, freq="Y")
+        )
+
+    # Unit tests
+    def test_downsamples(self):
+        self.assertEqual(frames.resample(self.monthly, "Q")["A"].tolist(), [2.0, 5.0, 8.0, 11.0])
+        self.assertEqual(
+            frames.resample(self.monthly, "Q", downsample="sum")["A"].tolist(),
+            [6.0, 15.0, 24.0, 33.0]
+        )
+        last = frames.resample(self.monthly, "A", downsample="last")
+        self.assertEqual(last["A"].tolist(), [12.0])
+
+    def test_upsamples(self):
+        quarterly = frames.resample(self.annual, "Q")
+        self.assertEqual(quarterly.index[0], pd.Period("2020Q1"))
+        self.assertEqual(quarterly["A"].tolist(), [4.0] * 4 + [8.0] * 4)
+        interpolated = frames.resample(self.annual, "Q", upsample="interpolate")["A"].tolist()
+        self.assertEqual(interpolated[:5], [4.0, 5.0, 6.0, 7.0, 8.0])
+        self.assertTrue(np.isnan(interpolated[5:]).all())
+        self.assertEqual(frames.resample(self.annual, "Q", upsample=None)["A"].count(), 2)
+
+    def test_rejects_unknown_methods(self):
+        with self.assertRaises(ValueError):
+            frames.resample(self.monthly, "Q", downsample="median")
+        with self.assertRaises(ValueError):
+            frames.resample(self.annual, "Q", upsample="bfill")
+
+
+@skipIf(pd is None, "numpy and pandas are not installed")
+class TestJoin(TestCase):
+
+    # Unit tests
+    def test_joins_on_lowest_frequency(self):
+        nipa = result_for(8, datasetname="NIPA", year="2020,2021", frequency="Q")
+        regional = result_for(3, datasetname="Regional", year="2019,2020,2021", frequency="A")
+        joined = frames.join([nipa, regional])
+        self.assertEqual(joined.columns.tolist(), [("NIPA", "S000001"), ("Regional", "S000001")])
+        self.assertEqual(joined.index.tolist(), pd.period_range("2019", "2021", freq="Y").tolist())
+        self.assertTrue(np.isnan(joined["NIPA", "S000001"].iloc[0]))
+        expected = frames.pivot(nipa)["S000001"].iloc[:4].mean()
+        self.assertAlmostEqual(joined["NIPA", "S000001"].iloc[1], expected)
+
+    def test_joins_on_requested_frequency(self):
+        nipa = result_for(8, datasetname="NIPA", year="2020,2021", frequency="Q")
+        regional = result_for(3, datasetname="Regional", year="2019,2020,2021", frequency="A")
+        joined = frames.join([nipa, frames.pivot(regional)], names=["gdp", "income"],
+                             frequency="Q", how="inner")
+        self.assertEqual(len(joined), 8)
+        self.assertEqual(joined["income", "S000001"].nunique(), 2)
+
+    def test_left_and_right_joins_keep_one_side_periods(self):
+        nipa = result_for(8, datasetname="NIPA", year="2020,2021", frequency="Q")
+        regional = result_for(3, datasetname="Regional", year="2019,2020,2021", frequency="A")
+        left = frames.join([nipa, regional], how="left")
+        self.assertEqual(left.index.tolist(), pd.period_range("2020", "2021", freq="Y").tolist())
+        right = frames.join([nipa, regional], how="right")
+        self.assertEqual(right.index.tolist(), pd.period_range("2019", "2021", freq="Y").tolist())
+
+    def test_rejects_unknown_how(self):
+        result = result_for(4, datasetname="NIPA", year="2020", frequency="Q")
+        with self.assertRaises(ValueError):
+            frames.join([result, result], how="cross")
+
+    def test_names_duplicate_datasets_by_position(self):
+        result = result_for(4, datasetname="NIPA", year="2020", frequency="Q")
+        joined = frames.join([result, result])
+        self.assertEqual(joined.columns.get_level_values(0).unique().tolist(), ["NIPA0", "NIPA1"])
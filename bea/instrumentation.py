@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from bea.result import require_module
+
+# Upper bounds (seconds) of the request duration histogram exported to Prometheus
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RequestTrace:
+    # Timings and counters of one call to Bea.__process_request. phases maps a phase name
+    # (validation, cache_lookup, compose_url, rate_limit, send, download, payload_check,
+    # cache_store, shared_wait) to seconds; send is the time to first byte of each attempt,
+    # download the rest of the body and payload_check the scan for an error payload. The JSON
+    # payload is parsed later, if the caller reads it, and is not timed. Calls that shared the
+    # response of an identical request in flight on another thread are shared, with only that
+    # wait as shared_wait.
+    __slots__ = (
+        "dataset", "method", "phases", "status_code", "bytes", "attempts", "rate_limit_wait",
+        "cache", "shared", "error", "started", "duration", "last"
+    )
+
+    def __init__(self, dataset, method):
+        self.dataset = dataset
+        self.method = method
+        self.phases = {}
+        self.status_code = None
+        self.bytes = 0
+        self.attempts = 0
+        self.rate_limit_wait = 0.0
+        self.cache = None  # "hit" or "miss" when a cache is configured
+        self.shared = False
+        self.error = None
+        self.started = time.time()
+        self.duration = None
+        self.last = time.perf_counter()
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def mark(self, phase):
+        # Charges the time since the previous mark to phase
+        now = time.perf_counter()
+        self.add(phase, now - self.last)
+        self.last = now
+
+    def as_dict(self):
+        return {
+            "dataset": self.dataset,
+            "method": self.method,
+            "phases": dict(self.phases),
+            "status_code": self.status_code,
+            "bytes": self.bytes,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "rate_limit_wait": self.rate_limit_wait,
+            "cache": self.cache,
+            "shared": self.shared,
+            "error": type(self.error).__name__ if self.error is not None else None,
+            "duration": self.duration,
+        }
+
+
+class Instrumentation:
+    # Passed to Bea(instrumentation=...). Each hook is called with the RequestTrace of every
+    # finished request; the exporters below are hooks. Without it the client does no timing.
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+
+# PUBLIC METHODS
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def start(self, dataset, method):
+        return RequestTrace(dataset, method)
+
+    def finish(self, trace, error=None):
+        trace.error = error
+        trace.duration = time.time() - trace.started
+        for hook in self.hooks:
+            hook(trace)
+
+
+class PrometheusExporter:
+    # Aggregates traces into counters and a duration histogram, rendered in the Prometheus text
+    # exposition format by render()
+    def __init__(self, namespace="bea"):
+        self.namespace = namespace
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+
+    def __call__(self, trace):
+        dataset = trace.dataset or ""
+        labels = (("dataset", dataset),)
+        with self.__lock:
+            self.__increment("requests_total", labels + (
+                ("method", trace.method), ("status", str(trace.status_code or "")),
+            ))
+            if trace.error is not None:
+                self.__increment("request_errors_total", labels + (
+                    ("error", type(trace.error).__name__),
+                ))
+            self.__increment("response_bytes_total", labels, trace.bytes)
+            self.__increment("retries_total", labels, trace.retries)
+            self.__increment("rate_limit_wait_seconds_total", labels, trace.rate_limit_wait)
+            if trace.cache is not None:
+                name = "cache_hits_total" if trace.cache == "hit" else "cache_misses_total"
+                self.__increment(name, labels)
+            if trace.shared:
+                self.__increment("shared_requests_total", labels)
+            for phase, seconds in trace.phases.items():
+                self.__increment("phase_seconds_total", labels + (("phase", phase),), seconds)
+            self.__observe("request_duration_seconds", labels, trace.duration)
+
+# PRIVATE METHODS
+    def __increment(self, name, labels, amount=1):
+        key = (name, labels)
+        self.__counters[key] = self.__counters.get(key, 0) + amount
+
+    def __observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self.__histograms.get(key)
+        if histogram is None:
+            histogram = self.__histograms[key] = [[0] * (len(DURATION_BUCKETS) + 1), 0.0, 0]
+        histogram[0][bisect_left(DURATION_BUCKETS, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def __format_labels(self, labels):
+        if not labels:
+            return ""
+        pairs = ",".join(
+            '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+            for name, value in labels
+        )
+        return "{" + pairs + "}"
+
+# PUBLIC METHODS
+    def render(self):
+        lines = []
+        with self.__lock:
+            counters = sorted(self.__counters.items())
+            histograms = sorted(
+                (key, ([*buckets], total, count))
+                for key, (buckets, total, count) in self.__histograms.items()
+            )
+        typed = set()
+        for (name, labels), value in counters:
+            name = f"{self.namespace}_{name}"
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{self.__format_labels(labels)} {value}")
+        for (name, labels), (buckets, total, count) in histograms:
+            name = f"{self.namespace}_{name}"
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, observed in zip(DURATION_BUCKETS + ("+Inf",), buckets):
+                cumulative += observed
+                bucket_labels = labels + (("le", str(bound)),)
+                lines.append(f"{name}_bucket{self.__format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{self.__format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self.__format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryExporter:
+    # Records each trace as a span, with one event per phase. Requires opentelemetry-api; spans
+    # go to the globally configured tracer provider unless a tracer is given.
+    def __init__(self, tracer=None):
+        if tracer is None:
+            tracer = require_module("opentelemetry.trace").get_tracer("bea")
+        self.tracer = tracer
+
+    def __call__(self, trace):
+        start = int(trace.started * 1e9)
+        span = self.tracer.start_span(
+            f"BEA {trace.method} {trace.dataset or ''}".strip(),
+            start_time=start,
+            attributes={
+                "bea.dataset": trace.dataset or "",
+                "bea.method": trace.method,
+                "bea.attempts": trace.attempts,
+                "bea.retries": trace.retries,
+                "bea.rate_limit_wait": trace.rate_limit_wait,
+                "bea.cache": trace.cache or "",
+                "bea.shared": trace.shared,
+                "http.status_code": trace.status_code or 0,
+                "http.response_content_length": trace.bytes,
+            }
+        )
+        offset = start
+        for phase, seconds in trace.phases.items():
+            offset += int(seconds * 1e9)
+            span.add_event(phase, {"seconds": seconds}, timestamp=offset)
+        if trace.error is not None:
+            span.record_exception(trace.error)
+        span.end(end_time=start + int(trace.duration * 1e9))
+
+
+class LoggingExporter:
+    # Logs one record per request, with the trace as a dict in the record's bea attribute for
+    # structured log handlers
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger if logger is not None else logging.getLogger("bea")
+        self.level = level
+
+    def __call__(self, trace):
+        level = self.level if trace.error is None else max(self.level, logging.WARNING)
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level,
+            "%s %s status=%s bytes=%d attempts=%d cache=%s duration=%.3fs",
+            trace.method,
+            trace.dataset,
+            trace.status_code,
+            trace.bytes,
+            trace.attempts,
+            trace.cache,
+            trace.duration,
+            extra={"bea": trace.as_dict()}
+        )
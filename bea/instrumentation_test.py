@@ -0,0 +1,140 @@
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key
+from bea.cache import ResponseCache
+from bea.catalog import Catalog
+from bea.errors import BeaServerError
+from bea.instrumentation import (
+    Instrumentation, LoggingExporter, OpenTelemetryExporter, PrometheusExporter, RequestTrace
+)
+from bea.mockserver import MockBeaServer
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+
+
+def make_trace(**attributes):
+    trace = RequestTrace("NIPA", "GetData")
+    trace.duration = 0.2
+    for name, value in attributes.items():
+        setattr(trace, name, value)
+    return trace
+
+
+# Unit tests
+class TestPrometheusExporter(TestCase):
+    def test_renders_counters_and_histogram(self):
+        exporter = PrometheusExporter()
+        exporter(make_trace(status_code=200, bytes=100, attempts=2, phases={"send": 0.1}))
+        exporter(make_trace(status_code=200, bytes=50, attempts=1, cache="hit"))
+        exporter(make_trace(status_code=200, shared=True))
+        text = exporter.render()
+        self.assertIn('bea_requests_total{dataset="NIPA",method="GetData",status="200"} 3', text)
+        self.assertIn('bea_response_bytes_total{dataset="NIPA"} 150', text)
+        self.assertIn('bea_retries_total{dataset="NIPA"} 1', text)
+        self.assertIn('bea_cache_hits_total{dataset="NIPA"} 1', text)
+        self.assertIn('bea_shared_requests_total{dataset="NIPA"} 1', text)
+        self.assertIn('bea_phase_seconds_total{dataset="NIPA",phase="send"} 0.1', text)
+        self.assertIn('bea_request_duration_seconds_bucket{dataset="NIPA",le="0.25"} 3', text)
+        self.assertIn('bea_request_duration_seconds_bucket{dataset="NIPA",le="0.1"} 0', text)
+        self.assertIn('bea_request_duration_seconds_count{dataset="NIPA"} 3', text)
+        self.assertIn("# TYPE bea_request_duration_seconds histogram", text)
+
+
+class TestOpenTelemetryExporter(TestCase):
+    def test_records_span_with_phase_events(self):
+        tracer = mock.Mock()
+        OpenTelemetryExporter(tracer)(make_trace(status_code=200, phases={"send": 0.1}))
+        span = tracer.start_span.return_value
+        self.assertEqual(tracer.start_span.call_args.args[0], "BEA GetData NIPA")
+        self.assertEqual(span.add_event.call_args.args[0], "send")
+        span.end.assert_called_once()
+
+
+class TestLoggingExporter(TestCase):
+    def test_logs_structured_record(self):
+        logger = logging.getLogger("bea.test")
+        with self.assertLogs(logger, level="INFO") as logs:
+            LoggingExporter(logger)(make_trace(status_code=200))
+        self.assertEqual(logs.records[0].bea["status_code"], 200)
+
+
+# Integration tests
+class TestInstrumentedClient(TestCase):
+    def setUp(self):
+        patch_api_key(self)
+        self.traces = []
+        self.instrumentation = Instrumentation([self.traces.append])
+
+    def client_for(self, server, **kwargs):
+        return Bea(
+            base_url=server.url,
+            rate_limiter=RateLimiter(None, None, None),
+            instrumentation=self.instrumentation,
+            **kwargs
+        )
+
+    def test_records_phases_of_a_request(self):
+        with MockBeaServer() as server:
+            self.client_for(server).nipa(2020, "A", "T10101")
+        trace = self.traces[0]
+        self.assertEqual(trace.dataset, "NIPA")
+        self.assertEqual(trace.status_code, 200)
+        self.assertEqual(trace.attempts, 1)
+        self.assertGreater(trace.bytes, 0)
+        for phase in ("validation", "compose_url", "rate_limit", "send", "download",
+                      "payload_check"):
+            self.assertIn(phase, trace.phases)
+        self.assertFalse(trace.shared)
+
+    def test_nested_catalog_requests_have_their_own_traces(self):
+        retry_policy = RetryPolicy(max_attempts=2, sleep=lambda seconds: None)
+        with MockBeaServer() as server:
+            client = self.client_for(server, retry_policy=retry_policy)
+            client.validator.catalog = Catalog(client)
+            # The stand-in server lists TableName1..10 as the NIPA tables
+            client.nipa(2020, "A", "TableName1")
+        data_trace = self.traces[-1]
+        self.assertEqual(data_trace.method, "GetData")
+        self.assertEqual(data_trace.attempts, 1)
+        self.assertFalse(data_trace.shared)
+        self.assertNotIn("shared_wait", data_trace.phases)
+        for trace in self.traces[:-1]:
+            self.assertNotEqual(trace.method, "GetData")
+            self.assertEqual(trace.attempts, 1)
+
+    def test_records_shared_requests(self):
+        with MockBeaServer(latency=0.2) as server:
+            client = self.client_for(server)
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                list(executor.map(lambda _: client.nipa(2020, "A", "T10101"), range(3)))
+            self.assertEqual(server.requests_served, 1)
+        shared = [trace for trace in self.traces if trace.shared]
+        self.assertEqual(len(shared), 2)
+        for trace in shared:
+            self.assertEqual((trace.attempts, trace.bytes, trace.status_code), (0, 0, 200))
+            self.assertIn("shared_wait", trace.phases)
+
+    def test_records_retries_and_errors(self):
+        retry_policy = RetryPolicy(max_attempts=2, sleep=lambda seconds: None)
+        with MockBeaServer(server_error_rate=1.0) as server:
+            with self.assertRaises(BeaServerError):
+                self.client_for(server, retry_policy=retry_policy).nipa(2020, "A", "T10101")
+        trace = self.traces[0]
+        self.assertEqual(trace.retries, 1)
+        self.assertEqual(trace.status_code, 503)
+        self.assertIsInstance(trace.error, BeaServerError)
+
+    def test_records_cache_hits_and_misses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResponseCache(path=f"{directory}/cache.sqlite")
+            with MockBeaServer() as server:
+                client = self.client_for(server, cache=cache)
+                client.nipa(2020, "A", "T10101")
+                client.nipa(2020, "A", "T10101")
+            cache.close()
+        self.assertEqual([trace.cache for trace in self.traces], ["miss", "hit"])
+        self.assertIn("cache_store", self.traces[0].phases)
@@ -0,0 +1,340 @@
+import argparse
+import gzip
+import os
+import random
+import threading
+import time
+from email.utils import formatdate
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, load
+from urllib.parse import parse_qsl, urlsplit
+
+from bea.schema import load_datasets_args
+
+RECORDED_RESPONSES_PATH = os.path.join(os.path.dirname(__file__), "test_cases_api_responses.json")
+DEFAULT_ROWS = 100
+QUARTERS = ("Q1", "Q2", "Q3", "Q4")
+# Last-Modified sent with validators, as payloads do not change while the server runs
+LAST_MODIFIED = formatdate(0, usegmt=True)
+
+
+def load_recorded_responses(path=RECORDED_RESPONSES_PATH):
+    # [(request params, payload)] from a file laid out like test_cases_api_responses.json,
+    # with the params lower-cased and without UserID
+    recorded = []
+    with open(path, "r") as file:
+        cases = load(file)
+    for case in cases.values():
+        for payload in case["responses"].values():
+            params = {
+                pair["ParameterName"].lower(): str(pair["ParameterValue"]).lower()
+                for pair in payload["BEAAPI"]["Request"]["RequestParam"]
+            }
+            params.pop("userid", None)
+            recorded.append((params, payload))
+    return recorded
+
+
+def request_params(params):
+    return [
+        {"ParameterName": name.upper(), "ParameterValue": value}
+        for name, value in params.items()
+    ]
+
+
+def error_payload(params, code, description):
+    return {"BEAAPI": {
+        "Request": {"RequestParam": request_params(params)},
+        "Results": {"Error": {"APIErrorCode": str(code), "APIErrorDescription": description}}
+    }}
+
+
+def time_periods(params):
+    years = [
+        year for year in str(params.get("year", "2020")).split(",")
+        if year.strip().isdigit()
+    ] or ["2020"]
+    frequencies = str(params.get("frequency", "A")).upper().split(",")
+    periods = []
+    for year in years:
+        year = year.strip()
+        if "A" in frequencies:
+            periods.append(year)
+        if "Q" in frequencies:
+            periods.extend(year + quarter for quarter in QUARTERS)
+        if "M" in frequencies:
+            periods.extend(f"{year}M{month:02d}" for month in range(1, 13))
+    return periods or years
+
+
+def synthetic_payload(params, rows, seed=0):
+    # A GetData payload shaped like a NIPA table, with rows rows spread over the requested
+    # periods. Values are deterministic for a given request and seed.
+    generator = random.Random(dumps([sorted(params.items()), seed]))
+    periods = time_periods(params)
+    table = params.get("tablename") or params.get("tableid") or "T00000"
+    data = []
+    for index in range(rows):
+        line = index // len(periods) + 1
+        data.append({
+            "TableName": table,
+            "SeriesCode": f"S{line:06d}",
+            "LineNumber": str(line),
+            "LineDescription": f"Line {line}",
+            "TimePeriod": periods[index % len(periods)],
+            "GeoFips": params.get("geofips", "00000"),
+            "METRIC_NAME": "Current Dollars",
+            "CL_UNIT": "Level",
+            "UNIT_MULT": "6",
+            "DataValue": f"{generator.uniform(0, 1e6):,.1f}",
+            "NoteRef": table,
+        })
+    return {"BEAAPI": {
+        "Request": {"RequestParam": request_params(params)},
+        "Results": {
+            "Statistic": "Synthetic Table",
+            "UTCProductionTime": "2000-01-01T00:00:00.000",
+            "Dimensions": [],
+            "Data": data,
+            "Notes": [{"NoteRef": table, "NoteText": "Synthetic data. Last Revised on: "
+                                                    "January 1, 2000"}],
+        }
+    }}
+
+
+class MockBeaServer:
+    # Local stand-in for apps.bea.gov/api/data. GetData requests matching a recorded response are
+    # answered with it, others with a synthetic payload of rows rows; metadata methods are
+    # answered from datasets_args.json. Latency, 429s, 5xx errors and BEA error payloads can be
+    # injected at the given rates (fractions of requests). With validators set, successful
+    # responses carry an ETag and Last-Modified and conditional requests are answered with 304.
+    def __init__(self,
+                 host="127.0.0.1",
+                 port=0,
+                 rows=DEFAULT_ROWS,
+                 latency=0.0,
+                 jitter=0.0,
+                 rate_limit_rate=0.0,
+                 server_error_rate=0.0,
+                 error_payload_rate=0.0,
+                 retry_after=1,
+                 compress=True,
+                 recorded_path=RECORDED_RESPONSES_PATH,
+                 seed=None,
+                 validators=False):
+        self.rows = rows
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.error_payload_rate = error_payload_rate
+        self.retry_after = retry_after
+        self.compress = compress
+        self.validators = validators
+        self.not_modified_served = 0
+        self.recorded = load_recorded_responses(recorded_path) if recorded_path else []
+        self.datasets_args = load_datasets_args()
+        self.requests_served = 0
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self.__handler_class())
+        self.httpd.daemon_threads = True
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+# PRIVATE METHODS
+    def __handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, which otherwise stalls on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = dict(parse_qsl(urlsplit(self.path).query, keep_blank_values=True))
+                status, headers, payload = server.respond(query)
+                body = dumps(payload).encode("utf-8")
+                if server.validators and status == 200:
+                    headers["ETag"] = '"{}"'.format(sha256(body).hexdigest()[:32])
+                    headers["Last-Modified"] = LAST_MODIFIED
+                    if self.headers.get("If-None-Match") == headers["ETag"]:
+                        server.count_not_modified()
+                        self.send_response(304)
+                        self.send_header("Content-Length", "0")
+                        for name, value in headers.items():
+                            self.send_header(name, value)
+                        self.end_headers()
+                        return
+                if server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body, compresslevel=1)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __roll(self, rate):
+        if not rate:
+            return False
+        with self.__lock:
+            return self.__random.random() < rate
+
+    def __recorded_payload(self, params):
+        requested = {name: value.lower() for name, value in params.items() if name != "userid"}
+        for recorded_params, payload in self.recorded:
+            if all(recorded_params.get(name) == value for name, value in requested.items()):
+                payload = dict(payload, BEAAPI=dict(payload["BEAAPI"]))
+                payload["BEAAPI"]["Request"] = {"RequestParam": request_params(params)}
+                return payload
+        return None
+
+    def __metadata_payload(self, method, params):
+        dataset_name = params.get("datasetname", "")
+        schema = next(
+            (schema for name, schema in self.datasets_args.items()
+             if name.lower() == dataset_name.lower()),
+            None
+        )
+        if method == "getdatasetlist":
+            results = {"Dataset": [
+                {"DatasetName": name, "DatasetDescription": name} for name in self.datasets_args
+            ]}
+        elif schema is None:
+            return error_payload(params, 1, "Unknown error.")
+        elif method == "getparameterlist":
+            if "DI" in schema:  # MNE
+                schema = {"all": schema["DI"]["all"] + schema["AMNE"].get("all", [])}
+            required = schema.get("required", [])
+            results = {"Parameter": [
+                {
+                    "ParameterName": name,
+                    "ParameterDataType": "string",
+                    "ParameterIsRequiredFlag": "1" if name in required else "0",
+                    "MultipleAcceptedFlag": "1" if name in schema.get("multiple", ()) else "0",
+                }
+                for name in dict.fromkeys(required + schema.get("all", []))
+            ]}
+        else:
+            parameter_name = params.get("parametername") or params.get("targetparameter", "")
+            values = schema.get("values", {}).get(parameter_name)
+            if values is None:
+                values = [f"{parameter_name}{index}" for index in range(1, 11)]
+            results = {"ParamValue": [{"Key": value, "Desc": value} for value in values]}
+        return {"BEAAPI": {"Request": {"RequestParam": request_params(params)}, "Results": results}}
+
+# PUBLIC METHODS
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/data"
+
+    def respond(self, query):
+        # Returns (status, headers, payload) for a query string dict
+        with self.__lock:
+            self.requests_served += 1
+        params = {name.lower(): value for name, value in query.items()}
+        method = params.get("method", "").lower()
+
+        delay = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.__roll(self.rate_limit_rate):
+            return 429, {"Retry-After": str(self.retry_after)}, error_payload(
+                params, 429, "Too many requests."
+            )
+        if self.__roll(self.server_error_rate):
+            return 503, {}, error_payload(params, 503, "Service unavailable.")
+        if self.__roll(self.error_payload_rate):
+            # BEA reports most errors with a 200 status
+            return 200, {}, error_payload(params, 40, "The dataset requested requires parameter")
+
+        if method != "getdata":
+            return 200, {}, self.__metadata_payload(method, params)
+        payload = self.__recorded_payload(params)
+        if payload is None:
+            payload = synthetic_payload(params, self.rows)
+        return 200, {}, payload
+
+    def count_not_modified(self):
+        with self.__lock:
+            self.not_modified_served += 1
+
+    def start(self):
+        self.__thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the BEA API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS,
+                        help="rows in synthetic GetData responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to responses")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="up to this many more seconds, at random")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 503")
+    parser.add_argument("--error-payload-rate", type=float, default=0.0,
+                        help="fraction of requests answered with a BEA error payload")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--no-recorded", action="store_true",
+                        help="always answer GetData with synthetic payloads")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--validators", action="store_true",
+                        help="send ETag/Last-Modified and answer conditional requests with 304")
+    args = parser.parse_args(argv)
+
+    server = MockBeaServer(
+        host=args.host,
+        port=args.port,
+        rows=args.rows,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        error_payload_rate=args.error_payload_rate,
+        retry_after=args.retry_after,
+        compress=not args.no_compress,
+        recorded_path=None if args.no_recorded else RECORDED_RESPONSES_PATH,
+        seed=args.seed,
+        validators=args.validators
+    )
+    print(f"Serving the BEA API stand-in at {server.url} (set BEA_API_URL to use it)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
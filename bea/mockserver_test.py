@@ -0,0 +1,70 @@
+from unittest import TestCase, mock
+
+from bea import bea
+from bea.bea import Bea
+from bea.bea_test import patch_api_key
+from bea.errors import BeaPayloadError, BeaRateLimitError, BeaServerError
+from bea.mockserver import MockBeaServer, synthetic_payload, time_periods
+from bea.retry import RetryPolicy
+
+
+def client_for(server, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=1))
+    return Bea(base_url=server.url, **kwargs)
+
+
+# Unit tests
+class TestSyntheticPayload(TestCase):
+    def test_spreads_rows_over_requested_periods(self):
+        periods = time_periods({"year": "2020,2021", "frequency": "Q"})
+        self.assertEqual(periods[:2], ["2020Q1", "2020Q2"])
+        self.assertEqual(len(periods), 8)
+
+    def test_is_deterministic(self):
+        params = {"datasetname": "NIPA", "year": "2020"}
+        self.assertEqual(synthetic_payload(params, 10), synthetic_payload(params, 10))
+        data = synthetic_payload(params, 10)["BEAAPI"]["Results"]["Data"]
+        self.assertEqual(len(data), 10)
+
+
+# Integration tests
+class TestMockBeaServer(TestCase):
+    def setUp(self):
+        patch_api_key(self)
+
+    def test_serves_recorded_responses(self):
+        with MockBeaServer() as server:
+            result = client_for(server).nipa(2005, "a", "T10102")
+        results = result.json()["BEAAPI"]["Results"]
+        self.assertEqual(results["Statistic"], "NIPA Table")
+        self.assertEqual(server.requests_served, 1)
+
+    def test_serves_synthetic_responses_of_configured_size(self):
+        with MockBeaServer(rows=250, recorded_path=None) as server:
+            result = client_for(server).nipa(2020, "Q", "T10101")
+        self.assertEqual(len(result.data), 250)
+
+    def test_base_url_defaults_to_environment(self):
+        with mock.patch.dict(bea.os.environ, {"BEA_API_URL": "http://localhost:1/api/data"}):
+            client = Bea()
+        self.assertEqual(client._Bea__origin_url, "http://localhost:1/api/data")
+
+    def test_injects_rate_limits(self):
+        with MockBeaServer(rate_limit_rate=1.0) as server:
+            with self.assertRaises(BeaRateLimitError):
+                client_for(server).nipa(2020, "A", "T10101")
+
+    def test_injects_server_errors(self):
+        with MockBeaServer(server_error_rate=1.0) as server:
+            with self.assertRaises(BeaServerError):
+                client_for(server).nipa(2020, "A", "T10101")
+
+    def test_injects_error_payloads(self):
+        with MockBeaServer(error_payload_rate=1.0) as server:
+            with self.assertRaises(BeaPayloadError):
+                client_for(server).nipa(2020, "A", "T10101")
+
+    def test_answers_metadata_methods(self):
+        with MockBeaServer() as server:
+            text = client_for(server)._get_parameter_values("NIPA", "Frequency")
+        self.assertIn('"Key": "A"', text)
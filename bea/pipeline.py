@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from bea.result import require_module
+from bea.spool import SpooledResult
+
+# tmpfs on Linux, so files handed between processes never touch the disk
+SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+OUTPUTS = ("arrow", "numpy")
+
+
+def shared_file(directory, suffix=""):
+    descriptor, path = tempfile.mkstemp(prefix="bea-", suffix=suffix, dir=directory)
+    os.close(descriptor)
+    return path
+
+
+def convert_payload(path, output, scale, periods, directory):
+    # Runs in a worker process: decodes the payload written at path and converts it, writing the
+    # columns to shared memory files. Returns the paths of the Arrow IPC file (output "arrow")
+    # or of one .npy file per column (output "numpy"), which the parent maps without copying.
+    # The payload is read through a memory mapping, so it is never copied into a str.
+    try:
+        result = SpooledResult(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    with result:
+        if output == "arrow":
+            pa = require_module("pyarrow")
+            table = result.to_arrow(scale=scale, periods=periods)
+            output_path = shared_file(directory, ".arrow")
+            with pa.OSFile(output_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            return output_path
+
+        np = require_module("numpy")
+        paths = {}
+        for name, values in result.to_numpy(scale=scale, periods=periods).items():
+            paths[name] = shared_file(directory, ".npy")
+            np.save(paths[name], values)
+        return paths
+
+
+def load_output(output, paths):
+    # Maps the files written by convert_payload and unlinks them; the mappings keep the memory
+    # alive until the arrays are released
+    if output == "arrow":
+        pa = require_module("pyarrow")
+        try:
+            return pa.ipc.open_file(pa.memory_map(paths)).read_all()
+        finally:
+            os.unlink(paths)
+
+    np = require_module("numpy")
+    columns = {}
+    try:
+        for name, path in paths.items():
+            columns[name] = np.load(path, mmap_mode="c")
+    finally:
+        for path in paths.values():
+            os.unlink(path)
+    return columns
+
+
+class ParsePipeline:
+    # Fetches with the client's threads while JSON decoding and tabular conversion run in a
+    # process pool, so large pulls are not serialized on the GIL. Converted columns come back
+    # through shared memory as Arrow tables (output "arrow") or NumPy arrays (output "numpy")
+    # instead of being pickled.
+    def __init__(self,
+                 client,
+                 processes=None,
+                 threads=4,
+                 output="arrow",
+                 scale=False,
+                 periods=True,
+                 directory=SHARED_MEMORY_DIR):
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+        self.client = client
+        self.threads = threads
+        self.output = output
+        self.scale = scale
+        self.periods = periods
+        self.directory = directory
+        # Workers are spawned, as forking a process that runs request threads is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# PRIVATE METHODS
+    def __submit(self, method, args, submitted):
+        if isinstance(args, dict):
+            result = method(**args)
+        else:
+            result = method(*args)
+        path = shared_file(self.directory, ".json")
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(result)
+            future = self.executor.submit(
+                convert_payload, path, self.output, self.scale, self.periods, self.directory
+            )
+        except BaseException:
+            os.unlink(path)
+            raise
+        submitted.append(future)
+        return future
+
+    def __discard(self, futures):
+        # Removes the shared memory files of conversions whose results will not be returned
+        for future in futures:
+            try:
+                load_output(self.output, future.result())
+            except Exception:
+                pass
+
+# PUBLIC METHODS
+    def map(self, method_name, args_list, concat=False):
+        # Calls the client's method_name (a public dataset method) once per item of args_list,
+        # like Bea.map, and returns the converted results in order. With concat set, Arrow
+        # tables are concatenated into one.
+        if concat and self.output != "arrow":
+            raise ValueError("concat is only supported for Arrow output")
+        method = getattr(self.client, method_name)
+        submitted = []
+        futures = None
+        results = []
+        try:
+            futures = self.client.map(
+                lambda args: self.__submit(method, args, submitted),
+                [(args,) for args in args_list],
+                workers=self.threads
+            )
+            for future in futures:
+                results.append(load_output(self.output, future.result()))
+        except BaseException:
+            # Either a fetch failed, or the conversion following the last loaded result did
+            self.__discard(submitted if futures is None else futures[len(results) + 1:])
+            raise
+        if concat:
+            pa = require_module("pyarrow")
+            return pa.concat_tables(results, promote_options="default")
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,66 @@
+import os
+from unittest import TestCase, skipIf
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key
+from bea.errors import BeaServerError
+from bea.mockserver import MockBeaServer
+from bea.pipeline import SHARED_MEMORY_DIR, ParsePipeline
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+
+try:
+    import numpy as np
+    import pyarrow as pa
+except ImportError:
+    np = pa = None
+
+
+def shared_files():
+    return {name for name in os.listdir(SHARED_MEMORY_DIR or "/tmp") if name.startswith("bea-")}
+
+
+# Integration tests
+@skipIf(pa is None, "numpy and pyarrow are not installed")
+class TestParsePipeline(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.server = MockBeaServer(rows=300, recorded_path=None).start()
+        self.addCleanup(self.server.stop)
+        self.client = Bea(
+            base_url=self.server.url,
+            rate_limiter=RateLimiter(None, None, None),
+            retry_policy=RetryPolicy(max_attempts=1)
+        )
+        self.files_before = shared_files()
+
+    def tearDown(self):
+        self.assertEqual(shared_files() - self.files_before, set())
+
+    def test_arrow_output_matches_in_process_conversion(self):
+        calls = [{"year": year, "frequency": "Q", "table_name": "T10101"} for year in (2019, 2020)]
+        with ParsePipeline(self.client, processes=2, output="arrow") as pipeline:
+            tables = pipeline.map("nipa", calls)
+            combined = pipeline.map("nipa", calls, concat=True)
+        for table, kwargs in zip(tables, calls):
+            self.assertTrue(table.equals(self.client.nipa(**kwargs).to_arrow()))
+        self.assertEqual(combined.num_rows, 600)
+
+    def test_numpy_output_is_memory_mapped(self):
+        with ParsePipeline(self.client, processes=1, output="numpy") as pipeline:
+            (columns,) = pipeline.map("nipa", [(2020, "A", "T10101")])
+        expected = self.client.nipa(2020, "A", "T10101").to_numpy()
+        self.assertIsInstance(columns["DataValue"], np.memmap)
+        for name, values in expected.items():
+            np.testing.assert_array_equal(columns[name], values)
+
+    def test_fetch_errors_propagate_and_leave_no_files(self):
+        self.server.server_error_rate = 1.0
+        with ParsePipeline(self.client, processes=1) as pipeline:
+            with self.assertRaises(BeaServerError):
+                pipeline.map("nipa", [(2020, "A", "T10101")])
+
+    def test_rejects_unknown_output(self):
+        with self.assertRaises(ValueError):
+            ParsePipeline(self.client, output="csv")
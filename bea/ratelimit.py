@@ -0,0 +1,135 @@
+import threading
+import time
+
+# BEA's published per-key limits. Breaking any of them locks the key out for an hour.
+REQUESTS_PER_MINUTE = 100
+BYTES_PER_MINUTE = 100 * 2**20
+ERRORS_PER_MINUTE = 30
+
+
+def parse_retry_after(value, now=None):
+    # Retry-After is either a number of seconds or an HTTP date
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(retry_at.timestamp() - now, 0.0)
+
+
+class TokenBucket:
+    # A bucket that refills continuously to capacity over period seconds. Consuming may take the
+    # bucket below zero, which is how byte budgets are charged after the size is known.
+    def __init__(self, capacity, period=60.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount):
+        # Seconds until at least amount tokens are available
+        self.refill()
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    # Paces requests against the request, data volume and error budgets of one API key. It is
+    # shared by every thread using the client, including the worker threads behind AsyncBea.
+    # Pass None for a limit to disable that budget.
+    def __init__(self,
+                 requests_per_minute=REQUESTS_PER_MINUTE,
+                 bytes_per_minute=BYTES_PER_MINUTE,
+                 errors_per_minute=ERRORS_PER_MINUTE,
+                 clock=time.monotonic,
+                 sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.requests = self.__make_bucket(requests_per_minute)
+        self.bytes = self.__make_bucket(bytes_per_minute)
+        self.errors = self.__make_bucket(errors_per_minute)
+        self.blocked_until = 0.0
+        self.total_wait = 0.0
+        self.__lock = threading.Lock()
+
+# PRIVATE METHODS
+    def __make_bucket(self, capacity):
+        if capacity is None:
+            return None
+        return TokenBucket(capacity, clock=self.clock)
+
+    def __delay(self):
+        delays = [self.blocked_until - self.clock()]
+        if self.requests is not None:
+            delays.append(self.requests.delay(1))
+        if self.bytes is not None:
+            # Byte budgets are charged after the fact, so only wait while in debt
+            delays.append(self.bytes.delay(0))
+        if self.errors is not None:
+            # Keep room for this request failing too
+            delays.append(self.errors.delay(1))
+        return max(delays)
+
+    def __record_error(self, response):
+        if self.errors is not None:
+            self.errors.consume(1)
+        if response is not None and response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, self.clock() + retry_after)
+
+# PUBLIC METHODS
+    def acquire(self):
+        # Blocks until a request can be sent without breaking a budget; returns seconds waited
+        waited = 0.0
+        while True:
+            with self.__lock:
+                delay = self.__delay()
+                if delay <= 0:
+                    if self.requests is not None:
+                        self.requests.consume(1)
+                    self.total_wait += waited
+                    return waited
+            self.sleep(delay)
+            waited += delay
+
+    def record(self, response, size=None):
+        if size is None:
+            content = response.content
+            size = len(content) if isinstance(content, (bytes, bytearray)) else 0
+            if getattr(response, "from_cache", False) is True:
+                # Served from a revalidating adapter's store, so the body was not downloaded
+                size = 0
+        with self.__lock:
+            if self.bytes is not None:
+                self.bytes.consume(size)
+            if not response.ok:
+                self.__record_error(response)
+
+    def record_bytes(self, size):
+        # For bodies that are streamed after the response has been recorded
+        if self.bytes is not None:
+            with self.__lock:
+                self.bytes.consume(size)
+
+    def record_error(self, response=None):
+        # For errors that are not visible in the status code, e.g. BEA error payloads
+        with self.__lock:
+            self.__record_error(response)
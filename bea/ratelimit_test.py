@@ -0,0 +1,77 @@
+from unittest import TestCase, mock
+
+from bea.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_response(ok=True, status_code=200, content=b"", headers=None):
+    return mock.Mock(ok=ok, status_code=status_code, content=content, headers=headers or {})
+
+
+class TestTokenBucket(TestCase):
+
+    # Unit tests
+    def test_refills_over_period(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, period=60.0, clock=clock)
+        bucket.consume(60)
+        self.assertEqual(bucket.delay(1), 1.0)
+        clock.sleep(30)
+        self.assertEqual(bucket.delay(30), 0.0)
+
+
+class TestParseRetryAfter(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=0), 60.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestRateLimiter(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make_limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    # Unit tests
+    def test_paces_request_budget(self):
+        limiter = self.make_limiter(requests_per_minute=2)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 30.0)
+        self.assertEqual(limiter.total_wait, 30.0)
+
+    def test_waits_while_byte_budget_is_in_debt(self):
+        limiter = self.make_limiter(requests_per_minute=None, bytes_per_minute=600)
+        limiter.acquire()
+        limiter.record(make_response(content=b"x" * 900))
+        self.assertEqual(limiter.acquire(), 30.0)
+
+    def test_keeps_room_for_one_more_error(self):
+        limiter = self.make_limiter(requests_per_minute=None, errors_per_minute=2)
+        limiter.record(make_response(ok=False, status_code=500))
+        self.assertEqual(limiter.acquire(), 0.0)
+        limiter.record_error()
+        self.assertEqual(limiter.acquire(), 30.0)
+
+    def test_honors_retry_after(self):
+        limiter = self.make_limiter(requests_per_minute=None, errors_per_minute=None)
+        limiter.record(
+            make_response(ok=False, status_code=429, headers={"Retry-After": "90"})
+        )
+        self.assertEqual(limiter.acquire(), 90.0)
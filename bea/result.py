@@ -0,0 +1,165 @@
+from functools import cached_property
+from importlib import import_module
+from json import dumps, loads
+
+# Markers BEA puts in DataValue in place of a number, e.g. (D) for suppressed to avoid disclosure
+SUPPRESSION_MARKERS = ("", "(D)", "(NA)", "(NM)", "(L)", "(S)", "(X)", "(*)", "---", "n.a.")
+PERIOD_FREQUENCIES = {"A": "Y", "Q": "Q", "M": "M"}
+QUARTERS = {"I": 1, "II": 2, "III": 3, "IV": 4}
+
+
+def require_module(module_name):
+    # Optional dependencies are imported on first use
+    try:
+        return import_module(module_name)
+    except ImportError as error:
+        package = module_name.split(".")[0]
+        raise ImportError(
+            f"{package} is required for this feature; install it with `pip install {package}`"
+        ) from error
+
+
+def to_float(values):
+    # Vectorized DataValue conversion: strips thousands separators and maps suppression markers
+    # to NaN. values is a NumPy array of str.
+    np = require_module("numpy")
+    values = np.char.replace(np.char.strip(values), ",", "")
+    values = np.where(np.isin(values, SUPPRESSION_MARKERS), "nan", values)
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        # An unknown marker somewhere; only then fall back to converting element by element
+        return np.array([_to_float(value) for value in values], dtype=np.float64)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def parse_periods(values):
+    # Vectorized TimePeriod parsing ("2023", "2023Q1", "2023M04") into the datetime64[M] start of
+    # each period, plus an array of frequency codes (A/Q/M)
+    np = require_module("numpy")
+    chars = np.asarray(values).astype("S7").view(np.uint8).reshape(-1, 7).astype(np.int64)
+    digits = chars - ord("0")
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    kind = chars[:, 4]
+    months = np.where(
+        kind == ord("Q"),
+        digits[:, 5] * 3 - 2,
+        np.where(kind == ord("M"), digits[:, 5] * 10 + digits[:, 6], 1)
+    )
+    starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    frequencies = np.where(kind == ord("Q"), "Q", np.where(kind == ord("M"), "M", "A"))
+    return starts, frequencies
+
+
+def result_periods(columns):
+    # (datetime64[M] period starts, frequency codes) of the rows of {column name: str array},
+    # from TimePeriod or, for GDPbyIndustry, Year and Quarter. None if there are neither.
+    np = require_module("numpy")
+    if "TimePeriod" in columns:
+        return parse_periods(columns["TimePeriod"])
+    if "Year" in columns and "Quarter" in columns:
+        # GDPbyIndustry reports Year plus a roman numeral Quarter (or the year again)
+        years = columns["Year"].astype(np.int64)
+        quarters = np.array([QUARTERS.get(quarter, 0) for quarter in columns["Quarter"]])
+        starts = ((years - 1970) * 12 + np.maximum(quarters * 3 - 3, 0)).astype("datetime64[M]")
+        return starts, np.where(quarters > 0, "Q", "A")
+    return None
+
+
+class TabularResult:
+    # Accessors and columnar conversions of BEAAPI.Results.Data, on top of the payload provided
+    # by the result types (BeaResult, bea.spool.SpooledResult)
+
+    def json(self):
+        return self.payload
+
+    @property
+    def results(self):
+        results = self.payload["BEAAPI"]["Results"]
+        if isinstance(results, list):  # e.g. InputOutput
+            results = results[0]
+        return results
+
+    @property
+    def data(self):
+        return self.results.get("Data", [])
+
+    @property
+    def column_names(self):
+        # Union of the row keys in first-seen order; rows may omit keys such as NoteRef
+        names = {}
+        for row in self.data:
+            for name in row:
+                names.setdefault(name, None)
+        return list(names)
+
+    def __columns(self, scale, periods):
+        np = require_module("numpy")
+        data = self.data
+        columns = {
+            name: np.array([row.get(name, "") for row in data], dtype=str)
+            for name in self.column_names
+        }
+        frequencies = None
+        if "DataValue" in columns:
+            columns["DataValue"] = to_float(columns["DataValue"])
+        if "UNIT_MULT" in columns:
+            columns["UNIT_MULT"] = np.nan_to_num(to_float(columns["UNIT_MULT"])).astype(np.int64)
+            if scale and "DataValue" in columns:
+                columns["DataValue"] = columns["DataValue"] * np.power(
+                    10.0, columns["UNIT_MULT"]
+                )
+        if periods:
+            parsed = result_periods(columns)
+            if parsed is not None:
+                columns["TimePeriod"], frequencies = parsed
+        return columns, frequencies
+
+    def to_numpy(self, scale=False, periods=True):
+        # Returns {column name: array}. DataValue becomes float64 with NaN for suppressed values,
+        # UNIT_MULT becomes int64, and TimePeriod becomes datetime64[M] period starts when periods
+        # is set. With scale set, DataValue is multiplied by 10 ** UNIT_MULT.
+        columns, _ = self.__columns(scale, periods)
+        return columns
+
+    def to_pandas(self, scale=False, periods=True):
+        # TimePeriod becomes a period dtype when the result holds a single frequency
+        pd = require_module("pandas")
+        columns, frequencies = self.__columns(scale, periods)
+        frame = pd.DataFrame(columns)
+        if frequencies is not None:
+            frame["TimePeriod"] = columns["TimePeriod"].astype("datetime64[s]")
+            if len(frame) and (frequencies == frequencies[0]).all():
+                frame["TimePeriod"] = frame["TimePeriod"].dt.to_period(
+                    PERIOD_FREQUENCIES[str(frequencies[0])]
+                )
+        return frame
+
+    def to_arrow(self, scale=False, periods=True):
+        pa = require_module("pyarrow")
+        columns, frequencies = self.__columns(scale, periods)
+        if frequencies is not None:
+            columns["TimePeriod"] = columns["TimePeriod"].astype("datetime64[D]")
+        return pa.table({name: pa.array(values) for name, values in columns.items()})
+
+
+class BeaResult(TabularResult, str):
+    # The raw response text returned by the public methods, so existing callers keep working,
+    # with the parsed payload and columnar conversions of BEAAPI.Results.Data on top
+
+    @classmethod
+    def from_payload(cls, payload, text=None):
+        # text, if given, must be a serialization of payload
+        result = cls(text if text is not None else dumps(payload))
+        result.__dict__["payload"] = payload
+        return result
+
+    @cached_property
+    def payload(self):
+        return loads(self)
@@ -0,0 +1,86 @@
+from json import dumps, load
+from unittest import TestCase, skipIf
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.result import BeaResult, parse_periods, to_float
+
+try:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+except ImportError:
+    np = pd = pa = None
+
+
+def load_result(api_endpoint_fn_name):
+    with open("bea/test_cases_api_responses.json", 'r') as file:
+        test_data = load(file)
+    return BeaResult(dumps(next(iter(test_data[api_endpoint_fn_name]["responses"].values()))))
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestConversions(TestCase):
+
+    # Unit tests
+    def test_to_float(self):
+        values = to_float(np.array(["1,234.5", "(D)", "(NA)", "", "-3", "???"]))
+        np.testing.assert_array_equal(values, [1234.5, np.nan, np.nan, np.nan, -3.0, np.nan])
+
+    def test_parse_periods(self):
+        starts, frequencies = parse_periods(np.array(["2023", "2023Q3", "2023M11"]))
+        np.testing.assert_array_equal(
+            starts, np.array(["2023-01", "2023-07", "2023-11"], dtype="datetime64[M]")
+        )
+        self.assertEqual(frequencies.tolist(), ["A", "Q", "M"])
+
+
+@skipIf(pa is None, "numpy, pandas and pyarrow are not installed")
+class TestBeaResult(TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.result = load_result("fixed_assets")
+
+    # Unit tests
+    def test_is_response_text(self):
+        self.assertIsInstance(self.result, str)
+        self.assertEqual(self.result.json(), self.result.payload)
+
+    def test_to_numpy(self):
+        columns = self.result.to_numpy()
+        self.assertEqual(columns["DataValue"][0], 43396612.0)
+        self.assertEqual(columns["UNIT_MULT"].dtype, np.int64)
+        self.assertEqual(columns["TimePeriod"][0], np.datetime64("2005-01"))
+        self.assertEqual(len(columns["NoteRef"]), len(self.result.data))
+
+    def test_scale(self):
+        columns = self.result.to_numpy(scale=True)
+        self.assertEqual(columns["DataValue"][0], 43396612.0 * 10 ** 6)
+
+    def test_to_pandas(self):
+        frame = self.result.to_pandas()
+        self.assertEqual(len(frame), len(self.result.data))
+        self.assertEqual(frame["TimePeriod"][0], pd.Period("2005", freq="Y"))
+
+    def test_to_arrow(self):
+        table = self.result.to_arrow()
+        self.assertEqual(table.num_rows, len(self.result.data))
+        self.assertEqual(table.schema.field("DataValue").type, pa.float64())
+        self.assertEqual(table.schema.field("TimePeriod").type, pa.date32())
+
+
+class TestBeaReturnsBeaResult(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self)
+        self.mock_request.return_value.text = str(load_result("regional"))
+        self.client = Bea()
+
+    # Integration tests
+    def test_output_value(self):
+        result = self.client.regional("SAGDP1", 1, "GA")
+        self.assertIsInstance(result, BeaResult)
+        self.assertEqual(result, self.mock_request.return_value.text)
+        self.assertEqual(result.data[0]["GeoName"], "Georgia")
@@ -0,0 +1,48 @@
+import random
+import time
+
+from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# ChunkedEncodingError is a connection reset while the body is read
+RETRY_EXCEPTIONS = (ConnectionError, ChunkedEncodingError, Timeout)
+
+
+class RetryPolicy:
+    # Exponential backoff capped at backoff_cap, with full jitter by default. max_attempts counts
+    # the first attempt, so max_attempts=1 disables retries.
+    def __init__(self,
+                 max_attempts=4,
+                 backoff_base=1.0,
+                 backoff_cap=60.0,
+                 jitter=True,
+                 retry_statuses=RETRY_STATUSES,
+                 retry_exceptions=RETRY_EXCEPTIONS,
+                 sleep=time.sleep):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.sleep = sleep
+
+    def should_retry(self, attempt, error):
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(error, self.retry_exceptions):
+            return True
+        return getattr(error, "status_code", None) in self.retry_statuses
+
+    def backoff(self, attempt, retry_after=None):
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def wait(self, attempt, retry_after=None):
+        delay = self.backoff(attempt, retry_after)
+        self.sleep(delay)
+        return delay
@@ -0,0 +1,118 @@
+from json import dumps
+from unittest import TestCase, mock
+
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.errors import (
+    BeaPayloadError,
+    BeaRateLimitError,
+    BeaServerError,
+    error_from_content,
+    error_from_response,
+    parse_error_payload,
+)
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+
+
+def make_response(status_code=200, content=b'{"BEAAPI": {"Results": {"Data": []}}}',
+                  headers=None):
+    return mock.Mock(ok=status_code < 400, status_code=status_code, reason="Reason",
+                     content=content, headers=headers or {})
+
+
+class TestParseErrorPayload(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        error = {"APIErrorCode": "40", "APIErrorDescription": "Invalid value"}
+        self.assertEqual(parse_error_payload({"BEAAPI": {"Error": error}}), error)
+        self.assertEqual(parse_error_payload({"BEAAPI": {"Results": {"Error": error}}}), error)
+        self.assertEqual(parse_error_payload({"BEAAPI": {"Results": [{"Error": error}]}}), error)
+        self.assertIsNone(parse_error_payload({"BEAAPI": {"Results": {"Data": []}}}))
+
+
+class TestErrorFromResponse(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        self.assertIsNone(error_from_response(make_response()))
+        error = error_from_response(make_response(
+            content=b'{"BEAAPI": {"Results": {"Error": '
+                    b'{"APIErrorCode": "40", "APIErrorDescription": "Invalid value"}}}}'
+        ))
+        self.assertIsInstance(error, BeaPayloadError)
+        self.assertEqual((error.code, error.description), ("40", "Invalid value"))
+        self.assertIsInstance(error_from_response(make_response(429, b"")), BeaRateLimitError)
+        self.assertIsInstance(error_from_response(make_response(503, b"")), BeaServerError)
+
+    def test_large_bodies(self):
+        error = {"APIErrorCode": "40", "APIErrorDescription": "Invalid value"}
+        rows = [{"Error": "Line 1", "DataValue": "1"}] * 2000
+        # A data payload with an Error field near the top is not an error payload
+        data = dumps({"BEAAPI": {"Results": {"Data": rows}}}).encode("utf-8")
+        self.assertIsNone(error_from_content(memoryview(data)))
+        request = {"RequestParam": [{"ParameterName": "GeoFips", "ParameterValue": "x" * 8000}]}
+        content = dumps({"BEAAPI": {"Error": error, "Request": request}}).encode("utf-8")
+        self.assertEqual(error_from_content(memoryview(content)).code, "40")
+
+
+class TestRetryPolicy(TestCase):
+
+    # Unit tests
+    def test_backoff_is_capped_and_jittered(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_cap=5.0, jitter=False)
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+        policy.jitter = True
+        self.assertTrue(0 <= policy.backoff(10) <= 5.0)
+        self.assertEqual(policy.backoff(1, retry_after=30.0), 30.0)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.should_retry(1, ConnectionError()))
+        self.assertTrue(policy.should_retry(2, BeaServerError(response=make_response(502))))
+        self.assertTrue(policy.should_retry(1, ChunkedEncodingError()))
+        self.assertFalse(policy.should_retry(3, ConnectionError()))
+        self.assertFalse(policy.should_retry(1, BeaPayloadError(response=make_response())))
+
+
+class TestSendRequestRetries(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self)
+        self.sleep = mock.Mock()
+        self.client = Bea(
+            rate_limiter=RateLimiter(None, None, None),
+            retry_policy=RetryPolicy(max_attempts=3, sleep=self.sleep)
+        )
+
+    # Unit tests
+    def test_retries_transient_failures(self):
+        self.mock_request.side_effect = [ConnectionError(), make_response(503), make_response()]
+        response = self.client._Bea__send_request("https://apps.bea.gov/api/data", {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.mock_request.call_count, 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_retries_connection_reset_during_body(self):
+        self.mock_request.side_effect = [ChunkedEncodingError(), make_response()]
+        response = self.client._Bea__send_request("https://apps.bea.gov/api/data", {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.mock_request.call_count, 2)
+
+    def test_raises_after_max_attempts(self):
+        self.mock_request.return_value = make_response(500)
+        with self.assertRaises(BeaServerError):
+            self.client._Bea__send_request("https://apps.bea.gov/api/data", {})
+        self.assertEqual(self.mock_request.call_count, 3)
+
+    def test_does_not_retry_payload_errors(self):
+        self.mock_request.return_value = make_response(
+            content=b'{"BEAAPI": {"Error": {"APIErrorCode": "3", "APIErrorDescription": "x"}}}'
+        )
+        with self.assertRaises(BeaPayloadError):
+            self.client._Bea__send_request("https://apps.bea.gov/api/data", {})
+        self.mock_request.assert_called_once()
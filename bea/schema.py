@@ -0,0 +1,37 @@
+from functools import lru_cache
+from json import dumps, loads
+
+
+@lru_cache(maxsize=None)
+def load_datasets_args():
+    # The dataset schema, precompiled by dataset_args_compiler.py into bea._datasets_args so that
+    # loading it is an import of cached bytecode. Falls back to compiling it from the source.
+    try:
+        from bea._datasets_args import DATASETS_ARGS
+    except ImportError:
+        from bea.dataset_args_compiler import dataset_args
+        return loads(dumps(dataset_args))
+    return DATASETS_ARGS
+
+
+class DatasetsArgs:
+    # Class attribute that loads the schema on first access rather than at class definition
+    def __get__(self, instance, owner=None):
+        return load_datasets_args()
+
+
+def normalize_name(name):
+    # Parameter names are matched without case or underscores, so table_name, TableName and
+    # TABLENAME all name the same parameter
+    return name.replace("_", "").lower()
+
+
+@lru_cache(maxsize=None)
+def parameter_names(dataset_name):
+    # {normalized name: API name} of the parameters of a dataset, computed once per dataset
+    schema = load_datasets_args().get(dataset_name, {})
+    schemas = list(schema.values()) if "DI" in schema else [schema]  # MNE: DI and AMNE
+    return {
+        normalize_name(name): name
+        for schema in schemas for key in ("required", "all") for name in schema.get(key, ())
+    }
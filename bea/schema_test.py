@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from json import load
+from unittest import TestCase
+
+from bea.bea import Bea
+from bea.dataset_args_compiler import dataset_args
+from bea.schema import load_datasets_args
+
+
+# Unit tests
+class TestLoadDatasetsArgs(TestCase):
+    def test_precompiled_module_matches_compiler_and_json(self):
+        datasets_args = load_datasets_args()
+        with open(Bea.dataset_args_filepath, "r") as file:
+            self.assertEqual(datasets_args, load(file))
+        self.assertEqual(list(datasets_args), list(dataset_args))
+
+    def test_loaded_once(self):
+        self.assertIs(load_datasets_args(), load_datasets_args())
+        self.assertIs(Bea.datasets_args, load_datasets_args())
+
+
+# Integration tests
+class TestImport(TestCase):
+    def test_importing_client_defers_requests(self):
+        output = subprocess.run(
+            [sys.executable, "-c", (
+                "import sys, bea.bea; "
+                "print('requests' in sys.modules, 'bea._datasets_args' in sys.modules)"
+            )],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout.split()
+        self.assertEqual(output, ["False", "False"])
+
+    def test_creating_a_client_imports_modules_normally(self):
+        output = subprocess.run(
+            [sys.executable, "-c", (
+                "import os, sys, bea.bea; "
+                "os.environ['BEA_API_KEY'] = 'key'; "
+                "bea.bea.Bea(); "
+                "print('requests' in sys.modules, sorted(name for name, module in "
+                "list(sys.modules.items()) if type(module).__name__ == '_LazyModule'))"
+            )],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout.strip()
+        self.assertEqual(output, "True []")
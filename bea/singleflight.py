@@ -0,0 +1,49 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one execution of fn: the first caller runs it and
+    # the others wait for its result (or exception)
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key, fn):
+        with self.__lock:
+            future = self.__calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.__calls[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+
+class AsyncSingleFlight:
+    # The coroutine counterpart of SingleFlight, for use on one event loop
+    def __init__(self):
+        self.__calls = {}
+
+    async def do(self, key, coroutine_fn):
+        # Imported here, as only the coroutine client needs asyncio
+        import asyncio
+        task = self.__calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_fn())
+            self.__calls[key] = task
+            task.add_done_callback(lambda _: self.__calls.pop(key, None))
+        # Shielded so that one cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(task)
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from bea.async_bea import AsyncBea
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def slow_get(session, url, params):
+    time.sleep(0.1)
+    return mock.Mock(ok=True, content=b"", text=f"{params['Year']}")
+
+
+class TestSingleFlight(TestCase):
+
+    # Unit tests
+    def test_shares_result_and_exception(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fn():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(single_flight.do, "key", fn)
+            started.wait()
+            followers = [executor.submit(single_flight.do, "key", fn) for _ in range(3)]
+            results = [leader.result()] + [follower.result() for follower in followers]
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(len(calls), 1)
+
+        def fail():
+            raise ValueError()
+        with self.assertRaises(ValueError):
+            single_flight.do("key", fail)
+        self.assertEqual(single_flight.do("key", lambda: "again"), "again")
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+
+    # Unit tests
+    async def test_shares_result(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*[single_flight.do("key", fn) for _ in range(4)])
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(len(calls), 1)
+
+
+class TestBeaSingleFlight(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self, slow_get)
+
+    # Integration tests
+    def test_concurrent_identical_requests_share_one_call(self):
+        client = Bea()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda frequency: client.nipa(2005, frequency, "T10101"), ["A", "a", "A", "a"]
+            ))
+        self.assertEqual(results, ["2005"] * 4)
+        self.mock_request.assert_called_once()
+
+
+class TestAsyncBeaSingleFlight(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self, slow_get)
+        self.client = AsyncBea(max_concurrency=4)
+        self.addCleanup(self.client.close)
+
+    # Integration tests
+    async def test_concurrent_identical_requests_share_one_call(self):
+        results = await self.client.gather_many(
+            [self.client.nipa(2005, "A", "T10101") for _ in range(4)]
+        )
+        self.assertEqual(results, ["2005"] * 4)
+        self.mock_request.assert_called_once()
@@ -0,0 +1,103 @@
+import mmap
+import os
+import tempfile
+import weakref
+from functools import cached_property
+from json import loads
+
+from bea.result import TabularResult
+from bea.stream import iter_chunks, iter_data_rows
+
+
+def default_spool_dir():
+    return tempfile.gettempdir()
+
+
+def spool_chunks(chunks, directory=None):
+    # Writes an iterable of byte chunks to a new file in directory and returns it mapped
+    descriptor, path = tempfile.mkstemp(prefix="bea-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        return SpooledResult(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+
+
+def _shared_keys_hook():
+    # Rows decoded one at a time do not share their key strings as with json.loads, so each
+    # row of a materialized list would hold its own copies
+    keys = {}
+
+    def hook(pairs):
+        return {keys.setdefault(key, key): value for key, value in pairs}
+    return hook
+
+
+def _release(buffer, mapping, file, path):
+    try:
+        buffer.release()
+        if mapping is not None:
+            mapping.close()
+    except BufferError:
+        # Views of the buffer are still alive; the mapping is closed when they are collected
+        pass
+    file.close()
+    if path is not None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class SpooledResult(TabularResult):
+    # A response body in a file, memory-mapped read-only. Rows are decoded straight from the
+    # mapped pages, so the body never exists as a Python str or bytes and the operating system
+    # can page it out: iter_rows() processes bodies larger than RAM in constant memory, while
+    # data and the conversions (to_numpy, to_pandas, to_arrow) only hold the decoded rows.
+    # The file is removed when the result is closed or collected, unless delete is False.
+    def __init__(self, path, delete=True):
+        self.path = path
+        file = open(path, "rb")
+        try:
+            self.size = os.fstat(file.fileno()).st_size
+            # Empty files cannot be mapped
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        except BaseException:
+            file.close()
+            raise
+        self.buffer = memoryview(mapping if mapping is not None else b"")
+        self.__finalizer = weakref.finalize(
+            self, _release, self.buffer, mapping, file, path if delete else None
+        )
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# PUBLIC METHODS
+    def iter_rows(self, object_pairs_hook=None):
+        return iter_data_rows(iter_chunks(self.buffer), object_pairs_hook)
+
+    @cached_property
+    def data(self):
+        return list(self.iter_rows(_shared_keys_hook()))
+
+    @cached_property
+    def payload(self):
+        # Decodes the whole body at once, like BeaResult; prefer data or iter_rows for rows
+        return loads(str(self.buffer, "utf-8"))
+
+    @property
+    def closed(self):
+        return not self.__finalizer.alive
+
+    def close(self):
+        self.__finalizer()
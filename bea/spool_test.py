@@ -0,0 +1,101 @@
+import os
+from json import dumps
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bea.bea_test import patch_api_key
+from bea.cache import ResponseCache
+from bea.errors import BeaPayloadError
+from bea.mockserver import MockBeaServer, synthetic_payload
+from bea.mockserver_test import client_for
+from bea.result import BeaResult
+from bea.spool import SpooledResult, spool_chunks
+from bea.stream import iter_chunks
+
+
+class TestSpooledResult(TestCase):
+
+    def setUp(self):
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.payload = synthetic_payload({"year": "2020", "frequency": "Q"}, 300)
+        self.text = dumps(self.payload)
+
+    def spool(self, text):
+        result = spool_chunks(iter_chunks(text, chunk_size=1000), self.tempdir.name)
+        self.addCleanup(result.close)
+        return result
+
+    # Unit tests
+    def test_matches_in_memory_result(self):
+        result = self.spool(self.text)
+        expected = BeaResult(self.text)
+        self.assertEqual(len(result), len(self.text))
+        self.assertEqual(result.data, expected.data)
+        self.assertEqual(list(result.iter_rows()), expected.data)
+        self.assertEqual(result.payload, self.payload)
+        self.assertEqual(
+            result.to_numpy()["DataValue"].tolist(), expected.to_numpy()["DataValue"].tolist()
+        )
+
+    def test_close_removes_file(self):
+        result = self.spool(self.text)
+        self.assertTrue(os.path.exists(result.path))
+        result.close()
+        self.assertTrue(result.closed)
+        self.assertFalse(os.path.exists(result.path))
+
+    def test_keeps_file_without_delete(self):
+        path = os.path.join(self.tempdir.name, "body.json")
+        with open(path, "w") as file:
+            file.write(self.text)
+        with SpooledResult(path, delete=False) as result:
+            self.assertEqual(len(result.data), 300)
+        self.assertTrue(os.path.exists(path))
+
+    def test_empty_body(self):
+        self.assertEqual(self.spool("").data, [])
+
+    def test_raises_error_payload(self):
+        result = self.spool(dumps({"BEAAPI": {"Error": {"APIErrorCode": "40"}}}))
+        with self.assertRaises(BeaPayloadError):
+            result.data
+
+
+class TestBeaSpool(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def spooled_files(self):
+        return [name for name in os.listdir(self.tempdir.name) if name.startswith("bea-")]
+
+    # Integration tests
+    def test_spools_response_to_file(self):
+        with MockBeaServer(rows=500, recorded_path=None) as server:
+            client = client_for(server, spool_dir=self.tempdir.name)
+            with client.spool("NIPA", year=2020, frequency="Q", table_name="T10101") as result:
+                self.assertEqual(len(result.data), 500)
+                self.assertEqual(os.path.dirname(result.path), self.tempdir.name)
+                expected = client.nipa(2020, "Q", "T10101")
+                self.assertEqual(result.data, expected.data)
+        self.assertEqual(self.spooled_files(), [])
+
+    def test_spools_cached_response(self):
+        cache = ResponseCache(os.path.join(self.tempdir.name, "responses.sqlite"))
+        self.addCleanup(cache.close)
+        with MockBeaServer(rows=50, recorded_path=None) as server:
+            client = client_for(server, cache=cache, spool_dir=self.tempdir.name)
+            expected = client.nipa(2020, "Q", "T10101")
+            with client.spool("NIPA", year=2020, frequency="Q", table_name="T10101") as result:
+                self.assertEqual(result.data, expected.data)
+            self.assertEqual(server.requests_served, 1)
+
+    def test_raises_error_payload_and_removes_file(self):
+        with MockBeaServer(error_payload_rate=1.0, recorded_path=None) as server:
+            client = client_for(server, spool_dir=self.tempdir.name)
+            with self.assertRaises(BeaPayloadError):
+                client.spool("NIPA", year=2020, frequency="Q", table_name="T10101")
+        self.assertEqual(self.spooled_files(), [])
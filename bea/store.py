@@ -0,0 +1,128 @@
+import os
+from datetime import date
+from hashlib import sha256
+from json import dumps
+
+from bea.bulk import dataset_schema
+from bea.result import require_module
+
+# The request parameter that names a table, per dataset
+TABLE_PARAMS = {
+    "NIPA": "TableName",
+    "NIUnderlyingDetail": "TableName",
+    "FixedAssets": "TableName",
+    "Regional": "TableName",
+    "GDPbyIndustry": "TableID",
+    "UnderlyingGDPbyIndustry": "TableID",
+    "InputOutput": "TableID",
+}
+
+
+def partition_dir(root, dataset_name, table, frequency, year):
+    return os.path.join(
+        root,
+        f"dataset={dataset_name}",
+        f"table={table}",
+        f"frequency={frequency}",
+        f"year={year}"
+    )
+
+
+def params_digest(params):
+    # Queries for the same table can differ in other parameters (LineCode, GeoFips, ...), so each
+    # partition holds one file per distinct set of them
+    normalized = {name.lower(): str(value).lower() for name, value in params.items()}
+    return sha256(dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class BeaStore:
+    # Local Parquet store of fetched data, partitioned by dataset/table/frequency/year (hive
+    # layout). query() reads through memory-mapped Arrow datasets with the year and geography
+    # filters pushed down, and fetches the partitions it is missing through client.bulk.
+    # Years without data are stored empty so they are not fetched again, except for the latest
+    # recent_years years, which BEA may not have published yet.
+    def __init__(self, root, client=None, recent_years=2):
+        self.root = root
+        self.client = client
+        self.recent_years = recent_years
+
+# PRIVATE METHODS
+    def __fetch(self, dataset_name, table, frequency, years, fetch_params, digest):
+        pa = require_module("pyarrow")
+        pc = require_module("pyarrow.compute")
+        pq = require_module("pyarrow.parquet")
+
+        params = {TABLE_PARAMS.get(dataset_name, "TableName"): table, **fetch_params}
+        schema = dataset_schema(self.client.datasets_args, dataset_name, params)
+        if "Frequency" in schema.get("all", ()) and "Frequency" not in params:
+            params["Frequency"] = frequency
+        params["Year"] = years
+        result = self.client.bulk(dataset_name, **params)
+        table_data = result.to_arrow()
+        if table_data.num_rows == 0:
+            return
+        if "TimePeriod" in table_data.column_names:
+            row_years = pc.year(table_data["TimePeriod"])
+        else:
+            row_years = pc.cast(table_data["Year"], pa.int64())
+
+        first_recent_year = date.today().year - self.recent_years + 1
+        for year in years:
+            part = table_data.filter(pc.equal(row_years, int(year)))
+            path = self.path(dataset_name, table, frequency, year, digest)
+            if part.num_rows == 0 and int(year) >= first_recent_year:
+                # Not published yet, or no longer: asked again next time
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pq.write_table(part, path)
+
+# PUBLIC METHODS
+    def path(self, dataset_name, table, frequency, year, digest):
+        return os.path.join(
+            partition_dir(self.root, dataset_name, table, frequency, year),
+            f"part-{digest}.parquet"
+        )
+
+    def query(self, dataset_name, table, years, geo=None, frequency="A", refresh=False,
+              **params):
+        # years is a list of years; geo an optional list of GeoFips to filter on. Other keyword
+        # arguments are API parameters used when fetching (e.g. LineCode for Regional). With
+        # refresh, every year is fetched again, e.g. after BEA revised the table.
+        pa = require_module("pyarrow")
+        ds = require_module("pyarrow.dataset")
+        fs = require_module("pyarrow.fs")
+
+        years = [int(year) for year in years]
+        fetch_params = dict(params)
+        if geo is not None and dataset_name == "Regional" and "GeoFips" not in fetch_params:
+            fetch_params["GeoFips"] = list(geo)
+        digest = params_digest(fetch_params)
+
+        missing = list(years) if refresh else [
+            year for year in years
+            if not os.path.exists(self.path(dataset_name, table, frequency, year, digest))
+        ]
+        if missing:
+            if self.client is None:
+                raise LookupError(f"Partitions for years {missing} are not in the store")
+            self.__fetch(dataset_name, table, frequency, missing, fetch_params, digest)
+
+        paths = [
+            self.path(dataset_name, table, frequency, year, digest) for year in years
+            if os.path.exists(self.path(dataset_name, table, frequency, year, digest))
+        ]
+        if not paths:
+            return pa.table({})
+        dataset = ds.dataset(
+            paths,
+            format="parquet",
+            partitioning="hive",
+            partition_base_dir=self.root,
+            filesystem=fs.LocalFileSystem(use_mmap=True)
+        )
+        predicate = ds.field("year").isin(years)
+        if geo is not None and "GeoFips" in dataset.schema.names:
+            predicate = predicate & ds.field("GeoFips").isin([str(code) for code in geo])
+        return dataset.to_table(filter=predicate)
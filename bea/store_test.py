@@ -0,0 +1,80 @@
+from datetime import date
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipIf
+
+from bea.bea import Bea
+from bea.bea_test import fake_response, patch_api_key, patch_session_get
+from bea.store import BeaStore
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+@skipIf(pyarrow is None, "pyarrow is not installed")
+class TestBeaStore(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        # Years BEA has not published
+        self.unpublished = set()
+        self.value = "1,000"
+
+        def fake_get(session, url, params):
+            rows = [{"Code": "SAGDP1-1", "GeoFips": geo_fips, "TimePeriod": year,
+                     "CL_UNIT": "Millions", "UNIT_MULT": "6", "DataValue": self.value}
+                    for geo_fips in params["GeoFips"].split(",")
+                    for year in params["Year"].split(",") if year not in self.unpublished]
+            return fake_response({"BEAAPI": {"Results": {"Data": rows}}})
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.store = BeaStore(self.tempdir.name, Bea())
+
+    # Integration tests
+    def test_fetches_only_missing_partitions(self):
+        table = self.store.query("Regional", "SAGDP1", years=[2015, 2016], geo=["13000", "01000"],
+                                 LineCode=1)
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(self.mock_request.call_args.kwargs["params"]["Year"], "2015,2016")
+
+        table = self.store.query("Regional", "SAGDP1", years=[2016, 2017], geo=["13000", "01000"],
+                                 LineCode=1)
+        self.assertEqual(self.mock_request.call_count, 2)
+        self.assertEqual(self.mock_request.call_args.kwargs["params"]["Year"], "2017")
+        self.assertEqual(sorted(table["year"].to_pylist()), [2016, 2016, 2017, 2017])
+        self.assertEqual(table["DataValue"].to_pylist(), [1000.0] * 4)
+
+    def test_reads_offline(self):
+        self.store.query("Regional", "SAGDP1", years=[2015], geo=["13000"], LineCode=1)
+        offline = BeaStore(self.tempdir.name)
+        table = offline.query("Regional", "SAGDP1", years=[2015], geo=["13000"], LineCode=1)
+        self.assertEqual(table["GeoFips"].to_pylist(), ["13000"])
+        with self.assertRaises(LookupError):
+            offline.query("Regional", "SAGDP1", years=[2016], geo=["13000"], LineCode=1)
+
+    def test_refetches_recent_years_without_data(self):
+        this_year = date.today().year
+        old_year = this_year - 5
+        self.unpublished = {str(this_year), str(old_year)}
+        table = self.store.query("Regional", "SAGDP1", years=[old_year, this_year - 1, this_year],
+                                 geo=["13000"], LineCode=1)
+        self.assertEqual(table["year"].to_pylist(), [this_year - 1])
+
+        self.unpublished = set()
+        table = self.store.query("Regional", "SAGDP1", years=[old_year, this_year - 1, this_year],
+                                 geo=["13000"], LineCode=1)
+        self.assertEqual(self.mock_request.call_args.kwargs["params"]["Year"], str(this_year))
+        # Older years without data are stored empty and not asked again
+        self.assertEqual(sorted(table["year"].to_pylist()), [this_year - 1, this_year])
+
+    def test_refresh_fetches_stored_years_again(self):
+        self.store.query("Regional", "SAGDP1", years=[2015], geo=["13000"], LineCode=1)
+        self.value = "2,000"
+        table = self.store.query("Regional", "SAGDP1", years=[2015], geo=["13000"], LineCode=1,
+                                 refresh=True)
+        self.assertEqual(self.mock_request.call_count, 2)
+        self.assertEqual(table["DataValue"].to_pylist(), [2000.0])
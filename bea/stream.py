@@ -0,0 +1,71 @@
+import codecs
+import re
+from json import JSONDecodeError, JSONDecoder, loads
+
+from bea.errors import BeaPayloadError, parse_error_payload
+
+CHUNK_SIZE = 64 * 1024
+DATA_ARRAY_START = re.compile(r'"Data"\s*:\s*\[')
+SEPARATORS = " \t\n\r,"
+
+_decoder = JSONDecoder()
+
+
+def iter_chunks(text, chunk_size=CHUNK_SIZE):
+    # Adapts an in-memory payload (str, bytes or a buffer) to the chunk iterator interface
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    view = memoryview(text)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def iter_data_rows(chunks, object_pairs_hook=None):
+    # Yields the rows of BEAAPI.Results.Data from an iterable of byte chunks. Only the current
+    # row and the unparsed tail of the latest chunk are held in memory, whatever the payload size.
+    # object_pairs_hook is applied to each decoded object, e.g. bea.utils.lowercase_hook().
+    row_decoder = _decoder if object_pairs_hook is None else JSONDecoder(
+        object_pairs_hook=object_pairs_hook
+    )
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+
+    # Everything before the Data array is small, so it is buffered whole. If the array never
+    # shows up, the buffer is the full payload and can be checked for an error object.
+    buffer = ""
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        match = DATA_ARRAY_START.search(buffer)
+        if match is not None:
+            buffer = buffer[match.end():]
+            break
+    else:
+        buffer += decoder.decode(b"", final=True)
+        error = parse_error_payload(loads(buffer)) if buffer.strip() else None
+        if error is not None:
+            raise BeaPayloadError(
+                code=error.get("APIErrorCode"),
+                description=error.get("APIErrorDescription"),
+                detail=error.get("ErrorDetail")
+            )
+        return
+
+    position = 0
+    while True:
+        while position < len(buffer) and buffer[position] in SEPARATORS:
+            position += 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            if position == len(buffer):
+                raise JSONDecodeError("Expecting value", buffer, position)
+            row, position = row_decoder.raw_decode(buffer, position)
+        except JSONDecodeError:
+            # The row is split across chunks: drop what has been consumed and read on
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ValueError("Response ended before the end of the Data array")
+            buffer = buffer[position:] + decoder.decode(chunk)
+            position = 0
+            continue
+        yield row
@@ -0,0 +1,66 @@
+from json import dumps, load
+from unittest import TestCase
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.errors import BeaPayloadError
+from bea.stream import iter_chunks, iter_data_rows
+
+
+def load_response(api_endpoint_fn_name):
+    with open("bea/test_cases_api_responses.json", 'r') as file:
+        test_data = load(file)
+    return next(iter(test_data[api_endpoint_fn_name]["responses"].values()))
+
+
+class TestIterDataRows(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        response = load_response("nipa")
+        text = dumps(response, indent=2)
+        expected = response["BEAAPI"]["Results"]["Data"]
+        for chunk_size in (1, 7, 4096, len(text)):
+            self.assertEqual(list(iter_data_rows(iter_chunks(text, chunk_size))), expected)
+
+    def test_results_list(self):
+        response = load_response("input_output")
+        expected = response["BEAAPI"]["Results"][0]["Data"]
+        self.assertEqual(list(iter_data_rows(iter_chunks(dumps(response), 100))), expected)
+
+    def test_splits_multibyte_characters(self):
+        text = '{"BEAAPI": {"Results": {"Data": [{"GeoName": "Añasco"}, {"GeoName": "Cataño"}]}}}'
+        self.assertEqual(
+            list(iter_data_rows(iter_chunks(text, 1))),
+            [{"GeoName": "Añasco"}, {"GeoName": "Cataño"}]
+        )
+
+    def test_empty_data(self):
+        self.assertEqual(list(iter_data_rows([b'{"BEAAPI": {"Results": {"Data": []}}}'])), [])
+
+    def test_raises_error_payload(self):
+        text = b'{"BEAAPI": {"Error": {"APIErrorCode": "3", "APIErrorDescription": "Missing"}}}'
+        with self.assertRaises(BeaPayloadError):
+            list(iter_data_rows([text]))
+
+    def test_raises_on_truncated_response(self):
+        with self.assertRaises(ValueError):
+            list(iter_data_rows([b'{"BEAAPI": {"Results": {"Data": [{"a": "1"}, {"a"']))
+
+
+class TestBeaStreamRows(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self)
+        self.client = Bea()
+
+    # Integration tests
+    def test_output_value(self):
+        response = load_response("regional")
+        self.mock_request.return_value.iter_content.return_value = iter_chunks(dumps(response), 64)
+        rows = list(self.client.stream_rows("Regional", TableName="SAGDP1", LineCode=1,
+                                            GeoFips="GA"))
+        self.assertEqual(rows, response["BEAAPI"]["Results"]["Data"])
+        self.assertEqual(self.mock_request.call_args.kwargs["stream"], True)
+        self.mock_request.return_value.close.assert_called_once()
@@ -0,0 +1,187 @@
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from hashlib import sha256
+from json import dump, dumps, load
+
+from bea.bulk import as_list, dataset_schema
+from bea.cache import make_key
+from bea.catalog import Catalog
+from bea.errors import BeaAPIError
+from bea.result import BeaResult
+
+LAST_REVISED = re.compile(r"Last\s*Revised\s*(?:on)?:?\s*([^.;\n]+)", re.IGNORECASE)
+# Year values standing for a range of years: every year (ALL, X) or the latest n years (LASTn)
+YEAR_KEYWORDS = re.compile(r"ALL|X|LAST\d+", re.IGNORECASE)
+# Parameters naming the table of a query, which BEA lists the published years of
+TABLE_PARAMS = ("tablename", "tableid")
+
+SyncResult = namedtuple("SyncResult", ["result", "changed", "fetched_years"])
+
+
+def data_hash(rows):
+    return sha256(dumps(rows, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def row_year(row):
+    period = row.get("TimePeriod", row.get("Year", ""))
+    return str(period)[:4]
+
+
+def data_years(rows):
+    return sorted({year for year in map(row_year, rows) if year.isdigit()})
+
+
+def merge_rows(stored, update, refreshed):
+    # Replaces the stored rows of the refreshed years with the updated ones, in place: the n-th
+    # stored row of a year becomes the n-th updated row of that year, so tables listing several
+    # series keep their order (and hash) when the data did not change. Rows of a year beyond
+    # the stored ones are appended, and stored rows beyond the updated ones are dropped.
+    updated = {}
+    for row in update:
+        updated.setdefault(row_year(row), []).append(row)
+    positions = dict.fromkeys(updated, 0)
+    rows = []
+    for row in stored:
+        year = row_year(row)
+        if year not in refreshed:
+            rows.append(row)
+        elif positions.get(year, 0) < len(updated.get(year, ())):
+            rows.append(updated[year][positions[year]])
+            positions[year] += 1
+    for year, year_rows in updated.items():
+        rows.extend(year_rows[positions[year]:])
+    return rows
+
+
+def last_revised(results):
+    # BEA puts the revision date in the free text of the table notes
+    notes = results.get("Notes") or []
+    if isinstance(notes, dict):
+        notes = [notes]
+    for note in notes:
+        match = LAST_REVISED.search(str(note.get("NoteText", "")))
+        if match is not None:
+            return match.group(1).strip()
+    return None
+
+
+class IncrementalSync:
+    # Keeps a local copy of each query's data plus a manifest with when it was fetched, a hash of
+    # its Data rows and BEA's UTCProductionTime / LastRevised. Later syncs of the same query
+    # are skipped within min_interval seconds, and otherwise only the latest revision_window
+    # years are requested and merged into the stored rows. Years later than the latest one the
+    # catalog lists for the table (the client's catalog by default) are not requested.
+    def __init__(self, client, directory, min_interval=None, revision_window=3, catalog=None):
+        self.client = client
+        self.directory = directory
+        self.min_interval = min_interval
+        self.revision_window = revision_window
+        if catalog is None:
+            catalog = client.validator.catalog or Catalog(client)
+        self.catalog = catalog
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.__lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "data"), exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r") as file:
+                self.manifest = load(file)
+        else:
+            self.manifest = {}
+
+# PRIVATE METHODS
+    def __data_path(self, key):
+        return os.path.join(self.directory, "data", f"{key}.json")
+
+    def __load(self, key):
+        with open(self.__data_path(key), "r") as file:
+            return BeaResult(file.read())
+
+    def __save(self, key, result, entry):
+        with open(self.__data_path(key), "w") as file:
+            file.write(result)
+        with self.__lock:
+            self.manifest[key] = entry
+            temp_path = self.manifest_path + ".tmp"
+            with open(temp_path, "w") as file:
+                dump(self.manifest, file, indent=4)
+            os.replace(temp_path, self.manifest_path)
+
+    def __published_year(self, dataset_name, params):
+        # The latest year BEA lists for the query's table (or dataset), or None if unknown
+        filters = {name: value for name, value in params.items() if name.lower() in TABLE_PARAMS}
+        try:
+            if filters:
+                years = self.catalog.filtered_values(dataset_name, "Year", **filters)
+            else:
+                years = self.catalog.parameter_values(dataset_name, "Year")
+        except (BeaAPIError, KeyError, ValueError):
+            return None
+        years = [int(year) for year in years if year.isdigit()]
+        return max(years) if years else None
+
+    def __recent_years(self, dataset_name, params, entry):
+        # The years to refetch, or None if the query cannot be narrowed by Year
+        year_param = next((name for name in params if name.lower() == "year"), None)
+        schema = dataset_schema(self.client.datasets_args, dataset_name, params)
+        multiple = {param.lower() for param in schema.get("multiple", ())}
+        if year_param is None or "year" not in multiple or not entry.get("years"):
+            return year_param, None
+        stored_year = int(max(entry["years"]))
+        first_year = stored_year - self.revision_window + 1
+        # Years not published yet are not asked for; when BEA cannot tell, nor are years past
+        # the stored ones
+        last_year = self.__published_year(dataset_name, params) or stored_year
+        requested = [str(year) for year in as_list(params[year_param])]
+        if len(requested) == 1 and YEAR_KEYWORDS.fullmatch(requested[0].strip()):
+            # The stored rows tell which years the keyword covered; any later ones are new
+            return year_param, [str(year) for year in range(first_year, last_year + 1)]
+        requested = [year for part in requested for year in part.split(",")]
+        return year_param, [
+            year for year in requested if year.isdigit() and first_year <= int(year) <= last_year
+        ]
+
+# PUBLIC METHODS
+    def sync(self, dataset_name, **params):
+        key = make_key({"datasetname": dataset_name, **params})
+        entry = self.manifest.get(key)
+        stored = self.__load(key) if entry is not None else None
+        now = time.time()
+        if (stored is not None and self.min_interval is not None
+                and now - entry["fetched"] < self.min_interval):
+            return SyncResult(stored, False, [])
+
+        year_param, years = (None, None)
+        if stored is not None:
+            year_param, years = self.__recent_years(dataset_name, params, entry)
+
+        if years is None:
+            result = self.client.bulk(dataset_name, workers=1, **params)
+            fetched_years = data_years(result.data)
+        elif not years:
+            result, fetched_years = stored, []
+        else:
+            update = self.client.bulk(dataset_name, workers=1, **{**params, year_param: years})
+            fetched_years = sorted(years)
+            rows = merge_rows(stored.data, update.data, set(fetched_years))
+            payload = update.payload
+            if isinstance(payload["BEAAPI"]["Results"], list):
+                payload["BEAAPI"]["Results"][0]["Data"] = rows
+            else:
+                payload["BEAAPI"]["Results"]["Data"] = rows
+            result = BeaResult.from_payload(payload)
+
+        digest = data_hash(result.data)
+        changed = entry is None or digest != entry["hash"]
+        self.__save(key, result, {
+            "dataset": dataset_name,
+            "params": {name: str(value) for name, value in params.items()},
+            "fetched": now,
+            "hash": digest,
+            "utc_production_time": result.results.get("UTCProductionTime"),
+            "last_revised": last_revised(result.results),
+            "years": data_years(result.data),
+        })
+        return SyncResult(result, changed, fetched_years)
@@ -0,0 +1,129 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from bea.bea import Bea
+from bea.bea_test import fake_response, patch_api_key, patch_session_get
+from bea.catalog import Catalog
+from bea.errors import BeaPayloadError
+from bea.sync import IncrementalSync, last_revised
+
+
+class TestLastRevised(TestCase):
+
+    # Unit tests
+    def test_output_value(self):
+        results = {"Notes": [{"NoteRef": "T10101", "NoteText": "Table 1.1.1. Last Revised on: "
+                                                                 "September 28, 2023."}]}
+        self.assertEqual(last_revised(results), "September 28, 2023")
+        self.assertIsNone(last_revised({}))
+
+
+class TestIncrementalSync(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+
+        self.values = {str(year): "1.0" for year in range(2015, 2021)}
+        self.series = ["A"]
+
+        def fake_get(session, url, params):
+            if params["method"] == "GetParameterValuesFiltered":
+                # The published years of the table
+                years = [{"Key": year, "Desc": year} for year in self.values]
+                return fake_response({"BEAAPI": {"Results": {"ParamValue": years}}})
+            years = params["Year"].split(",")
+            if not years[0].isdigit():
+                years = self.values
+            # Series by series, like most multi-series tables
+            rows = [{"SeriesCode": code, "TimePeriod": year, "DataValue": self.values[year]}
+                    for code in self.series for year in years if year in self.values]
+            return fake_response(
+                {"BEAAPI": {"Results": {"UTCProductionTime": "now", "Data": rows}}}
+            )
+
+        self.mock_request = patch_session_get(self, fake_get)
+        self.client = Bea()
+        self.tempdir = TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def sync(self, syncer, year="ALL"):
+        return syncer.sync("NIPA", TableName="T10101", Frequency="A", Year=year)
+
+    def data_requests(self):
+        return [
+            call.kwargs["params"] for call in self.mock_request.call_args_list
+            if call.kwargs["params"]["method"] == "GetData"
+        ]
+
+    # Integration tests
+    def test_refetches_only_recent_years(self):
+        syncer = IncrementalSync(self.client, self.tempdir.name, revision_window=2)
+        first = self.sync(syncer)
+        self.assertTrue(first.changed)
+        self.assertEqual(len(first.result.data), 6)
+
+        self.values["2020"] = "2.0"
+        second = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2))
+        self.assertTrue(second.changed)
+        requested_years = self.data_requests()[-1]["Year"].split(",")
+        self.assertEqual(requested_years, ["2019", "2020"])
+        self.assertEqual(len(second.result.data), 6)
+        self.assertEqual(
+            second.result.data[-1], {"SeriesCode": "A", "TimePeriod": "2020", "DataValue": "2.0"}
+        )
+
+        third = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2))
+        self.assertFalse(third.changed)
+
+    def test_skips_within_min_interval(self):
+        syncer = IncrementalSync(self.client, self.tempdir.name, min_interval=3600)
+        self.sync(syncer)
+        skipped = self.sync(syncer)
+        self.assertFalse(skipped.changed)
+        self.assertEqual(skipped.fetched_years, [])
+        self.assertEqual(len(self.data_requests()), 1)
+
+    def test_refetches_recent_years_of_year_keywords(self):
+        for year in ("X", "LAST5", "LAST10"):
+            with self.subTest(year=year), TemporaryDirectory() as directory:
+                self.values["2020"] = "1.0"
+                self.sync(IncrementalSync(self.client, directory, revision_window=2), year)
+                self.values["2020"] = "2.0"
+                self.mock_request.reset_mock()
+                second = self.sync(IncrementalSync(self.client, directory, revision_window=2), year)
+                self.assertTrue(second.changed)
+                self.assertEqual(second.fetched_years, ["2019", "2020"])
+                self.assertEqual(len(self.data_requests()), 1)
+                self.assertEqual(second.result.data[-1]["DataValue"], "2.0")
+
+    def test_unchanged_refetch_keeps_row_order(self):
+        self.series = ["A", "B"]
+        first = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2))
+        second = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2))
+        self.assertFalse(second.changed)
+        self.assertEqual(second.result.data, first.result.data)
+
+        self.values["2020"] = "2.0"
+        third = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2))
+        self.assertTrue(third.changed)
+        self.assertEqual(
+            [(row["SeriesCode"], row["TimePeriod"]) for row in third.result.data],
+            [(row["SeriesCode"], row["TimePeriod"]) for row in first.result.data]
+        )
+
+    def test_requests_newly_published_years_only(self):
+        self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2), "X")
+        self.values["2021"] = "3.0"
+        second = self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2), "X")
+        self.assertEqual(second.fetched_years, ["2019", "2020", "2021"])
+        self.assertEqual(second.result.data[-1]["TimePeriod"], "2021")
+
+    def test_stops_at_stored_years_when_published_years_are_unknown(self):
+        self.sync(IncrementalSync(self.client, self.tempdir.name, revision_window=2), "X")
+        catalog = Catalog(self.client)
+        with mock.patch.object(catalog, "filtered_values", side_effect=BeaPayloadError("down")):
+            second = self.sync(
+                IncrementalSync(self.client, self.tempdir.name, revision_window=2, catalog=catalog),
+                "X"
+            )
+        self.assertEqual(second.fetched_years, ["2019", "2020"])
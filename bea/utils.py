@@ -1,17 +1,116 @@
-def lowercase(data):
-    if isinstance(data, dict):
-        dic = {}
-        for key in data:
-            val = lowercase(data[key])
-            dic[key.lower()] = val
-        return dic
-    elif isinstance(data, list):
-        lst = []
-        for item in data:
-            val = lowercase(item)
-            lst.append(val)
-        return lst
-    elif isinstance(data, str):
-        return data.lower()
-    else:
+import sys
+
+# Lower-cased keys are interned and remembered, as payloads repeat the same few keys per row
+KEY_CACHE_SIZE = 4096
+_key_cache = {}
+
+
+def lowercase_key(key):
+    try:
+        return _key_cache[key]
+    except KeyError:
+        if len(_key_cache) >= KEY_CACHE_SIZE:
+            _key_cache.clear()
+        lowered = _key_cache[key] = sys.intern(key.lower())
+        return lowered
+
+
+def lowercase(data, keys_only=False, in_place=False):
+    # Lower-cases the keys of every dict in data, and every str value unless keys_only is set.
+    # Walks iteratively, so deep nesting cannot hit the recursion limit. Returns a new structure,
+    # or with in_place set mutates and returns data (a top-level str is still returned new).
+    if isinstance(data, str):
+        return data if keys_only else data.lower()
+    if not isinstance(data, (dict, list)):
         return data
+    if in_place:
+        _lowercase_in_place(data, keys_only)
+        return data
+
+    key_cache = _key_cache
+    result = {} if isinstance(data, dict) else []
+    stack = [(data, result)]
+    while stack:
+        source, target = stack.pop()
+        is_dict = isinstance(source, dict)
+        for key, value in source.items() if is_dict else enumerate(source):
+            # Exact type checks first, as they are much cheaper than isinstance
+            kind = type(value)
+            if kind is str:
+                if not keys_only:
+                    value = value.lower()
+            elif kind is dict or kind is list:
+                child = {} if kind is dict else []
+                stack.append((value, child))
+                value = child
+            elif isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else []
+                stack.append((value, child))
+                value = child
+            elif isinstance(value, str) and not keys_only:
+                value = value.lower()
+            if is_dict:
+                lowered = key_cache.get(key)
+                target[lowered if lowered is not None else lowercase_key(key)] = value
+            else:
+                target.append(value)
+    return result
+
+
+def _lowercase_in_place(data, keys_only):
+    key_cache = _key_cache
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            keys = list(container)
+            lowered = [key_cache.get(key) or lowercase_key(key) for key in keys]
+            if lowered != keys:
+                # Renamed keys are reinserted, in their original order
+                values = list(container.values())
+                container.clear()
+                container.update(zip(lowered, values))
+            for key, value in container.items():
+                kind = type(value)
+                if kind is str:
+                    if not keys_only:
+                        # Replacing the value of an existing key is safe while iterating
+                        container[key] = value.lower()
+                elif kind is dict or kind is list or isinstance(value, (dict, list)):
+                    stack.append(value)
+                elif not keys_only and isinstance(value, str):
+                    container[key] = value.lower()
+        else:
+            for index, value in enumerate(container):
+                kind = type(value)
+                if kind is str:
+                    if not keys_only:
+                        container[index] = value.lower()
+                elif kind is dict or kind is list or isinstance(value, (dict, list)):
+                    stack.append(value)
+                elif not keys_only and isinstance(value, str):
+                    container[index] = value.lower()
+
+
+def lowercase_hook(keys_only=True):
+    # An object_pairs_hook for json.loads/JSONDecoder that lower-cases while decoding, so the
+    # decoded tree is never walked again. Objects nested in arrays are covered, as every object
+    # goes through the hook; str items of arrays are lowered by the object holding the array.
+    key_cache = _key_cache
+    if keys_only:
+        def hook(pairs):
+            return {key_cache.get(key) or lowercase_key(key): value for key, value in pairs}
+        return hook
+
+    def lower_value(value):
+        if isinstance(value, str):
+            return value.lower()
+        if isinstance(value, list):
+            return [lower_value(item) for item in value]
+        return value
+
+    def hook(pairs):
+        return {
+            key_cache.get(key) or lowercase_key(key): lower_value(value) for key, value in pairs
+        }
+    return hook
@@ -0,0 +1,80 @@
+from json import dumps, loads
+from unittest import TestCase
+
+from bea.stream import iter_chunks, iter_data_rows
+from bea.utils import lowercase, lowercase_hook
+
+
+def lowercase_recursive(data):
+    # The original implementation, as the reference for the default mode
+    if isinstance(data, dict):
+        return {key.lower(): lowercase_recursive(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [lowercase_recursive(item) for item in data]
+    elif isinstance(data, str):
+        return data.lower()
+    return data
+
+
+SAMPLE = {
+    "UserID": "ABC",
+    "Year": 2020,
+    "Nested": {"TableName": "T10101", "Values": ["A", ["B", {"Deep": "C"}], 1.5, None]},
+    "Rows": [{"GeoFips": "00000", "DataValue": "1,234"}, {"GeoFips": "01000"}],
+}
+
+
+# Unit tests
+class TestLowercase(TestCase):
+    def test_default_matches_original_implementation(self):
+        self.assertEqual(lowercase(SAMPLE), lowercase_recursive(SAMPLE))
+        self.assertEqual(lowercase("ABC"), "abc")
+        self.assertEqual(lowercase(5), 5)
+
+    def test_keeps_key_order(self):
+        self.assertEqual(list(lowercase(SAMPLE)), ["userid", "year", "nested", "rows"])
+
+    def test_does_not_mutate_input(self):
+        data = loads(dumps(SAMPLE))
+        lowercase(data)
+        self.assertEqual(data, SAMPLE)
+
+    def test_keys_only(self):
+        result = lowercase(SAMPLE, keys_only=True)
+        self.assertEqual(result["nested"], {
+            "tablename": "T10101", "values": ["A", ["B", {"deep": "C"}], 1.5, None]
+        })
+
+    def test_in_place(self):
+        data = loads(dumps(SAMPLE))
+        nested = data["Nested"]
+        self.assertIs(lowercase(data, in_place=True), data)
+        self.assertEqual(data, lowercase_recursive(SAMPLE))
+        self.assertIs(data["nested"], nested)
+
+    def test_in_place_keys_only(self):
+        data = loads(dumps(SAMPLE))
+        lowercase(data, keys_only=True, in_place=True)
+        self.assertEqual(data, lowercase(SAMPLE, keys_only=True))
+
+    def test_deep_nesting_does_not_recurse(self):
+        data = current = {}
+        for _ in range(5000):
+            current["Child"] = {}
+            current = current["Child"]
+        result = lowercase(data)
+        for _ in range(5000):
+            result = result["child"]
+        self.assertEqual(result, {})
+
+    def test_hook_matches_walk(self):
+        text = dumps(SAMPLE)
+        self.assertEqual(loads(text, object_pairs_hook=lowercase_hook()),
+                         lowercase(SAMPLE, keys_only=True))
+        self.assertEqual(loads(text, object_pairs_hook=lowercase_hook(keys_only=False)),
+                         lowercase(SAMPLE))
+
+    def test_hook_while_streaming(self):
+        payload = dumps({"BEAAPI": {"Results": {"Data": SAMPLE["Rows"]}}})
+        rows = list(iter_data_rows(iter_chunks(payload, 8), object_pairs_hook=lowercase_hook()))
+        self.assertEqual(rows, [{"geofips": "00000", "datavalue": "1,234"}, {"geofips": "01000"}])
@@ -0,0 +1,111 @@
+from bea.errors import BeaValidationError
+
+# Parameters the client adds to every request, which are valid for every dataset
+COMMON_PARAMS = frozenset(["userid", "method", "resultformat", "datasetname"])
+YEAR_KEYWORDS = frozenset(["all", "x", "last5", "last10"])
+# Values that stand for "everything" and so cannot satisfy an exactly_one_of rule
+ALL_VALUES = frozenset(["all", "allcountries"])
+SPECIAL_VALUES = frozenset(["all", "x"])
+
+
+def split_values(value):
+    return [part.strip() for part in str(value).split(",")]
+
+
+class DatasetRules:
+    # One entry of datasets_args.json compiled into lower-cased sets
+    def __init__(self, dataset_name, schema):
+        self.dataset_name = dataset_name
+        self.canonical = {
+            name.lower(): name
+            for key in ("required", "all") for name in schema.get(key, ())
+        }
+        self.required = frozenset(name.lower() for name in schema.get("required", ()))
+        self.allowed = (
+            frozenset(name.lower() for name in schema["all"]) | COMMON_PARAMS
+            if "all" in schema else None
+        )
+        self.multiple = frozenset(name.lower() for name in schema.get("multiple", ()))
+        self.values = {
+            name.lower(): frozenset(value.lower() for value in values)
+            for name, values in schema.get("values", {}).items()
+        }
+        self.exactly_one_of = tuple(name.lower() for name in schema.get("exactly_one_of", ()))
+
+    def problems(self, params, catalog=None):
+        problems = []
+        given = {name.lower(): value for name, value in params.items() if value is not None}
+
+        for name in sorted(self.required - given.keys()):
+            problems.append(f"missing required parameter {self.canonical[name]}")
+        if self.allowed is not None:
+            for name in sorted(given.keys() - self.allowed):
+                problems.append(f"unknown parameter {name}")
+
+        for name, value in given.items():
+            if name in COMMON_PARAMS:
+                continue
+            values = split_values(value)
+            display_name = self.canonical.get(name, name)
+            if len(values) > 1 and name not in self.multiple:
+                problems.append(f"{display_name} accepts a single value, got {value!r}")
+            if name == "year":
+                for year in values:
+                    is_year = year.isdigit() and len(year) == 4
+                    if not is_year and year.lower() not in YEAR_KEYWORDS:
+                        problems.append(f"invalid Year {year!r}")
+            elif name in self.values:
+                for item in values:
+                    if item.lower() not in self.values[name]:
+                        problems.append(f"invalid {display_name} {item!r}")
+            elif catalog is not None and name in self.canonical:
+                for item in values:
+                    if (item.lower() not in SPECIAL_VALUES
+                            and not catalog.is_valid(self.dataset_name, display_name, item)):
+                        problems.append(f"invalid {display_name} {item!r}")
+
+        if self.exactly_one_of:
+            singles = [
+                name for name in self.exactly_one_of
+                if name in given
+                and len(split_values(given[name])) == 1
+                and str(given[name]).lower() not in ALL_VALUES
+            ]
+            if not singles:
+                names = " or ".join(self.canonical[name] for name in self.exactly_one_of)
+                problems.append(f"exactly one value of {names} must be requested")
+        return problems
+
+
+class Validator:
+    # Checks GetData requests against the dataset schema before they are sent, reporting every
+    # problem at once. With a bea.catalog.Catalog, values are also checked against the cached
+    # GetParameterValues sets.
+    def __init__(self, datasets_args, catalog=None):
+        self.catalog = catalog
+        self.rules = {}
+        for dataset_name, schema in datasets_args.items():
+            if "DI" in schema:  # MNE
+                self.rules[dataset_name] = {
+                    kind: DatasetRules(dataset_name, schema[kind]) for kind in schema
+                }
+            else:
+                self.rules[dataset_name] = DatasetRules(dataset_name, schema)
+
+    def rules_for(self, dataset_name, params):
+        rules = self.rules.get(dataset_name)
+        if isinstance(rules, dict):
+            # MNE: the AMNE statistics are the ones requested by ownership level
+            lower_params = {name.lower() for name, value in params.items() if value is not None}
+            if {"ownershiplevel", "nonbankaffiliatesonly"} & lower_params:
+                return rules["AMNE"]
+            return rules["DI"]
+        return rules
+
+    def validate(self, dataset_name, params):
+        rules = self.rules_for(dataset_name, params)
+        if rules is None:
+            raise BeaValidationError(dataset_name, [f"unknown dataset {dataset_name}"])
+        problems = rules.problems(params, self.catalog)
+        if problems:
+            raise BeaValidationError(dataset_name, problems)
@@ -0,0 +1,75 @@
+from unittest import TestCase, mock
+
+from bea.bea import Bea
+from bea.bea_test import patch_api_key, patch_session_get
+from bea.errors import BeaValidationError
+from bea.validation import Validator
+
+
+class TestValidator(TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.validator = Validator(Bea.datasets_args)
+
+    def assertProblems(self, dataset_name, params, expected):
+        with self.assertRaises(BeaValidationError) as context:
+            self.validator.validate(dataset_name, params)
+        self.assertEqual(context.exception.problems, expected)
+
+    # Unit tests
+    def test_accepts_valid_requests(self):
+        self.validator.validate("NIPA", {"year": "2005,2006", "frequency": "a,q",
+                                         "tablename": "T10101", "datasetname": "NIPA"})
+        self.validator.validate("Regional", {"TableName": "CAINC1", "LineCode": 1,
+                                             "GeoFips": "COUNTY", "Year": "LAST5"})
+
+    def test_reports_all_problems_at_once(self):
+        self.assertProblems("NIPA", {"Year": "20x5", "Frequency": "W", "Tablename": "a,b",
+                                     "Yeer": 2005}, [
+            "unknown parameter yeer",
+            "invalid Year '20x5'",
+            "invalid Frequency 'W'",
+            "TableName accepts a single value, got 'a,b'",
+        ])
+
+    def test_missing_required_parameters(self):
+        self.assertProblems("FixedAssets", {"Year": 2005}, [
+            "missing required parameter TableName",
+        ])
+
+    def test_mne_di_and_amne(self):
+        di = {"DirectionOfInvestment": "Outward", "Classification": "Country", "Year": 2005}
+        self.validator.validate("MNE", di)
+        self.assertProblems("MNE", {**di, "OwnershipLevel": 0}, [
+            "missing required parameter NonBankAffiliatesOnly",
+        ])
+        self.assertProblems("MNE", {**di, "State": "GA"}, ["unknown parameter state"])
+
+    def test_exactly_one_of(self):
+        self.assertProblems("ITA", {"Indicator": None, "AreaOrCountry": "AllCountries"}, [
+            "exactly one value of Indicator or AreaOrCountry must be requested",
+        ])
+        self.validator.validate("ITA", {"Indicator": "BalGds", "AreaOrCountry": "AllCountries"})
+
+    def test_checks_values_against_catalog(self):
+        catalog = mock.Mock()
+        catalog.is_valid.side_effect = lambda dataset_name, parameter_name, value: value == "1"
+        validator = Validator(Bea.datasets_args, catalog)
+        validator.validate("Regional", {"TableName": "1", "LineCode": "1", "GeoFips": "1"})
+        with self.assertRaises(BeaValidationError):
+            validator.validate("Regional", {"TableName": "1", "LineCode": "2", "GeoFips": "1"})
+
+
+class TestBeaValidatesBeforeSending(TestCase):
+
+    def setUp(self):
+        patch_api_key(self)
+        self.mock_request = patch_session_get(self)
+        self.client = Bea()
+
+    # Integration tests
+    def test_rejects_locally(self):
+        with self.assertRaises(TypeError):
+            self.client.nipa(2005, "W", "T10101")
+        self.mock_request.assert_not_called()
@@ -0,0 +1,34 @@
+import zlib
+from json import dumps, loads
+
+from bea.codec import CompactCodec, decode, decode_result
+from bea.mockserver import synthetic_payload
+from benchmarks.common import result, timeit
+
+
+def run(quick=False):
+    # Stored size of a payload of rows rows with CompactCodec against zlib of the text, and the
+    # seconds to encode it and to read it back as bytes or as a BeaResult with its payload
+    rows = 20000 if quick else 100000
+    repeat = 3 if quick else 5
+    content = dumps(synthetic_payload({"year": "2020", "frequency": "Q"}, rows)).encode("utf-8")
+    codec = CompactCodec()
+    encoded = codec.encode(content)
+    compressed = zlib.compress(content)
+    params = {"rows": rows, "compression": codec.compression}
+    results = [
+        result("raw_bytes", len(content), "B", **params),
+        result("zlib_bytes", len(compressed), "B", **params),
+        result("encoded_bytes", len(encoded), "B", **params),
+    ]
+    cases = {
+        "encode": lambda: codec.encode(content),
+        "decode": lambda: decode(encoded),
+        "decode_result": lambda: decode_result(encoded).payload,
+        "zlib decompress and loads (baseline)": lambda: loads(zlib.decompress(compressed)),
+    }
+    for name, fn in cases.items():
+        best, median = timeit(fn, repeat=repeat)
+        results.append(result("seconds", best, "s", case=name, **params))
+        results.append(result("median_seconds", median, "s", case=name, **params))
+    return results
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.common import result
+
+# Cold start cases: name -> statement timed in a fresh interpreter
+CASES = {
+    "bea": "import bea",
+    "bea.bea": "import bea.bea",
+    "bea.async_bea": "import bea.async_bea",
+    "bea.bea+schema": "import bea.bea; bea.bea.Bea.datasets_args",
+    "bea.bea+client": "import bea.bea; bea.bea.Bea()",
+}
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement):
+    # Seconds to run statement in a fresh interpreter
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT, statement],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=dict(os.environ, BEA_API_KEY=os.environ.get("BEA_API_KEY", "BENCHMARK"))
+    ).stdout
+    return float(output)
+
+
+def run(quick=False):
+    # Cold start: the best of several fresh-interpreter runs of each case
+    repeat = 3 if quick else 10
+    return [
+        result("import_seconds", min(import_time(statement) for _ in range(repeat)), "s",
+               case=name)
+        for name, statement in CASES.items()
+    ]
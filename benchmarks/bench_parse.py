@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+from json import dumps, loads
+
+from bea.mockserver import synthetic_payload
+from bea.result import BeaResult
+from benchmarks.common import result, timeit
+
+# Rows of a synthetic NIPA-like payload in one MB, roughly
+ROWS_PER_MB = 4000
+PAYLOAD_SIZES_MB = (1, 10)
+RSS_SIZE_MB = 50
+
+RSS_SCRIPT = """
+import resource, sys
+from bea.mockserver import synthetic_payload
+from bea.result import BeaResult
+from json import dumps
+
+payload = dumps(synthetic_payload({"year": "2020", "frequency": "Q"}, int(sys.argv[1])))
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+result = BeaResult(payload)
+getattr(result, sys.argv[2])() if sys.argv[2] != "json" else result.json()
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(before, after)
+"""
+
+
+def conversions():
+    available = {"json": lambda text: loads(text)}
+    for name, module in (("to_numpy", "numpy"), ("to_pandas", "pandas"), ("to_arrow", "pyarrow")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        available[name] = lambda text, name=name: getattr(BeaResult(text), name)()
+    return available
+
+
+def peak_rss(conversion, rows):
+    # Peak resident set size (kB on Linux) of a fresh interpreter holding a payload of rows rows,
+    # before and after the conversion
+    output = subprocess.run(
+        [sys.executable, "-c", RSS_SCRIPT, str(rows), conversion],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout.split()
+    return int(output[0]), int(output[1])
+
+
+def run(quick=False):
+    # Parse and tabular conversion time per MB of payload, and the peak RSS they cost
+    if quick:
+        sizes, rss_size, repeat = PAYLOAD_SIZES_MB[:1], 5, 3
+    else:
+        sizes, rss_size, repeat = PAYLOAD_SIZES_MB, RSS_SIZE_MB, 5
+    results = []
+    for size in sizes:
+        text = dumps(synthetic_payload({"year": "2020", "frequency": "Q"}, size * ROWS_PER_MB))
+        megabytes = len(text) / 2**20
+        for name, convert in conversions().items():
+            best, median = timeit(lambda: convert(text), repeat=repeat)
+            params = {"conversion": name, "payload_mb": round(megabytes, 2)}
+            results.append(result("seconds_per_mb", best / megabytes, "s/MB", **params))
+            results.append(result("median_seconds_per_mb", median / megabytes, "s/MB", **params))
+
+    if sys.platform != "win32":
+        for name in conversions():
+            before, after = peak_rss(name, rss_size * ROWS_PER_MB)
+            params = {"conversion": name, "payload_mb": rss_size}
+            results.append(result("peak_rss", after, "kB", **params))
+            results.append(result("peak_rss_increase", after - before, "kB", **params))
+    return results
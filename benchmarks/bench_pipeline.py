@@ -0,0 +1,35 @@
+import os
+import time
+
+from bea.mockserver import MockBeaServer
+from bea.pipeline import ParsePipeline
+from benchmarks.common import bench_client, result
+
+PROCESS_COUNTS = (1, 2, 4)
+
+
+def run(quick=False):
+    # Seconds to fetch and convert many large responses to Arrow: converting on the fetching
+    # threads, against converting in a ParsePipeline with several worker processes
+    count, rows = (8, 20000) if quick else (32, 50000)
+    calls = [{"year": 1990 + index, "frequency": "Q", "table_name": "T10101"}
+             for index in range(count)]
+    results = []
+    with MockBeaServer(rows=rows, recorded_path=None) as server:
+        client = bench_client(server.url)
+        start = time.perf_counter()
+        client.map(lambda kwargs: client.nipa(**kwargs).to_arrow(), [(call,) for call in calls])
+        results.append(result("seconds", time.perf_counter() - start, "s",
+                              mode="threads", processes=0, requests=count, rows=rows))
+
+        for processes in PROCESS_COUNTS:
+            if processes > (os.cpu_count() or 1):
+                continue
+            with ParsePipeline(client, processes=processes) as pipeline:
+                pipeline.map("nipa", calls[:processes])  # Starts the workers
+                start = time.perf_counter()
+                pipeline.map("nipa", calls)
+                elapsed = time.perf_counter() - start
+            results.append(result("seconds", elapsed, "s", mode="pipeline",
+                                  processes=processes, requests=count, rows=rows))
+    return results
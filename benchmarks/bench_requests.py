@@ -0,0 +1,76 @@
+import asyncio
+import os
+import time
+
+from bea.async_bea import AsyncBea
+from bea.mockserver import MockBeaServer
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+from benchmarks.common import bench_client, result, sample_inputs, vary_inputs
+
+CONCURRENCY_LEVELS = (1, 4, 16)
+
+
+def run_sync(client, method_name, calls):
+    method = getattr(client, method_name)
+    for kwargs in calls:
+        method(**kwargs)
+
+
+def run_threaded(client, method_name, calls, workers):
+    client.map(method_name, calls, workers=workers)
+
+
+def run_async(base_url, method_name, calls, workers):
+    async def main():
+        async with AsyncBea(
+            max_concurrency=workers,
+            base_url=base_url,
+            rate_limiter=RateLimiter(None, None, None),
+            retry_policy=RetryPolicy(max_attempts=1)
+        ) as client:
+            await client.gather_many([(method_name, kwargs) for kwargs in calls])
+
+    asyncio.run(main())
+
+
+def run(quick=False, latency=0.0, rows=100):
+    # Requests per second for each public dataset method, sequentially and at several levels of
+    # concurrency on threads (Bea.map) and on asyncio (AsyncBea)
+    os.environ.setdefault("BEA_API_KEY", "BENCHMARK")
+    count = 20 if quick else 100
+    levels = CONCURRENCY_LEVELS[:2] if quick else CONCURRENCY_LEVELS
+    results = []
+    with MockBeaServer(latency=latency, rows=rows) as server:
+        client = bench_client(server.url)
+        for method_name, inputs in sample_inputs().items():
+            calls = vary_inputs(inputs, count)
+            modes = [("sync", 1, lambda: run_sync(client, method_name, calls))]
+            for workers in levels:
+                modes.append(("threads", workers, lambda workers=workers: run_threaded(
+                    client, method_name, calls, workers
+                )))
+                modes.append(("async", workers, lambda workers=workers: run_async(
+                    server.url, method_name, calls, workers
+                )))
+
+            for mode, workers, fn in modes:
+                served = server.requests_served
+                start = time.perf_counter()
+                fn()
+                elapsed = time.perf_counter() - start
+                params = {
+                    "method": method_name,
+                    "mode": mode,
+                    "concurrency": workers,
+                    "latency": latency,
+                    "rows": rows,
+                }
+                results.append(result("calls_per_second", count / elapsed, "1/s", **params))
+                results.append(result(
+                    "requests_per_second",
+                    (server.requests_served - served) / elapsed,
+                    "1/s",
+                    **params
+                ))
+    return results
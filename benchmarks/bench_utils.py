@@ -0,0 +1,44 @@
+from json import dumps, loads
+
+from bea.mockserver import synthetic_payload
+from bea.utils import lowercase, lowercase_hook
+from benchmarks.common import result, timeit
+
+
+def lowercase_recursive(data):
+    # The implementation bea.utils.lowercase replaced, as the baseline
+    if isinstance(data, dict):
+        dic = {}
+        for key in data:
+            dic[key.lower()] = lowercase_recursive(data[key])
+        return dic
+    elif isinstance(data, list):
+        return [lowercase_recursive(item) for item in data]
+    elif isinstance(data, str):
+        return data.lower()
+    return data
+
+
+def run(quick=False):
+    # Seconds to normalize a decoded payload of rows rows with each lowercase mode, and to
+    # decode and normalize its text in one pass with lowercase_hook
+    rows = 20000 if quick else 100000
+    repeat = 3 if quick else 5
+    text = dumps(synthetic_payload({"year": "2020", "frequency": "Q"}, rows))
+    payload = loads(text)
+    cases = {
+        "recursive (baseline)": lambda: lowercase_recursive(payload),
+        "copy": lambda: lowercase(payload),
+        "copy keys_only": lambda: lowercase(payload, keys_only=True),
+        # Already lower-cased after the first run, which is the steady state of re-normalizing
+        "in_place keys_only": lambda: lowercase(payload, keys_only=True, in_place=True),
+        "loads then copy keys_only": lambda: lowercase(loads(text), keys_only=True),
+        "loads with hook keys_only": lambda: loads(text, object_pairs_hook=lowercase_hook()),
+        "loads (no normalization)": lambda: loads(text),
+    }
+    results = []
+    for name, fn in cases.items():
+        best, median = timeit(fn, repeat=repeat)
+        results.append(result("seconds", best, "s", case=name, rows=rows))
+        results.append(result("median_seconds", median, "s", case=name, rows=rows))
+    return results
@@ -0,0 +1,57 @@
+import os
+import statistics
+import time
+from json import load
+
+from bea.bea import Bea
+from bea.ratelimit import RateLimiter
+from bea.retry import RetryPolicy
+
+TEST_CASES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "bea",
+    "test_cases_api_responses.json"
+)
+YEARS = list(range(1990, 2024))
+
+
+def result(name, value, unit, **params):
+    return {"name": name, "value": value, "unit": unit, "params": params}
+
+
+def timeit(fn, repeat=5, number=1):
+    # Seconds per call: the best and the median of repeat runs of number calls each
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings), statistics.median(timings)
+
+
+def sample_inputs():
+    # {method name: keyword arguments} for every public dataset method, from the recorded cases
+    with open(TEST_CASES_PATH, "r") as file:
+        cases = load(file)
+    return {name: case["inputs"]["input1"] for name, case in cases.items()}
+
+
+def vary_inputs(inputs, count):
+    # count variants of inputs with different years, so concurrent calls are not deduplicated
+    # into one request. Inputs without a single year are repeated as they are.
+    year = inputs.get("year")
+    if not isinstance(year, int):
+        return [dict(inputs) for _ in range(count)]
+    return [dict(inputs, year=YEARS[index % len(YEARS)]) for index in range(count)]
+
+
+def bench_client(base_url, **kwargs):
+    # A client without rate limiting or retries, pointed at a stand-in server
+    os.environ.setdefault("BEA_API_KEY", "BENCHMARK")
+    return Bea(
+        base_url=base_url,
+        rate_limiter=RateLimiter(None, None, None),
+        retry_policy=RetryPolicy(max_attempts=1),
+        **kwargs
+    )
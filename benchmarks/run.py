@@ -0,0 +1,71 @@
+import argparse
+import platform
+import subprocess
+import sys
+import time
+from json import dump
+
+from benchmarks import (
+    bench_codec, bench_import, bench_parse, bench_pipeline, bench_requests, bench_utils
+)
+
+SUITES = {
+    "requests": bench_requests.run,
+    "parse": bench_parse.run,
+    "import": bench_import.run,
+    "pipeline": bench_pipeline.run,
+    "utils": bench_utils.run,
+    "codec": bench_codec.run,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    # python -m benchmarks.run [--quick] [--suite requests --suite parse ...] [--output file]
+    parser = argparse.ArgumentParser(description="Run the bea benchmarks")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES))
+    parser.add_argument("--quick", action="store_true", help="fewer, smaller runs")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds of stand-in server latency per request")
+    parser.add_argument("--rows", type=int, default=100,
+                        help="rows in synthetic responses of the stand-in server")
+    parser.add_argument("--output", default="-", help="JSON results file, - for stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.suite or sorted(SUITES):
+        if name == "requests":
+            suite_results = SUITES[name](quick=args.quick, latency=args.latency, rows=args.rows)
+        else:
+            suite_results = SUITES[name](quick=args.quick)
+        for entry in suite_results:
+            entry["suite"] = name
+        results.extend(suite_results)
+        print(f"{name}: {len(suite_results)} results", file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output == "-":
+        dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()